@@ -1,7 +1,14 @@
 """Celery application configuration."""
 
+import structlog
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from app.config import settings
+from app.logging_config import configure_logging
+
+configure_logging()
+
+logger = structlog.get_logger()
 
 # Create Celery instance
 celery_app = Celery(
@@ -25,3 +32,38 @@ celery_app.conf.update(
     worker_max_tasks_per_child=10,
     worker_concurrency=1
 )
+
+
+@worker_init.connect
+def preload_pii_processor(**kwargs):
+    """Load the spaCy and Presidio models before the worker pool forks."""
+    # Pool processes inherit the loaded models copy-on-write instead of each
+    # loading its own copy, including children replaced after
+    # worker_max_tasks_per_child tasks
+    from app.processing.pii_processor import get_pii_processor
+
+    get_pii_processor().warm_up()
+
+
+@worker_process_init.connect
+def init_task_services(**kwargs):
+    """Create the pool process's email processor and DynamoDB service before its first task."""
+    from app.database.dynamodb import get_dynamodb_service
+    from app.tasks import get_email_processor
+
+    try:
+        get_email_processor()
+        get_dynamodb_service()
+    except Exception as exc:
+        # Tasks create the services on first use instead
+        logger.error("Failed to initialize task services", error=str(exc))
+
+
+@worker_process_shutdown.connect
+def close_scraping_clients(**kwargs):
+    """Close the pool process's shared scraping browser and HTTP client before it exits."""
+    from app.services.browser_pool import browser_pool
+    from app.services.http_pool import http_pool
+
+    browser_pool.shutdown()
+    http_pool.shutdown()
@@ -1,6 +1,7 @@
 """Configuration management for the email processing application."""
 
 import os
+from functools import cached_property, lru_cache
 from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -34,6 +35,11 @@ class Settings(BaseSettings):
     # LLM General Settings
     llm_temperature: float = Field(default=0.1, env="LLM_TEMPERATURE")
     llm_max_tokens: int = Field(default=1000, env="LLM_MAX_TOKENS")
+    llm_max_concurrency: int = Field(default=32, env="LLM_MAX_CONCURRENCY")
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_use_redis: bool = Field(default=True, env="LLM_CACHE_USE_REDIS")
+    llm_cache_size: int = Field(default=1000, env="LLM_CACHE_SIZE")
+    llm_cache_ttl: float = Field(default=86400.0, env="LLM_CACHE_TTL")
     
     # AWS Configuration
     aws_access_key_id: Optional[str] = Field(default=None, env="AWS_ACCESS_KEY_ID")
@@ -43,16 +49,34 @@ class Settings(BaseSettings):
     
     # DynamoDB Configuration
     dynamodb_table_name: str = Field(default="email_processing_results", env="DYNAMODB_TABLE_NAME")
+    dynamodb_auto_create: bool = Field(default=True, env="DYNAMODB_AUTO_CREATE")
+    dynamodb_compact_items: bool = Field(default=False, env="DYNAMODB_COMPACT_ITEMS")
+    dynamodb_parallel_scan: bool = Field(default=False, env="DYNAMODB_PARALLEL_SCAN")
+    dynamodb_scan_segments: int = Field(default=8, env="DYNAMODB_SCAN_SEGMENTS")
     
     # ChromaDB Configuration
     chroma_persist_directory: str = Field(default="./data/chroma", env="CHROMA_PERSIST_DIRECTORY")
     chromadb_host: str = Field(default="localhost", env="CHROMADB_HOST")
     chromadb_port: int = Field(default=8000, env="CHROMADB_PORT")
     chromadb_use_external: bool = Field(default=False, env="CHROMADB_USE_EXTERNAL")
+    embedding_provider_probe: bool = Field(default=True, env="EMBEDDING_PROVIDER_PROBE")
+    embedding_probe_timeout: float = Field(default=10.0, env="EMBEDDING_PROBE_TIMEOUT")
+    embedding_cache_size: int = Field(default=2000, env="EMBEDDING_CACHE_SIZE")
+    embedding_cache_ttl: float = Field(default=600.0, env="EMBEDDING_CACHE_TTL")
+    embedding_cache_path: Optional[str] = Field(default="./data/embedding_cache.db", env="EMBEDDING_CACHE_PATH")
+    embedding_cache_persist_ttl: float = Field(default=604800.0, env="EMBEDDING_CACHE_PERSIST_TTL")
+    embedding_cache_near_duplicates: bool = Field(default=True, env="EMBEDDING_CACHE_NEAR_DUPLICATES")
     
     # Application Configuration
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     confidence_threshold: float = Field(default=0.85, env="CONFIDENCE_THRESHOLD")
+    batch_concurrency: int = Field(default=8, env="BATCH_CONCURRENCY")
+    vector_write_flush_interval: float = Field(default=0.0, env="VECTOR_WRITE_FLUSH_INTERVAL")
+    semantic_cache_enabled: bool = Field(default=True, env="SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.97, env="SEMANTIC_CACHE_THRESHOLD")
+    speculative_dpo_scrape: bool = Field(default=True, env="SPECULATIVE_DPO_SCRAPE")
+    draft_classifier_enabled: bool = Field(default=True, env="DRAFT_CLASSIFIER_ENABLED")
+    draft_threshold: float = Field(default=0.9, env="DRAFT_THRESHOLD")
     
     # PII Masking Configuration
     pii_mask_char: str = Field(default="*", env="PII_MASK_CHAR")
@@ -70,10 +94,22 @@ class Settings(BaseSettings):
     footer_lines_count: int = 3
     max_email_length: int = 10000
     
+    @cached_property
+    def pii_entities_set(self) -> frozenset:
+        """PII entity types as a frozenset for constant-time membership tests."""
+        return frozenset(self.pii_entities)
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
+        frozen = True
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, parsing the environment only once."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,10 +1,20 @@
 """DynamoDB service for storing processed email results."""
 
+import atexit
+import random
+import threading
+import time
 import uuid
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, Any, List, Optional, Union
+from statistics import fmean
+from typing import Dict, Any, Iterator, List, Optional, Union
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 import structlog
 
@@ -13,6 +23,85 @@ from app.models import ProcessedEmail
 
 logger = structlog.get_logger()
 
+# Aggregate statistics are kept on a sentinel item updated on every write
+STATS_ITEM_ID = '__stats__'
+CATEGORY_COUNT_PREFIX = 'category_count_'
+# Attributes read when seeding the aggregate from existing items (full and compact names)
+STATS_BACKFILL_PROJECTION = 'email_category, confidence_score, c, cs'
+
+# Short stored names for non-key attributes, used when compact items are enabled.
+# Key and index attributes (id, sender_domain, processed_at) keep their names so
+# existing tables and the sender-domain index continue to work.
+COMPACT_ATTRIBUTES = {
+    'email_category': 'c',
+    'confidence_score': 'cs',
+    'business_entity': 'be',
+    'data': 'da',
+    'metadata': 'm',
+    'created_at': 'ca'
+}
+_EXPANDED_ATTRIBUTES = {short: name for name, short in COMPACT_ATTRIBUTES.items()}
+
+# Shared decoder for low-level AttributeValue responses
+_DESERIALIZER = TypeDeserializer()
+
+# BatchGetItem accepts at most 100 keys and BatchWriteItem 25 items per request
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+# Backoff for resubmitting unprocessed batch items: full jitter, capped
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_CAP_SECONDS = 2.0
+BATCH_MAX_ATTEMPTS = 10
+
+# Buffered writes are flushed once a full batch is queued or after this many seconds
+BUFFER_FLUSH_INTERVAL = 0.5
+
+# Shared client configuration: pooled keep-alive connections and adaptive retries
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=2,
+    read_timeout=5
+)
+
+
+def _string_attribute(value: Optional[str]) -> Dict[str, Any]:
+    """Encode an optional string as a DynamoDB AttributeValue."""
+    return {'S': value} if value is not None else {'NULL': True}
+
+
+def _string_list_attribute(values: List[str]) -> Dict[str, Any]:
+    """Encode a list of strings as a DynamoDB list AttributeValue."""
+    return {'L': [{'S': value} for value in values]}
+
+
+def _expand_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore full attribute names on an item stored in compact form."""
+    return {_EXPANDED_ATTRIBUTES.get(key, key): value for key, value in item.items()}
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _autocreate_on_missing(func):
+    """Create the table and retry once when an operation hits a missing table."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except ClientError as exc:
+            if (exc.response['Error']['Code'] != 'ResourceNotFoundException'
+                    or not settings.dynamodb_auto_create):
+                raise
+            logger.info("Table not found, creating...", table_name=settings.dynamodb_table_name)
+            self._create_table()
+            return func(self, *args, **kwargs)
+    return wrapper
+
 
 class DynamoDBService:
     """Service for managing DynamoDB operations."""
@@ -20,7 +109,22 @@ class DynamoDBService:
     def __init__(self):
         """Initialize the DynamoDB service."""
         self._initialize_dynamodb()
-        self._ensure_table_exists()
+        
+        # Stored attribute names are resolved once for the configured layout
+        self._attribute_names = {
+            name: short if settings.dynamodb_compact_items else name
+            for name, short in COMPACT_ATTRIBUTES.items()
+        }
+        
+        # Write buffer drained by a background thread (started on first use)
+        self._buffer = deque()
+        self._buffer_lock = threading.Lock()
+        self._buffer_event = threading.Event()
+        self._flush_thread = None
+        
+        # One-time seeding of the aggregate statistics item (started on first use)
+        self._backfill_lock = threading.Lock()
+        self._backfill_thread = None
     
     def _initialize_dynamodb(self):
         """Initialize DynamoDB client and resource."""
@@ -35,8 +139,8 @@ class DynamoDBService:
             session = boto3.Session(**session_kwargs)
             
             # Create DynamoDB resource and client with endpoint URL for LocalStack
-            resource_kwargs = {}
-            client_kwargs = {}
+            resource_kwargs = {'config': BOTO_CONFIG}
+            client_kwargs = {'config': BOTO_CONFIG}
             
             if settings.aws_endpoint_url:
                 resource_kwargs['endpoint_url'] = settings.aws_endpoint_url
@@ -60,21 +164,6 @@ class DynamoDBService:
             logger.error("Failed to initialize DynamoDB", error=str(exc))
             raise
     
-    def _ensure_table_exists(self):
-        """Ensure the DynamoDB table exists, create if it doesn't."""
-        try:
-            # Try to describe the table
-            self.table.load()
-            logger.info("DynamoDB table exists", table_name=settings.dynamodb_table_name)
-            
-        except ClientError as exc:
-            if exc.response['Error']['Code'] == 'ResourceNotFoundException':
-                logger.info("Table not found, creating...", table_name=settings.dynamodb_table_name)
-                self._create_table()
-            else:
-                logger.error("Failed to check table existence", error=str(exc))
-                raise
-    
     def _create_table(self):
         """Create the DynamoDB table with proper schema."""
         try:
@@ -134,28 +223,232 @@ class DynamoDBService:
             logger.info("DynamoDB table created successfully", 
                        table_name=settings.dynamodb_table_name)
             
+        except ClientError as exc:
+            if exc.response['Error']['Code'] != 'ResourceInUseException':
+                logger.error("Failed to create DynamoDB table", error=str(exc))
+                raise
+            # Another worker is creating the table concurrently
+            self.table.wait_until_exists()
+            
         except Exception as exc:
             logger.error("Failed to create DynamoDB table", error=str(exc))
             raise
 
-    def _convert_floats_to_decimal(self, obj: Any) -> Any:
+    @_autocreate_on_missing
+    def _put_item(self, item: Dict[str, Any]) -> None:
+        """Write a single prebuilt AttributeValue item to the table."""
+        self.dynamodb_client.put_item(TableName=settings.dynamodb_table_name, Item=item)
+
+    @_autocreate_on_missing
+    def _batch_write_items(self, items: List[Dict[str, Any]]) -> None:
+        """Write prebuilt AttributeValue items in BatchWriteItem chunks."""
+        table_name = settings.dynamodb_table_name
+
+        for start in range(0, len(items), BATCH_WRITE_LIMIT):
+            request_items = {
+                table_name: [{'PutRequest': {'Item': item}} for item in items[start:start + BATCH_WRITE_LIMIT]]
+            }
+
+            # Resubmit only the writes DynamoDB did not process, backing off
+            # while the table is throttled
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(_backoff_delay(attempt))
+                response = self.dynamodb_client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    break
+            else:
+                unprocessed = sum(len(requests) for requests in request_items.values())
+                logger.error("Batch write left unprocessed items", unprocessed=unprocessed,
+                             attempts=BATCH_MAX_ATTEMPTS)
+                raise RuntimeError(f"{unprocessed} items remained unprocessed after "
+                                   f"{BATCH_MAX_ATTEMPTS} batch write attempts")
+
+    @_autocreate_on_missing
+    def _get_item(self, key: Dict[str, Any]) -> Dict[str, Any]:
+        """Read a single item from the table."""
+        return self.table.get_item(Key=key)
+
+    @_autocreate_on_missing
+    def _query(self, **query_params) -> Dict[str, Any]:
+        """Run a query against the table or one of its indexes."""
+        return self.table.query(**query_params)
+
+    def _record_statistics(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Add stored items to the aggregate statistics item.
+
+        Counters are updated atomically with a single UpdateItem per write,
+        so statistics never require scanning the table. The cost is one
+        extra write per store (or per batch) against the same item, so all
+        writes share one partition key; DynamoDB allows roughly 1,000 writes
+        per second to a single item, which bounds store throughput.
+
+        Counters are only added once backfill_statistics has seeded the
+        item from the existing rows; until then the condition fails and the
+        backfill scan counts these items instead.
+
+        Args:
+            items: Items that were just written
+        """
+        if not items:
+            return
+
+        items = [_expand_item(item) for item in items]
+
+        category_counts = {}
+        for item in items:
+            category = item['email_category']['S']
+            category_counts[category] = category_counts.get(category, 0) + 1
+
+        clauses = ['total_results :total', 'confidence_sum :confidence']
+        names = {}
+        values = {
+            ':total': len(items),
+            ':confidence': sum(Decimal(item['confidence_score']['N']) for item in items)
+        }
+        for index, (category, count) in enumerate(category_counts.items()):
+            names[f'#c{index}'] = f'{CATEGORY_COUNT_PREFIX}{category}'
+            values[f':c{index}'] = count
+            clauses.append(f'#c{index} :c{index}')
+
+        try:
+            self.table.update_item(
+                Key={'id': STATS_ITEM_ID},
+                UpdateExpression='ADD ' + ', '.join(clauses),
+                ConditionExpression='attribute_exists(id)',
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+        except ClientError as exc:
+            if exc.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.debug("Statistics not seeded yet, skipping update")
+            else:
+                logger.warning("Failed to update statistics", error=str(exc))
+        except Exception as exc:
+            # Statistics are best-effort and must not fail the write itself
+            logger.warning("Failed to update statistics", error=str(exc))
+
+    def backfill_statistics(self) -> bool:
+        """
+        Seed the aggregate statistics item from the items already stored.
+
+        Runs one paginated scan over the table, reading only category and
+        confidence, and creates the statistics item with a conditional put
+        so concurrent backfills in other processes cannot double count.
+        Writes that land between the scan passing them and the put are not
+        counted, so totals may be off by the writes in flight meanwhile.
+
+        Returns:
+            True if this call created the statistics item
         """
-        Recursively convert float values to Decimal for DynamoDB compatibility.
+        total = 0
+        confidence_sum = Decimal(0)
+        categories = Counter()
+
+        paginator = self.dynamodb_client.get_paginator('scan')
+        for page in paginator.paginate(
+            TableName=settings.dynamodb_table_name,
+            ProjectionExpression=STATS_BACKFILL_PROJECTION,
+            FilterExpression='id <> :stats_id',
+            ExpressionAttributeValues={':stats_id': {'S': STATS_ITEM_ID}}
+        ):
+            for item in page.get('Items', []):
+                item = _expand_item(item)
+                total += 1
+                categories[item.get('email_category', {}).get('S', 'unknown')] += 1
+                confidence_sum += Decimal(item.get('confidence_score', {}).get('N', '0'))
+
+        stats_item = {
+            'id': STATS_ITEM_ID,
+            'total_results': total,
+            'confidence_sum': confidence_sum,
+            **{f'{CATEGORY_COUNT_PREFIX}{category}': count for category, count in categories.items()}
+        }
+
+        try:
+            self.table.put_item(Item=stats_item, ConditionExpression='attribute_not_exists(id)')
+        except ClientError as exc:
+            if exc.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info("Statistics already seeded by another process")
+            return False
+
+        logger.info("Statistics seeded from existing items", total_results=total)
+        return True
+
+    def _start_statistics_backfill(self) -> None:
+        """Seed the statistics item on a background thread, once per service."""
+        with self._backfill_lock:
+            if self._backfill_thread is not None:
+                return
+            self._backfill_thread = threading.Thread(
+                target=self._run_statistics_backfill, name="dynamodb-stats-backfill", daemon=True
+            )
+            self._backfill_thread.start()
+
+    def _run_statistics_backfill(self) -> None:
+        """Run backfill_statistics, allowing a later call to retry after a failure."""
+        try:
+            self.backfill_statistics()
+        except Exception as exc:
+            logger.error("Failed to backfill statistics", error=str(exc))
+            with self._backfill_lock:
+                self._backfill_thread = None
+
+    def _build_item(self, processed_email: ProcessedEmail, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the DynamoDB item for a processed email result.
+
+        The item is emitted directly in low-level AttributeValue form, since
+        every attribute's type is fixed by the schema; this skips both the
+        float conversion pass and boto3's TypeSerializer.
 
         Args:
-            obj: Object that may contain float values
+            processed_email: Processed email result
+            timestamp: Ingest timestamp (ISO format), defaults to now
 
         Returns:
-            Object with floats converted to Decimals
+            Item in DynamoDB AttributeValue format
         """
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {key: self._convert_floats_to_decimal(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_floats_to_decimal(item) for item in obj]
-        else:
-            return obj
+        # Generate unique ID
+        doc_id = uuid.uuid4().hex
+
+        # Add timestamp
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).isoformat()
+
+        # Serialize nested models in one pass (URLs and emails become strings)
+        nested = processed_email.model_dump(
+            mode='json',
+            include={'business_entity', 'data', 'metadata'}
+        )
+
+        metadata = nested['metadata']
+
+        names = self._attribute_names
+
+        # Prepare item for storage
+        return {
+            'id': {'S': doc_id},
+            names['email_category']: {'S': processed_email.email_category.value},
+            names['business_entity']: {'M': {
+                key: _string_attribute(value) for key, value in nested['business_entity'].items()
+            }},
+            names['data']: {'M': {
+                key: _string_list_attribute(value or []) for key, value in nested['data'].items()
+            }},
+            names['confidence_score']: {'N': str(processed_email.confidence_score)},
+            'sender_domain': {'S': metadata['sender_domain'] if metadata else 'unknown'},
+            names['metadata']: {'M': {
+                'sender_domain': _string_attribute(metadata['sender_domain']),
+                'footer_text': _string_attribute(metadata['footer_text']),
+                'urls': _string_list_attribute(metadata['urls'])
+            }} if metadata else {'NULL': True},
+            'processed_at': {'S': timestamp},
+            names['created_at']: {'S': timestamp}
+        }
 
     def store_result(self, processed_email: ProcessedEmail) -> str:
         """
@@ -168,32 +461,14 @@ class DynamoDBService:
             Document ID of stored result
         """
         try:
-            # Generate unique ID
-            doc_id = str(uuid.uuid4())
-            
-            # Add timestamp
-            timestamp = datetime.now(timezone.utc).isoformat()
-            
-            # Prepare item for storage
-            item = {
-                'id': doc_id,
-                'email_category': processed_email.email_category.value,
-                'business_entity': self._serialize_business_entity(processed_email.business_entity),
-                'data': self._serialize_extracted_data(processed_email.data),
-                'confidence_score': processed_email.confidence_score,
-                'sender_domain': processed_email.metadata.sender_domain if processed_email.metadata else 'unknown',
-                'metadata': self._serialize_metadata(processed_email.metadata),
-                'processed_at': timestamp,
-                'created_at': timestamp
-            }
-
-            # Convert floats to Decimals for DynamoDB compatibility
-            item = self._convert_floats_to_decimal(item)
+            item = self._build_item(processed_email)
+            doc_id = item['id']['S']
 
             # Store in DynamoDB
-            self.table.put_item(Item=item)
+            self._put_item(item)
+            self._record_statistics([item])
             
-            logger.info("Email result stored", doc_id=doc_id, 
+            logger.debug("Email result stored", doc_id=doc_id, 
                        category=processed_email.email_category.value,
                        confidence=processed_email.confidence_score)
             
@@ -202,6 +477,110 @@ class DynamoDBService:
         except Exception as exc:
             logger.error("Failed to store email result", error=str(exc))
             raise
+
+    def store_results_bulk(self, processed_emails: List[ProcessedEmail]) -> List[str]:
+        """
+        Store multiple processed email results using batched writes.
+
+        Items are written in BatchWriteItem requests of up to 25 items and
+        unprocessed items are resubmitted.
+
+        Args:
+            processed_emails: Processed email results
+
+        Returns:
+            Document IDs of stored results, in input order
+        """
+        try:
+            # All items in a batch share one ingest timestamp
+            timestamp = datetime.now(timezone.utc).isoformat()
+            items = [self._build_item(processed_email, timestamp) for processed_email in processed_emails]
+            doc_ids = [item['id']['S'] for item in items]
+
+            self._batch_write_items(items)
+            self._record_statistics(items)
+
+            logger.info("Email results stored in bulk", count=len(doc_ids))
+
+            return doc_ids
+
+        except Exception as exc:
+            logger.error("Failed to store email results in bulk", error=str(exc))
+            raise
+    
+    def store_result_buffered(self, processed_email: ProcessedEmail) -> Future:
+        """
+        Queue a processed email result for a batched background write.
+        
+        Buffered results are written in BatchWriteItem requests once 25
+        items are queued or every 0.5 seconds, so callers that produce one
+        result at a time still get batched writes.
+        
+        Args:
+            processed_email: Processed email result
+            
+        Returns:
+            Future resolving to the document ID once the item is written
+        """
+        item = self._build_item(processed_email)
+        future = Future()
+        
+        with self._buffer_lock:
+            self._buffer.append((item, future))
+            buffered = len(self._buffer)
+            
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, name="dynamodb-flush", daemon=True
+                )
+                self._flush_thread.start()
+                atexit.register(self.flush)
+        
+        if buffered >= BATCH_WRITE_LIMIT:
+            self._buffer_event.set()
+        
+        return future
+    
+    def flush(self) -> None:
+        """Write all buffered results immediately."""
+        while self._flush_batch():
+            pass
+    
+    def _flush_loop(self) -> None:
+        """Drain the write buffer on size or time triggers."""
+        while True:
+            self._buffer_event.wait(timeout=BUFFER_FLUSH_INTERVAL)
+            self._buffer_event.clear()
+            self.flush()
+    
+    def _flush_batch(self) -> bool:
+        """
+        Write up to one batch of buffered results.
+        
+        Returns:
+            True if a batch was taken from the buffer, False if it was empty
+        """
+        with self._buffer_lock:
+            batch = [self._buffer.popleft() for _ in range(min(BATCH_WRITE_LIMIT, len(self._buffer)))]
+        
+        if not batch:
+            return False
+        
+        items = [item for item, _ in batch]
+        
+        try:
+            self._batch_write_items(items)
+            self._record_statistics(items)
+        except Exception as exc:
+            logger.error("Failed to flush buffered email results", count=len(items), error=str(exc))
+            for _, future in batch:
+                future.set_exception(exc)
+        else:
+            logger.info("Buffered email results stored", count=len(items))
+            for item, future in batch:
+                future.set_result(item['id']['S'])
+        
+        return True
     
     def get_result(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -214,10 +593,10 @@ class DynamoDBService:
             Stored result or None if not found
         """
         try:
-            response = self.table.get_item(Key={'id': doc_id})
+            response = self._get_item({'id': doc_id})
             
             if 'Item' in response:
-                return response['Item']
+                return _expand_item(response['Item'])
             else:
                 logger.warning("Result not found", doc_id=doc_id)
                 return None
@@ -226,6 +605,90 @@ class DynamoDBService:
             logger.error("Failed to retrieve result", doc_id=doc_id, error=str(exc))
             return None
     
+    def get_results(self, doc_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Retrieve multiple processed email results by ID.
+        
+        IDs are fetched with BatchGetItem in chunks of up to 100 keys, so
+        N results cost one request per chunk instead of one per ID.
+        
+        Args:
+            doc_ids: Document IDs
+            
+        Returns:
+            Stored results in input order; IDs that are not found are skipped
+        """
+        try:
+            table_name = settings.dynamodb_table_name
+            found = {}
+            
+            for start in range(0, len(doc_ids), BATCH_GET_LIMIT):
+                request_items = {
+                    table_name: {
+                        'Keys': [{'id': {'S': doc_id}} for doc_id in doc_ids[start:start + BATCH_GET_LIMIT]]
+                    }
+                }
+                
+                # Resubmit any keys DynamoDB did not process, backing off
+                # while the table is throttled
+                for attempt in range(BATCH_MAX_ATTEMPTS):
+                    if attempt:
+                        time.sleep(_backoff_delay(attempt))
+                    response = self.dynamodb_client.batch_get_item(RequestItems=request_items)
+                    
+                    for raw_item in response.get('Responses', {}).get(table_name, []):
+                        item = {key: _DESERIALIZER.deserialize(value) for key, value in raw_item.items()}
+                        found[item['id']] = _expand_item(item)
+                    
+                    request_items = response.get('UnprocessedKeys')
+                    if not request_items:
+                        break
+                else:
+                    logger.error("Batch get left unprocessed keys",
+                                 unprocessed=len(request_items[table_name]['Keys']),
+                                 attempts=BATCH_MAX_ATTEMPTS)
+            
+            logger.debug("Batch result lookup completed", requested=len(doc_ids), found=len(found))
+            
+            return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+            
+        except Exception as exc:
+            logger.error("Failed to retrieve results", count=len(doc_ids), error=str(exc))
+            return []
+    
+    def _build_domain_query(
+        self,
+        sender_domain: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build query parameters for the sender domain index."""
+        key_condition = 'sender_domain = :domain'
+        values = {':domain': sender_domain}
+        
+        # processed_at is the index sort key, so date bounds go in the key
+        # condition and only the selected range is read
+        if start_date and end_date:
+            key_condition += ' AND processed_at BETWEEN :start_date AND :end_date'
+        elif start_date:
+            key_condition += ' AND processed_at >= :start_date'
+        elif end_date:
+            key_condition += ' AND processed_at <= :end_date'
+        
+        if start_date:
+            values[':start_date'] = start_date
+        if end_date:
+            values[':end_date'] = end_date
+        
+        query_params = {
+            'IndexName': 'sender-domain-index',
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': values,
+            'ScanIndexForward': False  # Sort by processed_at descending
+        }
+        
+        return query_params
+    
     def query_by_domain(
         self,
         sender_domain: str,
@@ -247,35 +710,13 @@ class DynamoDBService:
         """
         try:
             # Build query parameters
-            query_params = {
-                'IndexName': 'sender-domain-index',
-                'KeyConditionExpression': 'sender_domain = :domain',
-                'ExpressionAttributeValues': {
-                    ':domain': sender_domain
-                },
-                'Limit': limit,
-                'ScanIndexForward': False  # Sort by processed_at descending
-            }
-            
-            # Add date range filter if provided
-            if start_date or end_date:
-                filter_expressions = []
-                
-                if start_date:
-                    filter_expressions.append('processed_at >= :start_date')
-                    query_params['ExpressionAttributeValues'][':start_date'] = start_date
-                
-                if end_date:
-                    filter_expressions.append('processed_at <= :end_date')
-                    query_params['ExpressionAttributeValues'][':end_date'] = end_date
-                
-                if filter_expressions:
-                    query_params['FilterExpression'] = ' AND '.join(filter_expressions)
+            query_params = self._build_domain_query(sender_domain, start_date, end_date)
+            query_params['Limit'] = limit
             
             # Execute query
-            response = self.table.query(**query_params)
+            response = self._query(**query_params)
             
-            results = response.get('Items', [])
+            results = [_expand_item(item) for item in response.get('Items', [])]
             
             logger.debug("Domain query completed", 
                         domain=sender_domain, 
@@ -288,88 +729,163 @@ class DynamoDBService:
                         domain=sender_domain, error=str(exc))
             return []
     
-    def get_statistics(self) -> Dict[str, Any]:
+    def query_by_domain_iter(
+        self,
+        sender_domain: str,
+        page_size: int = 500,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Get statistics about stored results.
+        Iterate over all results for a sender domain, page by page.
         
-        Returns:
-            Dictionary with statistics
-        """
-        try:
-            # Scan table to get basic statistics
-            # Note: This is expensive for large tables, consider using CloudWatch metrics
-            response = self.table.scan(
-                Select='COUNT'
-            )
-            
-            total_count = response.get('Count', 0)
-            
-            # Get sample of recent items for category distribution
-            sample_response = self.table.scan(
-                Limit=100,
-                ProjectionExpression='email_category, confidence_score, sender_domain'
-            )
-            
-            items = sample_response.get('Items', [])
+        The next page is requested in a background thread while the caller
+        consumes the current one, hiding the round-trip between pages.
+        
+        Args:
+            sender_domain: Sender domain to query
+            page_size: Number of items requested per page
+            start_date: Start date filter (ISO format)
+            end_date: End date filter (ISO format)
             
-            # Calculate statistics from sample
-            categories = {}
-            domains = {}
-            confidence_scores = []
+        Yields:
+            Matching results, newest first
+        """
+        query_params = self._build_domain_query(sender_domain, start_date, end_date)
+        query_params['Limit'] = page_size
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._query, **query_params)
             
-            for item in items:
-                # Category distribution
-                category = item.get('email_category', 'unknown')
-                categories[category] = categories.get(category, 0) + 1
+            while future is not None:
+                response = future.result()
                 
-                # Domain distribution
-                domain = item.get('sender_domain', 'unknown')
-                domains[domain] = domains.get(domain, 0) + 1
+                # Prefetch the next page before handing out this one
+                last_key = response.get('LastEvaluatedKey')
+                if last_key:
+                    future = executor.submit(self._query, ExclusiveStartKey=last_key, **query_params)
+                else:
+                    future = None
                 
-                # Confidence scores
-                confidence = item.get('confidence_score', 0)
-                confidence_scores.append(confidence)
-            
-            # Calculate average confidence
-            avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+                for item in response.get('Items', []):
+                    yield _expand_item(item)
+    
+    def _scan_sample(self, limit: int, **scan_params) -> List[Dict[str, Any]]:
+        """
+        Scan a bounded sample of items from the table.
+        
+        With parallel scans enabled, the sample is split across disjoint
+        Segment/TotalSegments scans issued concurrently. This cuts
+        wall-clock time at the same total read cost, but raises burst
+        read consumption, so it is opt-in.
+        
+        Args:
+            limit: Maximum number of items to read
+            **scan_params: Additional Scan parameters
             
-            return {
+        Returns:
+            Sampled items
+        """
+        segments = settings.dynamodb_scan_segments
+        
+        if not settings.dynamodb_parallel_scan or segments <= 1:
+            return self.table.scan(Limit=limit, **scan_params).get('Items', [])
+        
+        segment_limit = -(-limit // segments)
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [
+                executor.submit(
+                    self.table.scan,
+                    Limit=segment_limit,
+                    Segment=segment,
+                    TotalSegments=segments,
+                    **scan_params
+                )
+                for segment in range(segments)
+            ]
+            items = [item for future in futures for item in future.result().get('Items', [])]
+        
+        return items[:limit]
+    
+    def get_statistics(self, include_domains: bool = False) -> Dict[str, Any]:
+        """
+        Get statistics about stored results.
+        
+        Totals, category counts and average confidence come from the
+        aggregate statistics item maintained on every write, so once it is
+        seeded this is a single GetItem. Until then, the first call starts
+        the backfill in the background, and the table's item count and a
+        bounded sample are reported instead.
+        
+        Args:
+            include_domains: Also report the top sender domains, counted
+                from a bounded sample scan
+        
+        Returns:
+            Dictionary with statistics
+        """
+        try:
+            stats_item = self._get_item({'id': STATS_ITEM_ID}).get('Item')
+            
+            items = []
+            if include_domains or not stats_item:
+                items = [_expand_item(item) for item in self._scan_sample(
+                    100,
+                    ProjectionExpression='email_category, confidence_score, sender_domain, c, cs',
+                    FilterExpression='id <> :stats_id',
+                    ExpressionAttributeValues={':stats_id': STATS_ITEM_ID}
+                )]
+            
+            if stats_item:
+                total_count = int(stats_item.get('total_results', 0))
+                categories = {
+                    key[len(CATEGORY_COUNT_PREFIX):]: int(value)
+                    for key, value in stats_item.items()
+                    if key.startswith(CATEGORY_COUNT_PREFIX)
+                }
+                confidence_sum = stats_item.get('confidence_sum', 0)
+                avg_confidence = confidence_sum / total_count if total_count else 0
+            else:
+                # No aggregate yet: seed it and meanwhile use the table's
+                # (eventually consistent) item count
+                self._start_statistics_backfill()
+                description = self.dynamodb_client.describe_table(
+                    TableName=settings.dynamodb_table_name
+                )
+                total_count = description['Table'].get('ItemCount', 0)
+                categories = dict(Counter(item.get('email_category', 'unknown') for item in items))
+                avg_confidence = fmean(float(item.get('confidence_score', 0)) for item in items) if items else 0
+            
+            stats = {
                 'total_results': total_count,
-                'sample_size': len(items),
                 'category_distribution': categories,
-                'top_domains': dict(sorted(domains.items(), key=lambda x: x[1], reverse=True)[:10]),
-                'average_confidence': round(avg_confidence, 3)
+                'average_confidence': round(float(avg_confidence), 3)
             }
+            if items or include_domains:
+                stats['sample_size'] = len(items)
+            if include_domains:
+                domains = Counter(item.get('sender_domain', 'unknown') for item in items)
+                stats['top_domains'] = dict(domains.most_common(10))
+            
+            return stats
             
         except Exception as exc:
             logger.error("Failed to get statistics", error=str(exc))
             return {'total_results': 0, 'error': str(exc)}
+
+
+@lru_cache(maxsize=1)
+def get_dynamodb_service() -> DynamoDBService:
+    """Get the process-wide DynamoDB service, reusing its pooled connections."""
+    return DynamoDBService()
+
+
+class _LazyDynamoDBService:
+    """Proxy that creates the shared DynamoDB service on first attribute access."""
     
-    def _serialize_business_entity(self, business_entity) -> Dict[str, Any]:
-        """Serialize business entity for DynamoDB storage."""
-        return {
-            'name': business_entity.name,
-            'website': str(business_entity.website) if business_entity.website else None,
-            'dpo_email': business_entity.dpo_email,
-            'industry': business_entity.industry,
-            'location': business_entity.location
-        }
-    
-    def _serialize_extracted_data(self, extracted_data) -> Dict[str, Any]:
-        """Serialize extracted data for DynamoDB storage."""
-        return {
-            'email': extracted_data.email or [],
-            'phone_number': extracted_data.phone_number or [],
-            'credit_card_number': extracted_data.credit_card_number or []
-        }
-    
-    def _serialize_metadata(self, metadata) -> Optional[Dict[str, Any]]:
-        """Serialize email metadata for DynamoDB storage."""
-        if not metadata:
-            return None
-        
-        return {
-            'sender_domain': metadata.sender_domain,
-            'footer_text': metadata.footer_text,
-            'urls': metadata.urls
-        }
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_dynamodb_service(), name)
+
+
+# Global DynamoDB service; boto3 session and clients are created on first use
+dynamodb_service = _LazyDynamoDBService()
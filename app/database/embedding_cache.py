@@ -0,0 +1,480 @@
+"""In-process LRU cache with expiry for text embeddings."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+
+# Persistent cache writes between deletions of expired rows
+PERSIST_PRUNE_INTERVAL = 1000
+
+# Mersenne prime used by the MinHash permutations; a * h stays below 2**63
+MINHASH_PRIME = (1 << 31) - 1
+
+
+class MinHashIndex:
+    """
+    MinHash signatures with a banded LSH index for near-duplicate lookup.
+
+    Texts are normalized (lowercased, URLs removed) and split into word
+    tokens. Candidates sharing an LSH band are confirmed by comparing their
+    signatures, so only texts with an estimated Jaccard similarity at or
+    above the threshold are returned. The index keeps at most maxsize
+    signatures and forgets the oldest first.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        threshold: float = 0.9,
+        bands: int = 8,
+        maxsize: int = 10000,
+        seed: int = 1
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: Number of hash permutations per signature
+            threshold: Minimum estimated Jaccard similarity for a match
+            bands: Number of LSH bands; num_perm must divide evenly
+            maxsize: Maximum number of indexed signatures
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.maxsize = maxsize
+        self._signatures: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to sign
+
+        Returns:
+            Signature array, or None if the text has no tokens
+        """
+        tokens = set(URL_PATTERN.sub(' ', text.lower()).split())
+        if not tokens:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode()) for token in tokens),
+            dtype=np.uint64,
+            count=len(tokens)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % MINHASH_PRIME
+        return permuted.min(axis=0)
+
+    def _bands(self, signature: np.ndarray):
+        return (
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        )
+
+    def query(self, signature: np.ndarray) -> Optional[bytes]:
+        """
+        Find an indexed key whose signature is similar enough.
+
+        Args:
+            signature: Signature of the query text
+
+        Returns:
+            Key of the first confirmed near duplicate, or None
+        """
+        seen = set()
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            for key in bucket.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                if np.mean(self._signatures[key] == signature) >= self.threshold:
+                    return key
+        return None
+
+    def insert(self, key: bytes, signature: np.ndarray) -> None:
+        """
+        Index a signature under key, evicting the oldest entries when full.
+
+        Args:
+            key: Cache key of the text
+            signature: Signature of the text
+        """
+        if key in self._signatures:
+            return
+
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            bucket[band].add(key)
+
+        while len(self._signatures) > self.maxsize:
+            self.remove(next(iter(self._signatures)))
+
+    def remove(self, key: bytes) -> None:
+        """Drop a key from the index."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
+
+    def clear(self) -> None:
+        """Drop all indexed signatures."""
+        self._signatures.clear()
+        for bucket in self._buckets:
+            bucket.clear()
+
+
+class EmbeddingCache:
+    """
+    Embeddings wrapper that caches vectors by the SHA-256 of their text.
+
+    Marketing blasts and repeated senders produce identical embedding texts,
+    so cache hits replace an embeddings API call with a dictionary lookup.
+    Entries are evicted least recently used first and expire after ttl
+    seconds. With near_duplicates enabled, texts longer than
+    near_duplicate_min_length that miss the exact lookup can reuse the
+    vector of an indexed text with an estimated Jaccard similarity of at
+    least 0.9, so templated emails differing only in a name share one
+    embedding. With persist_path set, vectors are also written to a SQLite
+    file that outlives the process and is shared by workers on the same
+    host; in-memory misses are looked up there before calling the provider.
+    Attributes not defined here are delegated to the wrapped embeddings
+    object.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        maxsize: int = 2000,
+        ttl: float = 600.0,
+        near_duplicates: bool = False,
+        near_duplicate_min_length: int = 200,
+        persist_path: Optional[str] = None,
+        persist_ttl: float = 7 * 24 * 3600.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embeddings: LangChain embeddings object to wrap
+            maxsize: Maximum number of cached vectors
+            ttl: Seconds a cached vector stays valid
+            near_duplicates: Whether to reuse vectors of near-duplicate texts
+            near_duplicate_min_length: Minimum text length for near-duplicate lookup
+            persist_path: SQLite file for the persistent cache; None disables it
+            persist_ttl: Seconds a persisted vector stays valid
+        """
+        self.embeddings = embeddings
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.near_duplicate_min_length = near_duplicate_min_length
+        self._near_index = MinHashIndex() if near_duplicates else None
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.near_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Vectors from different models must never be shared through the
+        # persistent cache, so the model identity is part of every key
+        self._namespace = (
+            f"{type(embeddings).__name__}:{getattr(embeddings, 'model', '')}\0".encode()
+        )
+        self.persist_ttl = persist_ttl
+        self._db = self._open_store(persist_path) if persist_path else None
+        self._writes_since_prune = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.embeddings, name)
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(self._namespace + text.encode()).digest()
+
+    def _open_store(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the persistent cache database, or None if it is unusable."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM embeddings WHERE created_at < ?", (time.time() - self.persist_ttl,))
+            logger.info("Persistent embedding cache opened", path=path)
+            return db
+
+        except sqlite3.Error as exc:
+            logger.warning("Persistent embedding cache unavailable", path=path, error=str(exc))
+            return None
+
+    def _load_persisted(self, key: bytes) -> Optional[np.ndarray]:
+        """Read an unexpired vector from the persistent cache into memory."""
+        try:
+            row = self._db.execute(
+                "SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Persistent embedding cache read failed", error=str(exc))
+            return None
+
+        if row is None or row[1] < time.time() - self.persist_ttl:
+            return None
+
+        vector = np.frombuffer(row[0], dtype=np.float32)
+        self._entries[key] = (vector, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self._evict()
+        return vector
+
+    def _persist(self, key: bytes, vector: np.ndarray) -> None:
+        """Write a vector to the persistent cache, pruning expired rows now and then."""
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                (key, vector.tobytes(), time.time())
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= PERSIST_PRUNE_INTERVAL:
+                self._writes_since_prune = 0
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE created_at < ?",
+                    (time.time() - self.persist_ttl,)
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Persistent embedding cache write failed", error=str(exc))
+
+    def _cached_vector(self, key: bytes) -> Optional[np.ndarray]:
+        """Return the unexpired vector for key, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        vector, expires_at = entry
+        if expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            return vector
+
+        del self._entries[key]
+        if self._near_index is not None:
+            self._near_index.remove(key)
+        return None
+
+    def _lookup(self, key: bytes, text: str):
+        """
+        Look up the vector for a text.
+
+        Returns:
+            Tuple of (vector or None, MinHash signature to index on a miss)
+        """
+        with self._lock:
+            vector = self._cached_vector(key)
+            if vector is not None:
+                self.hits += 1
+                return vector, None
+
+            if self._db is not None:
+                vector = self._load_persisted(key)
+                if vector is not None:
+                    self.disk_hits += 1
+                    return vector, None
+
+            signature = None
+            if self._near_index is not None and len(text) > self.near_duplicate_min_length:
+                signature = self._near_index.signature(text)
+                if signature is not None:
+                    match = self._near_index.query(signature)
+                    vector = self._cached_vector(match) if match is not None else None
+                    if vector is not None:
+                        self.near_hits += 1
+                        return vector, None
+
+            self.misses += 1
+            return None, signature
+
+    def _store(self, key: bytes, embedding: List[float], signature=None) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            if signature is not None:
+                self._near_index.insert(key, signature)
+            if self._db is not None:
+                self._persist(key, vector)
+            self._evict()
+        return vector
+
+    def _evict(self) -> None:
+        """Drop least recently used vectors beyond maxsize."""
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._near_index is not None:
+                self._near_index.remove(evicted)
+
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """
+        Embed a single text as a float32 array, using the cache when possible.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        key = self._key(text)
+        vector, signature = self._lookup(key, text)
+        if vector is None:
+            vector = self._store(key, self.embeddings.embed_query(text), signature)
+        return vector
+
+    async def aembed_query_array(self, text: str) -> np.ndarray:
+        """
+        Asynchronously embed a single text as a float32 array.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        key = self._key(text)
+        vector, signature = self._lookup(key, text)
+        if vector is None:
+            vector = self._store(key, await self.embeddings.aembed_query(text), signature)
+        return vector
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed several texts as a 2-D float32 array, requesting only uncached ones.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding matrix with one row per text, in input order
+        """
+        keys, results, missing, signatures = self._partition(texts)
+
+        if missing:
+            embedded = self.embeddings.embed_documents([texts[i] for i in missing])
+            self._fill(keys, results, missing, signatures, embedded)
+
+        return np.stack(results) if results else np.empty((0, 0), dtype=np.float32)
+
+    async def aembed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Asynchronously embed several texts as a 2-D float32 array.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding matrix with one row per text, in input order
+        """
+        keys, results, missing, signatures = self._partition(texts)
+
+        if missing:
+            embedded = await self.embeddings.aembed_documents([texts[i] for i in missing])
+            self._fill(keys, results, missing, signatures, embedded)
+
+        return np.stack(results) if results else np.empty((0, 0), dtype=np.float32)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single text, using the cache when possible."""
+        return self.embed_query_array(text).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a single text, using the cache when possible."""
+        return (await self.aembed_query_array(text)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, requesting only the ones not already cached."""
+        return self.embed_documents_array(texts).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed several texts, requesting only uncached ones."""
+        return (await self.aembed_documents_array(texts)).tolist()
+
+    def _partition(self, texts: List[str]):
+        """Split texts into cached vectors and indexes that still need embedding."""
+        keys = [self._key(text) for text in texts]
+        results = [None] * len(texts)
+        missing = []
+        signatures = []
+
+        for index, (key, text) in enumerate(zip(keys, texts)):
+            vector, signature = self._lookup(key, text)
+            if vector is None:
+                missing.append(index)
+                signatures.append(signature)
+            else:
+                results[index] = vector
+
+        return keys, results, missing, signatures
+
+    def _fill(self, keys, results, missing, signatures, embedded) -> None:
+        for index, signature, embedding in zip(missing, signatures, embedded):
+            results[index] = self._store(keys[index], embedding, signature)
+
+    def clear(self) -> None:
+        """Drop all cached vectors."""
+        with self._lock:
+            self._entries.clear()
+            if self._near_index is not None:
+                self._near_index.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM embeddings")
+                except sqlite3.Error as exc:
+                    logger.warning("Persistent embedding cache clear failed", error=str(exc))
+        logger.info("Embedding cache cleared")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary with size, hits, near-duplicate hits, persistent
+            cache hits, misses and hit rate
+        """
+        with self._lock:
+            hits = self.hits + self.near_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
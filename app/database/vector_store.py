@@ -1,40 +1,155 @@
 """Vector store service using ChromaDB for similarity search."""
 
+import asyncio
+import atexit
+import hashlib
+import importlib
+import json
 import os
-import uuid
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+import numpy as np
 import chromadb
 from chromadb.config import Settings
-from langchain_community.embeddings import OpenAIEmbeddings
 from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 import structlog
 
 from app.config import settings as app_settings
 from app.models import EmailMetadata, BusinessEntity, EmailCategory
+from app.database.embedding_cache import EmbeddingCache
 
-# Try to import additional embedding providers
-try:
-    from langchain_community.embeddings import OllamaEmbeddings
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+logger = structlog.get_logger()
 
-try:
-    from langchain_google_genai import GoogleGenerativeAIEmbeddings
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+# Embeddings class for each provider, imported only when the provider is tried
+PROVIDER_EMBEDDINGS = {
+    "openai": ("langchain_community.embeddings", "OpenAIEmbeddings"),
+    "gemini": ("langchain_google_genai", "GoogleGenerativeAIEmbeddings"),
+    "ollama": ("langchain_community.embeddings", "OllamaEmbeddings")
+}
 
-logger = structlog.get_logger()
+COLLECTION_NAME = "email_embeddings"
+COLLECTION_METADATA = {"description": "Email content embeddings for similarity search"}
+
+# Items per embed_documents call and per Chroma add; Chroma recommends 50-250
+EMBEDDING_BATCH_SIZE = 128
+
+# Embedding requests allowed in flight at once by the async bulk path
+EMBEDDING_MAX_CONCURRENCY = 4
+
+# Distinct metadata values reported by get_collection_stats, by stats key
+STATS_FIELDS = {
+    "domains": "sender_domain",
+    "categories": "email_category",
+    "industries": "business_industry"
+}
+STATS_SIDECAR_FILENAME = "collection_stats.json"
+STATS_PAGE_SIZE = 10000
+# New distinct values are written to the sidecar at most once per this many seconds
+STATS_PERSIST_DELAY = 5.0
+
+# Stored emails read per sender domain when seeding draft classification history
+DOMAIN_HISTORY_LIMIT = 200
+
+EmbeddingItem = Tuple[str, EmailMetadata, EmailCategory, BusinessEntity, float]
+
+
+def _document_id(text: str) -> str:
+    """Derive a stable document ID from the embedding text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _unique_documents(
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    doc_ids: List[str]
+) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+    """Drop repeated document IDs from a batch, keeping the last metadata."""
+    if len(set(doc_ids)) == len(doc_ids):
+        return texts, metadatas, doc_ids
+    
+    latest = {doc_id: index for index, doc_id in enumerate(doc_ids)}
+    indexes = sorted(latest.values())
+    return (
+        [texts[i] for i in indexes],
+        [metadatas[i] for i in indexes],
+        [doc_ids[i] for i in indexes]
+    )
+
+
+def _url_domain(url: str) -> str:
+    """Get the network location of a URL, or an empty string if it is malformed."""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ""
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """Check whether an embeddings provider error is an HTTP 429."""
+    if getattr(exc, 'status_code', None) == 429:
+        return True
+    message = str(exc).lower()
+    return '429' in message or 'rate limit' in message
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic placeholder embeddings derived from a hash of the text.
+
+    Used when no embeddings provider is reachable. The vectors carry no
+    meaning, but identical texts always map to the same unit vector, so
+    exact duplicates still match and the embedding cache stays effective.
+    """
+
+    def __init__(self, dim: int = 1536):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(
+            hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little'
+        )
+        vector = np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
 
 
 class VectorStoreService:
     """Service for managing vector embeddings and similarity search."""
     
+    # Import results for optional embeddings providers, shared by all instances
+    _provider_available: Dict[str, bool] = {}
+    
     def __init__(self):
         """Initialize the vector store service."""
         self._initialize_chroma()
         self._initialize_embeddings()
+        self.embeddings = EmbeddingCache(
+            self.embeddings,
+            maxsize=app_settings.embedding_cache_size,
+            ttl=app_settings.embedding_cache_ttl,
+            near_duplicates=app_settings.embedding_cache_near_duplicates,
+            persist_path=app_settings.embedding_cache_path or None,
+            persist_ttl=app_settings.embedding_cache_persist_ttl
+        )
+        self._buffer = deque()
+        self._buffer_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._stats_lock = threading.Lock()
+        self._sidecar_lock = threading.Lock()
+        self._stats_timer: Optional[threading.Timer] = None
+        self._stats_atexit = False
+        self._stats_path = os.path.join(
+            app_settings.chroma_persist_directory, STATS_SIDECAR_FILENAME
+        )
+        self._load_distinct_values()
     
     def _initialize_chroma(self):
         """Initialize ChromaDB client and collection."""
@@ -68,11 +183,12 @@ class VectorStoreService:
 
             # Get or create collection
             self.collection = self.chroma_client.get_or_create_collection(
-                name="email_embeddings",
-                metadata={"description": "Email content embeddings for similarity search"}
+                name=COLLECTION_NAME,
+                metadata=COLLECTION_METADATA
             )
+            self._async_collection = None
 
-            logger.info("ChromaDB collection ready", collection_name="email_embeddings")
+            logger.info("ChromaDB collection ready", collection_name=COLLECTION_NAME)
             
         except Exception as exc:
             logger.error("Failed to initialize ChromaDB", error=str(exc))
@@ -83,94 +199,113 @@ class VectorStoreService:
         provider = app_settings.llm_provider.lower()
         logger.info("Initializing embeddings", provider=provider)
 
-        # Try primary provider first
+        # Try primary provider first, then the others in order
+        candidates = [provider] + [name for name in PROVIDER_EMBEDDINGS if name != provider]
+
+        # Providers are probed one at a time, so fallbacks are only contacted
+        # once the provider before them has failed. Each probe runs on its own
+        # thread so a hung provider is abandoned after the timeout.
+        executor = ThreadPoolExecutor(
+            max_workers=len(candidates), thread_name_prefix="embeddings-probe"
+        )
         try:
-            if provider == "openai" and app_settings.openai_api_key:
-                self.embeddings = OpenAIEmbeddings(
-                    openai_api_key=app_settings.openai_api_key,
-                    model="text-embedding-ada-002"
-                )
-                logger.info("OpenAI embeddings initialized successfully")
-                return
+            for candidate in candidates:
+                future = executor.submit(self._probe_provider, candidate)
+                try:
+                    embeddings = future.result(timeout=app_settings.embedding_probe_timeout)
+                except Exception as exc:
+                    logger.warning("Embeddings provider failed",
+                                  provider=candidate, error=str(exc) or type(exc).__name__)
+                    continue
 
-            elif provider == "gemini" and GEMINI_AVAILABLE and app_settings.gemini_api_key:
-                self.embeddings = GoogleGenerativeAIEmbeddings(
-                    google_api_key=app_settings.gemini_api_key,
-                    model="models/embedding-001"
-                )
-                logger.info("Gemini embeddings initialized successfully")
+                self.embeddings = embeddings
+                logger.info("Embeddings initialized successfully",
+                           provider=candidate,
+                           fallback=candidate != provider)
                 return
 
-            elif provider == "ollama" and OLLAMA_AVAILABLE:
-                self.embeddings = OllamaEmbeddings(
-                    base_url=app_settings.ollama_base_url,
-                    model="nomic-embed-text"
-                )
-                logger.info("Ollama embeddings initialized successfully")
-                return
-            else:
-                raise ValueError(f"Primary provider {provider} not available or missing credentials")
+        finally:
+            executor.shutdown(wait=False)
 
-        except Exception as exc:
-            logger.warning("Primary embeddings provider failed",
-                          provider=provider, error=str(exc))
-
-        # Try fallback providers
-        fallback_providers = [
-            ("openai", app_settings.openai_api_key),
-            ("gemini", app_settings.gemini_api_key and GEMINI_AVAILABLE),
-            ("ollama", OLLAMA_AVAILABLE)
-        ]
-
-        for fallback_provider, available in fallback_providers:
-            if fallback_provider == provider:
-                continue  # Skip the one we already tried
-
-            if not available:
-                continue
-
-            try:
-                logger.info("Trying fallback embeddings provider", fallback=fallback_provider)
-
-                if fallback_provider == "openai":
-                    self.embeddings = OpenAIEmbeddings(
-                        openai_api_key=app_settings.openai_api_key,
-                        model="text-embedding-ada-002"
-                    )
-                    logger.info("Fallback to OpenAI embeddings successful")
-                    return
+        # If all providers fail, create a mock embeddings service
+        logger.error("All embeddings providers failed, creating mock embeddings")
+        self._create_mock_embeddings()
 
-                elif fallback_provider == "gemini":
-                    self.embeddings = GoogleGenerativeAIEmbeddings(
-                        google_api_key=app_settings.gemini_api_key,
-                        model="models/embedding-001"
-                    )
-                    logger.info("Fallback to Gemini embeddings successful")
-                    return
+    def _probe_provider(self, provider: str):
+        """Create a provider's embeddings and, if enabled, check it with one request."""
+        embeddings = self._create_provider_embeddings(provider)
+        if app_settings.embedding_provider_probe:
+            embeddings.embed_query("health check")
+        return embeddings
 
-                elif fallback_provider == "ollama":
-                    self.embeddings = OllamaEmbeddings(
-                        base_url=app_settings.ollama_base_url,
-                        model="nomic-embed-text"
-                    )
-                    logger.info("Fallback to Ollama embeddings successful")
-                    return
+    @classmethod
+    def _load_provider(cls, provider: str):
+        """
+        Import the embeddings class for a provider.
+        
+        Import failures are remembered so missing optional packages are not
+        searched for again by later instances.
+        
+        Args:
+            provider: Provider name
+            
+        Returns:
+            Embeddings class, or None if its package is not installed
+        """
+        if cls._provider_available.get(provider) is False:
+            return None
 
-            except Exception as fallback_exc:
-                logger.warning("Fallback embeddings provider failed",
-                             provider=fallback_provider, error=str(fallback_exc))
-                continue
+        module_name, class_name = PROVIDER_EMBEDDINGS[provider]
+        try:
+            embeddings_class = getattr(importlib.import_module(module_name), class_name)
+        except ImportError:
+            cls._provider_available[provider] = False
+            return None
 
-        # If all providers fail, create a mock embeddings service
-        logger.error("All embeddings providers failed, creating mock embeddings")
-        self._create_mock_embeddings()
+        cls._provider_available[provider] = True
+        return embeddings_class
+
+    def _create_provider_embeddings(self, provider: str):
+        """
+        Create the embeddings client for a provider.
+        
+        Args:
+            provider: Provider name
+            
+        Returns:
+            LangChain embeddings object
+        """
+        if provider not in PROVIDER_EMBEDDINGS:
+            raise ValueError(f"Unknown embeddings provider: {provider}")
+
+        if provider == "openai" and not app_settings.openai_api_key:
+            raise ValueError("OpenAI API key not configured")
+        if provider == "gemini" and not app_settings.gemini_api_key:
+            raise ValueError("Gemini API key not configured")
+
+        embeddings_class = self._load_provider(provider)
+        if embeddings_class is None:
+            raise ValueError(f"Embeddings package for {provider} is not installed")
+
+        if provider == "openai":
+            return embeddings_class(
+                openai_api_key=app_settings.openai_api_key,
+                model="text-embedding-ada-002"
+            )
+        if provider == "gemini":
+            return embeddings_class(
+                google_api_key=app_settings.gemini_api_key,
+                model="models/embedding-001"
+            )
+        return embeddings_class(
+            base_url=app_settings.ollama_base_url,
+            model="nomic-embed-text"
+        )
 
     def _create_mock_embeddings(self):
         """Create a mock embeddings service when all providers fail."""
-        from langchain.embeddings.fake import FakeEmbeddings
-
-        # Create fake embeddings with consistent dimensions
-        self.embeddings = FakeEmbeddings(size=1536)  # Same as OpenAI ada-002
+        # Deterministic hash vectors with the same dimensions as OpenAI ada-002
+        self.embeddings = HashEmbeddings(dim=1536)
         logger.warning("Using mock embeddings - similarity search will be simulated")
     
     def add_email_embedding(
@@ -179,7 +314,8 @@ class VectorStoreService:
         metadata: EmailMetadata,
         email_category: EmailCategory,
         business_entity: BusinessEntity,
-        confidence_score: float
+        confidence_score: float,
+        embedding: Optional[np.ndarray] = None
     ) -> str:
         """
         Add email embedding to the vector store.
@@ -190,55 +326,343 @@ class VectorStoreService:
             email_category: Email category
             business_entity: Business entity information
             confidence_score: Processing confidence score
+            embedding: Vector from embed_email for the same content and
+                metadata; computed here if omitted
             
         Returns:
             Document ID in the vector store
         """
+        if embedding is None:
+            return self.add_email_embeddings(
+                [(email_content, metadata, email_category, business_entity, confidence_score)]
+            )[0]
+        
+        text = self._create_embedding_text(email_content, metadata)
+        doc_id = _document_id(text)
+        self._add_batch(
+            [text],
+            [self._build_document_metadata(metadata, email_category, business_entity, confidence_score)],
+            [doc_id],
+            embeddings=embedding.reshape(1, -1)
+        )
+        return doc_id
+    
+    def embed_email(self, email_content: str, metadata: EmailMetadata) -> np.ndarray:
+        """
+        Embed an email the way it is searched and stored.
+        
+        The vector can be passed to search_similar_emails and
+        add_email_embedding so the email is embedded once per pipeline run.
+        
+        Args:
+            email_content: Processed email content
+            metadata: Email metadata
+            
+        Returns:
+            Embedding vector
+        """
+        return self.embeddings.embed_query_array(self._create_embedding_text(email_content, metadata))
+    
+    async def aembed_email(self, email_content: str, metadata: EmailMetadata) -> np.ndarray:
+        """
+        Embed an email without blocking the event loop.
+        
+        Args:
+            email_content: Processed email content
+            metadata: Email metadata
+            
+        Returns:
+            Embedding vector
+        """
+        return await self.embeddings.aembed_query_array(
+            self._create_embedding_text(email_content, metadata)
+        )
+    
+    def add_email_embeddings(
+        self,
+        items: List[EmbeddingItem],
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ) -> List[str]:
+        """
+        Add several email embeddings to the vector store.
+        
+        Embeddings are generated with one embed_documents call and written
+        with one collection.upsert call per batch. Document IDs are derived
+        from the embedding text, so re-ingesting an email replaces its
+        existing document instead of adding a duplicate.
+        
+        Args:
+            items: Tuples of (email_content, metadata, email_category,
+                business_entity, confidence_score)
+            batch_size: Number of emails per embedding request and write
+            
+        Returns:
+            Document IDs in the vector store, in input order
+        """
+        texts = []
+        metadatas = []
+        doc_ids = []
+        
+        for email_content, metadata, email_category, business_entity, confidence_score in items:
+            texts.append(self._create_embedding_text(email_content, metadata))
+            metadatas.append(self._build_document_metadata(
+                metadata, email_category, business_entity, confidence_score
+            ))
+            doc_ids.append(_document_id(texts[-1]))
+        
+        for start in range(0, len(doc_ids), batch_size):
+            end = start + batch_size
+            self._add_batch(texts[start:end], metadatas[start:end], doc_ids[start:end])
+        
+        return doc_ids
+    
+    async def aadd_email_embeddings(
+        self,
+        items: List[EmbeddingItem],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY
+    ) -> List[str]:
+        """
+        Add several email embeddings with concurrent embedding requests.
+        
+        Up to max_concurrency embed_documents calls run at once; batches
+        that hit a provider rate limit are retried with jittered backoff.
+        
+        Args:
+            items: Tuples of (email_content, metadata, email_category,
+                business_entity, confidence_score)
+            batch_size: Number of emails per embedding request and write
+            max_concurrency: Maximum embedding requests in flight
+            
+        Returns:
+            Document IDs in the vector store, in input order
+        """
+        texts = []
+        metadatas = []
+        doc_ids = []
+        
+        for email_content, metadata, email_category, business_entity, confidence_score in items:
+            texts.append(self._create_embedding_text(email_content, metadata))
+            metadatas.append(self._build_document_metadata(
+                metadata, email_category, business_entity, confidence_score
+            ))
+            doc_ids.append(_document_id(texts[-1]))
+        
+        stored_ids = doc_ids
+        texts, metadatas, doc_ids = _unique_documents(texts, metadatas, doc_ids)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        starts = range(0, len(texts), batch_size)
+        embeddings: List[Optional[np.ndarray]] = [None] * len(starts)
+        
+        async def embed_batch(number: int, start: int) -> None:
+            async with semaphore:
+                embeddings[number] = await self._aembed_documents(texts[start:start + batch_size])
+        
         try:
-            # Create combined text for embedding
-            combined_text = self._create_embedding_text(email_content, metadata)
-            
-            # Generate embedding
-            embedding = self.embeddings.embed_query(combined_text)
-            
-            # Create document ID
-            doc_id = str(uuid.uuid4())
-            
-            # Prepare metadata for storage
-            doc_metadata = {
-                "sender_domain": metadata.sender_domain,
-                "email_category": email_category.value,
-                "business_name": business_entity.name,
-                "business_website": str(business_entity.website) if business_entity.website else None,
-                "business_industry": business_entity.industry,
-                "business_location": business_entity.location,
-                "dpo_email": business_entity.dpo_email,
-                "confidence_score": confidence_score,
-                "urls_count": len(metadata.urls),
-                "has_footer": bool(metadata.footer_text)
-            }
-            
-            # Add to ChromaDB
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[combined_text],
-                metadatas=[doc_metadata],
-                ids=[doc_id]
+            await asyncio.gather(*(
+                embed_batch(number, start) for number, start in enumerate(starts)
+            ))
+            
+            collection = await self._aget_collection()
+            
+            for number, start in enumerate(starts):
+                end = start + batch_size
+                batch = dict(
+                    embeddings=embeddings[number],
+                    documents=texts[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=doc_ids[start:end]
+                )
+                if collection is not None:
+                    await collection.upsert(**batch)
+                else:
+                    await asyncio.to_thread(self.collection.upsert, **batch)
+            
+            self._track_distinct_values(metadatas)
+            logger.info("Email embeddings added", count=len(doc_ids))
+            
+        except Exception as exc:
+            logger.error("Failed to add email embeddings", count=len(doc_ids), error=str(exc))
+            raise
+        
+        return stored_ids
+    
+    async def _aget_collection(self):
+        """
+        Get the async collection handle for an external ChromaDB server.
+        
+        The async client keeps one pooled httpx.AsyncClient per event loop.
+        A local persistent ChromaDB has no async client, so None is returned
+        and callers fall back to the synchronous collection on a worker thread.
+        """
+        if not app_settings.chromadb_use_external:
+            return None
+        
+        if self._async_collection is None:
+            client = await chromadb.AsyncHttpClient(
+                host=app_settings.chromadb_host,
+                port=app_settings.chromadb_port,
+                settings=Settings(anonymized_telemetry=False)
+            )
+            self._async_collection = await client.get_or_create_collection(
+                name=COLLECTION_NAME,
+                metadata=COLLECTION_METADATA
             )
+        
+        return self._async_collection
+    
+    @retry(
+        retry=retry_if_exception(_is_rate_limited),
+        wait=wait_random_exponential(multiplier=0.5, max=20),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _aembed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts, retrying when the provider rate limits."""
+        return await self.embeddings.aembed_documents_array(texts)
+    
+    def queue_email_embedding(
+        self,
+        email_content: str,
+        metadata: EmailMetadata,
+        email_category: EmailCategory,
+        business_entity: BusinessEntity,
+        confidence_score: float,
+        embedding: Optional[np.ndarray] = None
+    ) -> str:
+        """
+        Queue an email embedding for a batched write.
+        
+        The buffer is written once EMBEDDING_BATCH_SIZE emails are queued,
+        when flush() is called, or VECTOR_WRITE_FLUSH_INTERVAL seconds after
+        the first queued email if that is set. Queued emails are not
+        searchable until then.
+        
+        Args:
+            email_content: Processed email content
+            metadata: Email metadata
+            email_category: Email category
+            business_entity: Business entity information
+            confidence_score: Processing confidence score
+            embedding: Vector from embed_email for the same content and
+                metadata; computed at flush if omitted
+            
+        Returns:
+            Document ID the email will be stored under
+        """
+        text = self._create_embedding_text(email_content, metadata)
+        doc_id = _document_id(text)
+        entry = (
+            text,
+            self._build_document_metadata(
+                metadata, email_category, business_entity, confidence_score
+            ),
+            doc_id,
+            embedding
+        )
+        
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= EMBEDDING_BATCH_SIZE
+            if not full and self._flush_timer is None and app_settings.vector_write_flush_interval > 0:
+                self._flush_timer = threading.Timer(
+                    app_settings.vector_write_flush_interval, self._flush_on_timer
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if full:
+            self.flush()
+        
+        return doc_id
+    
+    def _flush_on_timer(self) -> None:
+        """Write queued email embeddings once the flush interval has passed."""
+        with self._buffer_lock:
+            self._flush_timer = None
+        
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.error("Scheduled vector store flush failed", error=str(exc))
+    
+    def flush(self) -> None:
+        """Write all queued email embeddings."""
+        while True:
+            with self._buffer_lock:
+                if not self._buffer:
+                    return
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(EMBEDDING_BATCH_SIZE, len(self._buffer)))
+                ]
+            
+            texts, metadatas, doc_ids, vectors = (list(column) for column in zip(*batch))
+            # Reuse precomputed vectors only when every queued email has one
+            embeddings = None if any(vector is None for vector in vectors) else np.stack(vectors)
+            self._add_batch(texts, metadatas, doc_ids, embeddings=embeddings)
+    
+    def _add_batch(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        doc_ids: List[str],
+        embeddings: Optional[np.ndarray] = None
+    ) -> None:
+        """Embed a batch of texts and upsert it into ChromaDB in one call."""
+        if embeddings is not None:
+            # Keep the precomputed rows of the documents _unique_documents keeps
+            latest = {doc_id: index for index, doc_id in enumerate(doc_ids)}
+            if len(latest) < len(doc_ids):
+                embeddings = embeddings[sorted(latest.values())]
+        texts, metadatas, doc_ids = _unique_documents(texts, metadatas, doc_ids)
+        
+        try:
+            if embeddings is None:
+                embeddings = self.embeddings.embed_documents_array(texts)
             
-            logger.info("Email embedding added", doc_id=doc_id, domain=metadata.sender_domain)
+            self.collection.upsert(
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=metadatas,
+                ids=doc_ids
+            )
             
-            return doc_id
+            self._track_distinct_values(metadatas)
+            logger.info("Email embeddings added", count=len(doc_ids))
             
         except Exception as exc:
-            logger.error("Failed to add email embedding", error=str(exc))
+            logger.error("Failed to add email embeddings", count=len(doc_ids), error=str(exc))
             raise
     
+    def _build_document_metadata(
+        self,
+        metadata: EmailMetadata,
+        email_category: EmailCategory,
+        business_entity: BusinessEntity,
+        confidence_score: float
+    ) -> Dict[str, Any]:
+        """Build the metadata stored alongside an email embedding."""
+        return {
+            "sender_domain": metadata.sender_domain,
+            "email_category": email_category.value,
+            "business_name": business_entity.name,
+            "business_website": str(business_entity.website) if business_entity.website else None,
+            "business_industry": business_entity.industry,
+            "business_location": business_entity.location,
+            "dpo_email": business_entity.dpo_email,
+            "confidence_score": confidence_score,
+            "urls_count": len(metadata.urls),
+            "has_footer": bool(metadata.footer_text)
+        }
+    
     def search_similar_emails(
         self,
         query_content: str,
         query_metadata: EmailMetadata,
-        n_results: int = 5
+        n_results: int = 5,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar emails in the vector store.
@@ -247,37 +671,69 @@ class VectorStoreService:
             query_content: Query email content
             query_metadata: Query email metadata
             n_results: Number of results to return
+            query_embedding: Vector from embed_email; computed here if omitted
             
         Returns:
             List of similar email matches with metadata
         """
         try:
-            # Create combined text for query
-            combined_text = self._create_embedding_text(query_content, query_metadata)
-            
-            # Generate query embedding
-            query_embedding = self.embeddings.embed_query(combined_text)
+            # Generate query embedding from the combined text
+            if query_embedding is None:
+                query_embedding = self.embed_email(query_content, query_metadata)
+            query_embedding = query_embedding.reshape(1, -1)
             
             # Search in ChromaDB
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embedding,
                 n_results=n_results,
                 include=["documents", "metadatas", "distances"]
             )
             
-            # Process results
-            matches = []
-            if results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    match = {
-                        'id': doc_id,
-                        'document': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i],
-                        'distance': results['distances'][0][i],
-                        'similarity': 1 - results['distances'][0][i]  # Convert distance to similarity
-                    }
-                    matches.append(match)
+            matches = self._format_matches(results)
+            logger.debug("Similar emails found", count=len(matches))
+            
+            return matches
             
+        except Exception as exc:
+            logger.error("Failed to search similar emails", error=str(exc))
+            return []
+    
+    async def asearch_similar_emails(
+        self,
+        query_content: str,
+        query_metadata: EmailMetadata,
+        n_results: int = 5,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar emails without blocking the event loop.
+        
+        Args:
+            query_content: Query email content
+            query_metadata: Query email metadata
+            n_results: Number of results to return
+            query_embedding: Vector from aembed_email; computed here if omitted
+            
+        Returns:
+            List of similar email matches with metadata
+        """
+        try:
+            if query_embedding is None:
+                query_embedding = await self.aembed_email(query_content, query_metadata)
+            query_embedding = query_embedding.reshape(1, -1)
+            
+            query = dict(
+                query_embeddings=query_embedding,
+                n_results=n_results,
+                include=["documents", "metadatas", "distances"]
+            )
+            collection = await self._aget_collection()
+            if collection is not None:
+                results = await collection.query(**query)
+            else:
+                results = await asyncio.to_thread(self.collection.query, **query)
+            
+            matches = self._format_matches(results)
             logger.debug("Similar emails found", count=len(matches))
             
             return matches
@@ -286,42 +742,49 @@ class VectorStoreService:
             logger.error("Failed to search similar emails", error=str(exc))
             return []
     
+    def _format_matches(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a single-query ChromaDB result into match dictionaries."""
+        matches = []
+        if results['ids'] and results['ids'][0]:
+            for i, doc_id in enumerate(results['ids'][0]):
+                match = {
+                    'id': doc_id,
+                    'document': results['documents'][0][i],
+                    'metadata': results['metadatas'][0][i],
+                    'distance': results['distances'][0][i],
+                    'similarity': 1 - results['distances'][0][i]  # Convert distance to similarity
+                }
+                matches.append(match)
+        
+        return matches
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector collection.
         
+        Distinct domains, categories and industries are tracked as documents
+        are added, so no metadata is read from ChromaDB here. Values of
+        deleted documents are kept until the collection is reset.
+        
         Returns:
             Dictionary with collection statistics
         """
         try:
             count = self.collection.count()
+            if count == 0:
+                return {"total_documents": 0, "domains": [], "categories": [], "industries": []}
             
-            # Get sample of metadata to analyze
-            sample_results = self.collection.get(
-                limit=min(100, count),
-                include=["metadatas"]
-            )
+            # Pick up values added by other workers since the last write
+            persisted = self._read_stats_sidecar() or {}
             
-            stats = {
-                "total_documents": count,
-                "domains": set(),
-                "categories": set(),
-                "industries": set()
-            }
-            
-            if sample_results['metadatas']:
-                for metadata in sample_results['metadatas']:
-                    if metadata.get('sender_domain'):
-                        stats['domains'].add(metadata['sender_domain'])
-                    if metadata.get('email_category'):
-                        stats['categories'].add(metadata['email_category'])
-                    if metadata.get('business_industry'):
-                        stats['industries'].add(metadata['business_industry'])
-            
-            # Convert sets to lists for JSON serialization
-            stats['domains'] = list(stats['domains'])
-            stats['categories'] = list(stats['categories'])
-            stats['industries'] = list(stats['industries'])
+            with self._stats_lock:
+                for name, values in self._distinct.items():
+                    values.update(persisted.get(name, ()))
+                
+                stats = {"total_documents": count}
+                stats.update(
+                    (name, list(values)) for name, values in self._distinct.items()
+                )
             
             return stats
             
@@ -329,6 +792,107 @@ class VectorStoreService:
             logger.error("Failed to get collection stats", error=str(exc))
             return {"total_documents": 0, "domains": [], "categories": [], "industries": []}
     
+    def _load_distinct_values(self) -> None:
+        """Load distinct metadata values from the sidecar, or rebuild them."""
+        self._distinct = {name: set() for name in STATS_FIELDS}
+        
+        persisted = self._read_stats_sidecar()
+        if persisted is not None:
+            for name, values in self._distinct.items():
+                values.update(persisted.get(name, ()))
+            return
+        
+        try:
+            count = self.collection.count()
+            if count == 0:
+                return
+            
+            for offset in range(0, count, STATS_PAGE_SIZE):
+                page = self.collection.get(
+                    include=["metadatas"],
+                    limit=STATS_PAGE_SIZE,
+                    offset=offset
+                )
+                self._track_distinct_values(page.get('metadatas') or [], persist=False)
+            
+            self._write_stats_sidecar()
+            logger.info("Collection stats rebuilt", documents=count)
+            
+        except Exception as exc:
+            logger.warning("Failed to rebuild collection stats", error=str(exc))
+    
+    def _track_distinct_values(
+        self,
+        metadatas: List[Dict[str, Any]],
+        persist: bool = True
+    ) -> None:
+        """Add the metadata values of new documents to the distinct value sets."""
+        changed = False
+        
+        metadatas = [metadata for metadata in metadatas if metadata]
+        
+        with self._stats_lock:
+            for name, field in STATS_FIELDS.items():
+                # One set comprehension per field; the difference skips known values
+                new_values = {metadata.get(field) for metadata in metadatas}
+                new_values -= self._distinct[name]
+                new_values.discard(None)
+                new_values.discard("")
+                
+                if new_values:
+                    self._distinct[name] |= new_values
+                    changed = True
+            
+            if changed and persist and self._stats_timer is None:
+                # Debounced, so a run of new senders costs one sidecar write
+                self._stats_timer = threading.Timer(STATS_PERSIST_DELAY, self._flush_stats)
+                self._stats_timer.daemon = True
+                self._stats_timer.start()
+                if not self._stats_atexit:
+                    atexit.register(self._flush_stats)
+                    self._stats_atexit = True
+    
+    def _flush_stats(self) -> None:
+        """Write distinct values waiting for the debounce timer now."""
+        with self._stats_lock:
+            timer, self._stats_timer = self._stats_timer, None
+        
+        if timer is not None:
+            timer.cancel()
+            self._write_stats_sidecar()
+    
+    def _read_stats_sidecar(self) -> Optional[Dict[str, List[str]]]:
+        """Read persisted distinct values, or None if there are none."""
+        try:
+            with open(self._stats_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to read collection stats", path=self._stats_path, error=str(exc))
+            return None
+    
+    def _write_stats_sidecar(self) -> None:
+        """Persist distinct values, merging those written by other workers."""
+        try:
+            # Serialized per instance, and the temp file is per thread, so a
+            # concurrent write can never replace the sidecar with a partial file
+            with self._sidecar_lock:
+                persisted = self._read_stats_sidecar() or {}
+                with self._stats_lock:
+                    for name, values in self._distinct.items():
+                        values.update(persisted.get(name, ()))
+                    snapshot = {name: sorted(values) for name, values in self._distinct.items()}
+                
+                os.makedirs(os.path.dirname(self._stats_path) or ".", exist_ok=True)
+                tmp_path = f"{self._stats_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self._stats_path)
+            
+        except Exception as exc:
+            logger.warning("Failed to persist collection stats", path=self._stats_path, error=str(exc))
+    
     def _create_embedding_text(self, email_content: str, metadata: EmailMetadata) -> str:
         """
         Create combined text for embedding generation.
@@ -340,32 +904,50 @@ class VectorStoreService:
         Returns:
             Combined text for embedding
         """
-        # Combine email content with metadata
+        # Labels and values are separate parts so the final join is the only copy
         parts = [email_content]
         
         # Add domain information
-        parts.append(f"Domain: {metadata.sender_domain}")
+        parts += ("\nDomain: ", metadata.sender_domain)
         
         # Add footer if available
         if metadata.footer_text:
-            parts.append(f"Footer: {metadata.footer_text}")
+            parts += ("\nFooter: ", metadata.footer_text)
         
         # Add URL information
         if metadata.urls:
-            url_domains = []
-            for url in metadata.urls:
-                try:
-                    from urllib.parse import urlparse
-                    domain = urlparse(url).netloc
-                    if domain:
-                        url_domains.append(domain)
-                except:
-                    continue
+            # Ordered dedup keeps the text, and so its document ID, stable across processes
+            url_domains = dict.fromkeys(
+                domain for domain in map(_url_domain, metadata.urls) if domain
+            )
             
             if url_domains:
-                parts.append(f"URL domains: {', '.join(set(url_domains))}")
+                parts += ("\nURL domains: ", ", ".join(url_domains))
         
-        return "\n".join(parts)
+        return "".join(parts)
+    
+    def get_domain_history(self, sender_domain: str, limit: int = DOMAIN_HISTORY_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Get the stored classifications of emails from a sender domain.
+        
+        Args:
+            sender_domain: Sender domain to look up
+            limit: Maximum number of stored emails to read
+            
+        Returns:
+            Document metadata of the stored emails, empty on failure
+        """
+        try:
+            results = self.collection.get(
+                where={"sender_domain": sender_domain},
+                include=["metadatas"],
+                limit=limit
+            )
+            return [metadata for metadata in results.get('metadatas') or [] if metadata]
+            
+        except Exception as exc:
+            logger.error("Failed to read domain history", domain=sender_domain, error=str(exc))
+            return []
     
     def delete_document(self, doc_id: str) -> bool:
         """
@@ -394,11 +976,26 @@ class VectorStoreService:
             True if successful, False otherwise
         """
         try:
-            self.chroma_client.delete_collection("email_embeddings")
+            self.chroma_client.delete_collection(COLLECTION_NAME)
             self.collection = self.chroma_client.create_collection(
-                name="email_embeddings",
-                metadata={"description": "Email content embeddings for similarity search"}
+                name=COLLECTION_NAME,
+                metadata=COLLECTION_METADATA
             )
+            self._async_collection = None
+            self.embeddings.clear()
+            
+            with self._stats_lock:
+                for values in self._distinct.values():
+                    values.clear()
+                timer, self._stats_timer = self._stats_timer, None
+            if timer is not None:
+                timer.cancel()
+            with self._sidecar_lock:
+                try:
+                    os.remove(self._stats_path)
+                except FileNotFoundError:
+                    pass
+            
             logger.warning("Collection reset - all documents deleted")
             return True
             
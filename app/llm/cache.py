@@ -0,0 +1,198 @@
+"""Response cache for deterministic LLM calls."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Namespace for cache keys in the shared Redis database
+REDIS_KEY_PREFIX = "llm_cache:"
+# Seconds to wait before reconnecting after Redis was unreachable or failed
+REDIS_RETRY_INTERVAL = 30.0
+
+
+class LLMCache:
+    """
+    Cache of LLM response text keyed by model and prompt.
+
+    Responses are stored in Redis with a TTL when a Redis URL is configured
+    and reachable, so every worker shares them. Otherwise they are kept in
+    an in-process LRU with the same expiry. Redis is connected on first use,
+    and after a failure the local cache is used until a reconnect is tried
+    REDIS_RETRY_INTERVAL seconds later.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        maxsize: int = 1000,
+        ttl: float = 86400.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL; None uses the in-process cache only
+            maxsize: Maximum number of responses held in process
+            ttl: Seconds a cached response stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_url = redis_url
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._connect_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self, redis_url: str):
+        """Connect to Redis, returning None when it is unavailable."""
+        try:
+            import redis
+
+            client = redis.Redis.from_url(
+                redis_url, socket_connect_timeout=1.0, socket_timeout=1.0
+            )
+            client.ping()
+            logger.info("LLM cache using Redis", redis_url=redis_url)
+            return client
+        except Exception as exc:
+            logger.warning("Redis unavailable, using in-process LLM cache", error=str(exc))
+            return None
+
+    def _get_client(self):
+        """Get the Redis client, connecting on first use or once the retry interval has passed."""
+        client = self._redis
+        if client is not None or not self._redis_url or time.monotonic() < self._redis_retry_at:
+            return client
+
+        with self._connect_lock:
+            if self._redis is None and time.monotonic() >= self._redis_retry_at:
+                self._redis = self._connect(self._redis_url)
+                if self._redis is None:
+                    self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+            return self._redis
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from the parts that determine a response.
+
+        Args:
+            *parts: Model name, parameters and prompt text
+
+        Returns:
+            Hex SHA-256 digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached response text or None
+        """
+        client = self._get_client()
+        value = self._get_redis(client, key) if client is not None else self._get_local(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Cache a response.
+
+        Args:
+            key: Key from make_key
+            value: Response text
+        """
+        client = self._get_client()
+        if client is not None:
+            try:
+                client.setex(REDIS_KEY_PREFIX + key, int(self.ttl), value)
+                return
+            except Exception as exc:
+                self._suspend_redis(exc)
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, client, key: str) -> Optional[str]:
+        """Read a response from Redis, falling back to the local cache on error."""
+        try:
+            value = client.get(REDIS_KEY_PREFIX + key)
+            return value.decode('utf-8') if value is not None else None
+        except Exception as exc:
+            self._suspend_redis(exc)
+            return self._get_local(key)
+
+    def _get_local(self, key: str) -> Optional[str]:
+        """Read an unexpired response from the in-process cache."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _suspend_redis(self, exc: Exception) -> None:
+        """Use the in-process cache until the retry interval after a Redis failure has passed."""
+        logger.warning("Redis LLM cache failed, using in-process cache",
+                       error=str(exc), retry_in=REDIS_RETRY_INTERVAL)
+        with self._connect_lock:
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    def clear(self) -> None:
+        """Drop all responses held in process."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis" if self._redis is not None else "memory",
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Global LLM response cache instance
+llm_cache = LLMCache(
+    redis_url=settings.redis_url if settings.llm_cache_use_redis else None,
+    maxsize=settings.llm_cache_size,
+    ttl=settings.llm_cache_ttl
+)
@@ -1,18 +1,36 @@
 """LangChain chains for email processing."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import re
+from typing import Dict, Any, List, Optional, Tuple
+import orjson
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from langchain.schema import BaseOutputParser
 from pydantic import BaseModel, Field
 import structlog
 
+from app.config import settings
 from app.models import EmailCategory, BusinessEntity, ExtractedData, ProcessedEmail, EmailMetadata
-from app.llm.models import model_manager
+from app.llm.models import get_model_manager
+from app.llm.cache import llm_cache
+from app.llm.keywords import CATEGORY_KEYWORDS
 from app.prompts import email_classification, dpo_extraction
 
 logger = structlog.get_logger()
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Privacy policy characters sent to the DPO extraction prompt
+DPO_MAX_CONTENT_LENGTH = 8000
+
+# Policies packed into one batched DPO prompt, bounded by their total length
+DPO_BATCH_SIZE = 4
+DPO_BATCH_MAX_CONTENT_LENGTH = 16000
+DPO_BATCH_MAX_CONCURRENCY = 4
+
+JSON_ARRAY_PATTERN = re.compile(r'\[.*\]', re.S)
+
 
 class EmailClassificationResult(BaseModel):
     """Pydantic model for LLM classification output."""
@@ -22,6 +40,17 @@ class EmailClassificationResult(BaseModel):
     confidence_score: float = Field(description="Classification confidence score", ge=0.0, le=1.0)
 
 
+class ClassificationOutputParser(PydanticOutputParser):
+    """Pydantic output parser that accepts results already parsed by the model."""
+
+    def parse_result(self, result: List[Any], *, partial: bool = False) -> Any:
+        message = getattr(result[0], 'message', None) if result else None
+        parsed = message.additional_kwargs.get('parsed') if message is not None else None
+        if parsed is not None:
+            return self.pydantic_object.model_validate(parsed)
+        return super().parse_result(result, partial=partial)
+
+
 class EmailClassificationChain:
     """Chain for email classification and business entity extraction."""
 
@@ -29,7 +58,7 @@ class EmailClassificationChain:
         """Initialize the classification chain."""
         self.model_name = model_name
         try:
-            self.llm = model_manager.get_model(model_name)
+            self.llm = get_model_manager().get_model(model_name)
             # Log the actual model details
             model_info = getattr(self.llm, 'model', 'unknown')
             provider_info = getattr(self.llm, 'base_url', getattr(self.llm, 'model_name', 'unknown'))
@@ -48,7 +77,9 @@ class EmailClassificationChain:
     def _initialize_parser(self):
         """Initialize the Pydantic output parser."""
         try:
-            self.output_parser = PydanticOutputParser(pydantic_object=EmailClassificationResult)
+            self.output_parser = ClassificationOutputParser(pydantic_object=EmailClassificationResult)
+            # The schema never changes, so render the instructions once
+            self.format_instructions = self.output_parser.get_format_instructions()
             logger.info("Pydantic output parser initialized")
             
         except Exception as exc:
@@ -58,11 +89,14 @@ class EmailClassificationChain:
     def _create_chain(self):
         """Create the LangChain classification chain."""
         try:
-            # Create the prompt template using separated prompts
+            # Create the prompt template using separated prompts. The format
+            # instructions are bound into the system message so every request
+            # starts with the same long static prefix, which providers and
+            # Ollama can serve from their prompt caches
             self.prompt_template = ChatPromptTemplate.from_messages([
                 ("system", email_classification.SYSTEM_PROMPT),
                 ("human", email_classification.HUMAN_PROMPT)
-            ])
+            ]).partial(format_instructions=self.format_instructions)
 
             # Create the chain
             self.classification_chain = self.prompt_template | self.llm | self.output_parser
@@ -90,13 +124,7 @@ class EmailClassificationChain:
         """
         try:
             # Prepare input for the LLM
-            input_data = {
-                "email_content": email_content,
-                "sender_domain": metadata.sender_domain,
-                "footer_text": metadata.footer_text or "No footer",
-                "urls": ", ".join(metadata.urls) if metadata.urls else "No URLs",
-                "format_instructions": self.output_parser.get_format_instructions()
-            }
+            input_data = self._build_input(email_content, metadata)
             
             logger.info("Starting LLM classification",
                        domain=metadata.sender_domain,
@@ -106,31 +134,140 @@ class EmailClassificationChain:
             # Run the classification chain
             result = self.classification_chain.invoke(input_data)
             
-            # Create ProcessedEmail object
-            processed_email = ProcessedEmail(
-                email_category=result.email_category,
-                business_entity=result.business_entity,
-                data=result.data,
-                confidence_score=result.confidence_score,
-                metadata=metadata
-            )
-            
-            logger.info(
-                "LLM classification completed",
-                category=result.email_category.value,
-                business=result.business_entity.name,
-                confidence=result.confidence_score,
-                model=self.model_name
-            )
-            
-            return processed_email
+            return self._build_processed_email(result, metadata)
             
         except Exception as exc:
             logger.error("LLM classification failed", error=str(exc), model=self.model_name)
             # Return fallback result
             return self._create_fallback_result(email_content, metadata)
     
-
+    def classify_emails(
+        self,
+        items: List[Tuple[str, EmailMetadata]],
+        max_concurrency: int = 8
+    ) -> List[ProcessedEmail]:
+        """
+        Classify several emails with concurrent LLM requests.
+        
+        Args:
+            items: Tuples of (email_content, metadata)
+            max_concurrency: Maximum LLM requests in flight
+            
+        Returns:
+            ProcessedEmail results in input order; emails whose classification
+            failed get the heuristic fallback result
+        """
+        if not items:
+            return []
+        
+        logger.info("Starting batch LLM classification",
+                   count=len(items),
+                   model=self.model_name,
+                   max_concurrency=max_concurrency)
+        
+        try:
+            results = self.classification_chain.batch(
+                [self._build_input(content, metadata) for content, metadata in items],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+        except Exception as exc:
+            logger.error("Batch LLM classification failed", error=str(exc), model=self.model_name)
+            results = [exc] * len(items)
+        
+        processed_emails = []
+        for (email_content, metadata), result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error("LLM classification failed", error=str(result), model=self.model_name)
+                processed_emails.append(self._create_fallback_result(email_content, metadata))
+                continue
+            
+            try:
+                processed_emails.append(self._build_processed_email(result, metadata))
+            except Exception as exc:
+                logger.error("LLM classification failed", error=str(exc), model=self.model_name)
+                processed_emails.append(self._create_fallback_result(email_content, metadata))
+        
+        return processed_emails
+    
+    async def aclassify_emails(
+        self,
+        items: List[Tuple[str, EmailMetadata]],
+        max_concurrency: Optional[int] = None
+    ) -> List[ProcessedEmail]:
+        """
+        Classify several emails with concurrent async LLM requests.
+        
+        Keeping many requests in flight lets servers with continuous
+        batching (Ollama, vLLM) run them in shared forward passes.
+        
+        Args:
+            items: Tuples of (email_content, metadata)
+            max_concurrency: Maximum LLM requests in flight; defaults to
+                the LLM_MAX_CONCURRENCY setting
+            
+        Returns:
+            ProcessedEmail results in input order; emails whose classification
+            failed get the heuristic fallback result
+        """
+        if not items:
+            return []
+        
+        max_concurrency = max_concurrency or settings.llm_max_concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        logger.info("Starting async batch LLM classification",
+                   count=len(items),
+                   model=self.model_name,
+                   max_concurrency=max_concurrency)
+        
+        async def classify(email_content: str, metadata: EmailMetadata) -> ProcessedEmail:
+            async with semaphore:
+                try:
+                    result = await self.classification_chain.ainvoke(
+                        self._build_input(email_content, metadata)
+                    )
+                    return self._build_processed_email(result, metadata)
+                except Exception as exc:
+                    logger.error("LLM classification failed", error=str(exc), model=self.model_name)
+                    return self._create_fallback_result(email_content, metadata)
+        
+        return list(await asyncio.gather(
+            *(classify(email_content, metadata) for email_content, metadata in items)
+        ))
+    
+    def _build_input(self, email_content: str, metadata: EmailMetadata) -> Dict[str, Any]:
+        """Build the classification prompt variables for an email."""
+        return {
+            "email_content": email_content,
+            "sender_domain": metadata.sender_domain,
+            "footer_text": metadata.footer_text or "No footer",
+            "urls": ", ".join(metadata.urls) if metadata.urls else "No URLs"
+        }
+    
+    def _build_processed_email(
+        self,
+        result: EmailClassificationResult,
+        metadata: EmailMetadata
+    ) -> ProcessedEmail:
+        """Create a ProcessedEmail from a parsed LLM classification."""
+        processed_email = ProcessedEmail(
+            email_category=result.email_category,
+            business_entity=result.business_entity,
+            data=result.data,
+            confidence_score=result.confidence_score,
+            metadata=metadata
+        )
+        
+        logger.info(
+            "LLM classification completed",
+            category=result.email_category.value,
+            business=result.business_entity.name,
+            confidence=result.confidence_score,
+            model=self.model_name
+        )
+        
+        return processed_email
     
     def _create_fallback_result(self, email_content: str, metadata: EmailMetadata) -> ProcessedEmail:
         """
@@ -182,25 +319,9 @@ class EmailClassificationChain:
         """Simple heuristic-based email classification."""
         content_lower = content.lower()
         
-        # Marketing indicators
-        marketing_keywords = ['unsubscribe', 'newsletter', 'promotion', 'offer', 'sale', 'discount']
-        if any(keyword in content_lower for keyword in marketing_keywords):
-            return EmailCategory.MARKETING
-        
-        # Transactional indicators
-        transactional_keywords = ['order', 'receipt', 'confirmation', 'invoice', 'payment', 'account']
-        if any(keyword in content_lower for keyword in transactional_keywords):
-            return EmailCategory.TRANSACTIONAL
-        
-        # Survey indicators
-        survey_keywords = ['survey', 'feedback', 'questionnaire', 'rate', 'review']
-        if any(keyword in content_lower for keyword in survey_keywords):
-            return EmailCategory.SURVEY
-        
-        # Customer support indicators
-        support_keywords = ['support', 'help', 'ticket', 'issue', 'problem', 'assistance']
-        if any(keyword in content_lower for keyword in support_keywords):
-            return EmailCategory.CUSTOMER_SUPPORT
+        for category, keywords in CATEGORY_KEYWORDS:
+            if any(keyword in content_lower for keyword in keywords):
+                return category
         
         # Default to personal
         return EmailCategory.PERSONAL
@@ -222,7 +343,7 @@ class DPOExtractionChain:
     def __init__(self, model_name: str = 'primary'):
         """Initialize the DPO extraction chain."""
         self.model_name = model_name
-        self.llm = model_manager.get_model(model_name)
+        self.llm = get_model_manager().get_model(model_name)
         self._create_chain()
 
     def _create_chain(self):
@@ -233,6 +354,13 @@ class DPOExtractionChain:
         ])
 
         self.extraction_chain = self.extraction_prompt | self.llm
+
+        self.batch_extraction_prompt = ChatPromptTemplate.from_messages([
+            ("system", dpo_extraction.SYSTEM_PROMPT),
+            ("human", dpo_extraction.BATCH_HUMAN_PROMPT)
+        ])
+
+        self.batch_extraction_chain = self.batch_extraction_prompt | self.llm
     
     async def extract_dpo_email(self, content: str) -> Optional[str]:
         """
@@ -246,15 +374,23 @@ class DPOExtractionChain:
         """
         try:
             # Truncate content if too long
-            if len(content) > 8000:
-                content = content[:8000] + "..."
+            if len(content) > DPO_MAX_CONTENT_LENGTH:
+                content = content[:DPO_MAX_CONTENT_LENGTH]
             
-            # Use LLM to extract DPO email
-            response = await self.extraction_chain.ainvoke({
-                "privacy_policy_text": content
-            })
+            # Identical policy pages are common across emails from the same
+            # business, so reuse the answer for text already seen
+            cache_key = self._cache_key(content) if settings.llm_cache_enabled else None
+            extracted_text = llm_cache.get(cache_key) if cache_key else None
             
-            extracted_text = response.content.strip()
+            if extracted_text is None:
+                # Use LLM to extract DPO email
+                response = await self.extraction_chain.ainvoke({
+                    "privacy_policy_text": content
+                })
+                
+                extracted_text = response.content.strip()
+                if cache_key:
+                    llm_cache.set(cache_key, extracted_text)
             
             # Validate extracted email
             if self._is_valid_email(extracted_text):
@@ -266,6 +402,152 @@ class DPOExtractionChain:
             logger.error("LLM DPO extraction failed", error=str(exc))
             return None
     
+    async def batch_extract_dpo(self, policy_texts: List[str]) -> List[Optional[str]]:
+        """
+        Extract DPO emails from several privacy policies with batched LLM calls.
+        
+        Short policies are packed into one numbered prompt that asks for a
+        JSON array of answers; the prompts run concurrently. Cached policies
+        skip the LLM, and a packed prompt whose answer cannot be parsed is
+        retried one policy at a time.
+        
+        Args:
+            policy_texts: Privacy policy contents
+            
+        Returns:
+            DPO email address or None for each policy, in input order
+        """
+        contents = [content[:DPO_MAX_CONTENT_LENGTH] for content in policy_texts]
+        answers: Dict[str, Optional[str]] = {}
+        
+        pending = []
+        for content in dict.fromkeys(contents):
+            cached = llm_cache.get(self._cache_key(content)) if settings.llm_cache_enabled else None
+            if cached is None:
+                pending.append(content)
+            else:
+                answers[content] = cached
+        
+        if pending:
+            groups = self._group_policies(pending)
+            semaphore = asyncio.Semaphore(DPO_BATCH_MAX_CONCURRENCY)
+            results = await asyncio.gather(
+                *(self._extract_group(group, semaphore) for group in groups)
+            )
+            for group, group_answers in zip(groups, results):
+                for content, answer in zip(group, group_answers):
+                    answers[content] = answer
+                    if answer is not None and settings.llm_cache_enabled:
+                        llm_cache.set(self._cache_key(content), answer)
+        
+        logger.info("Batch DPO extraction completed",
+                   policies=len(contents),
+                   llm_policies=len(pending))
+        
+        return [
+            answer if self._is_valid_email(answer) else None
+            for answer in (answers[content] for content in contents)
+        ]
+    
+    def _group_policies(self, contents: List[str]) -> List[List[str]]:
+        """Pack policies into prompt groups bounded by count and total length."""
+        groups = []
+        group: List[str] = []
+        group_length = 0
+        
+        for content in contents:
+            if group and (len(group) >= DPO_BATCH_SIZE or
+                          group_length + len(content) > DPO_BATCH_MAX_CONTENT_LENGTH):
+                groups.append(group)
+                group, group_length = [], 0
+            group.append(content)
+            group_length += len(content)
+        
+        if group:
+            groups.append(group)
+        return groups
+    
+    async def _extract_group(
+        self,
+        group: List[str],
+        semaphore: asyncio.Semaphore
+    ) -> List[Optional[str]]:
+        """
+        Run one DPO prompt for a group of policies.
+        
+        Args:
+            group: Privacy policy contents sharing a prompt
+            semaphore: Bounds the prompts in flight
+            
+        Returns:
+            Raw answer for each policy; None where the LLM call failed
+        """
+        async with semaphore:
+            try:
+                if len(group) == 1:
+                    response = await self.extraction_chain.ainvoke({
+                        "privacy_policy_text": group[0]
+                    })
+                    return [response.content.strip()]
+                
+                response = await self.batch_extraction_chain.ainvoke({
+                    "policy_count": len(group),
+                    "privacy_policy_texts": "\n\n".join(
+                        dpo_extraction.BATCH_POLICY_TEMPLATE.format(index=index, privacy_policy_text=content)
+                        for index, content in enumerate(group, 1)
+                    )
+                })
+                answers = self._parse_batch_response(response.content, len(group))
+            except Exception as exc:
+                logger.error("LLM DPO extraction failed", error=str(exc), policies=len(group))
+                return [None] * len(group)
+        
+        if answers is None:
+            logger.warning("Unparseable batched DPO response, extracting individually",
+                          policies=len(group))
+            results = await asyncio.gather(
+                *(self._extract_group([content], semaphore) for content in group)
+            )
+            return [result[0] for result in results]
+        
+        return answers
+    
+    def _parse_batch_response(self, text: str, count: int) -> Optional[List[str]]:
+        """
+        Parse the JSON array answer of a batched DPO prompt.
+        
+        Args:
+            text: LLM response text
+            count: Number of policies in the prompt
+            
+        Returns:
+            Answer strings in policy order, or None if the response is malformed
+        """
+        match = JSON_ARRAY_PATTERN.search(text)
+        if not match:
+            return None
+        
+        try:
+            answers = orjson.loads(match.group(0))
+        except ValueError:
+            return None
+        
+        if not isinstance(answers, list) or len(answers) != count:
+            return None
+        
+        return ["None" if answer is None else str(answer).strip() for answer in answers]
+    
+    def _cache_key(self, content: str) -> str:
+        """Build the response cache key for privacy policy content."""
+        return llm_cache.make_key(
+            type(self.llm).__name__,
+            getattr(self.llm, 'model', None) or getattr(self.llm, 'model_name', self.model_name),
+            settings.llm_temperature,
+            dpo_extraction.SYSTEM_PROMPT,
+            dpo_extraction.HUMAN_PROMPT,
+            content
+        )
+    
     def _is_valid_email(self, email: str) -> bool:
         """
         Validate email address format.
@@ -276,9 +558,16 @@ class DPOExtractionChain:
         Returns:
             True if valid email format
         """
-        if not email or email.lower() == "none":
+        if not email:
+            return False
+        
+        email = email.strip()
+        
+        # Cheap structural checks reject "None" and prose before the regex
+        if not 3 <= len(email) <= 320:
+            return False
+        at = email.find('@')
+        if at < 1 or email.rfind('.') < at:
             return False
         
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(email_pattern, email.strip()))
+        return bool(EMAIL_PATTERN.match(email))
@@ -0,0 +1,20 @@
+"""Category keywords shared by the heuristic and draft classifiers."""
+
+from app.models import EmailCategory
+
+# Lowercase substrings that point to a category, in priority order; the
+# fallback classifier takes the first category with any hit, and the draft
+# classifier counts hits per category
+CATEGORY_KEYWORDS = (
+    (EmailCategory.MARKETING, (
+        'unsubscribe', 'newsletter', 'promotion', 'offer', 'sale', 'discount', '% off'
+    )),
+    (EmailCategory.TRANSACTIONAL, (
+        'order', 'receipt', 'confirmation', 'invoice', 'payment', 'account', 'shipped',
+        'password reset'
+    )),
+    (EmailCategory.SURVEY, ('survey', 'feedback', 'questionnaire', 'rate', 'review')),
+    (EmailCategory.CUSTOMER_SUPPORT, (
+        'support', 'help', 'ticket', 'issue', 'problem', 'assistance', 'case number'
+    )),
+)
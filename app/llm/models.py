@@ -1,6 +1,13 @@
 """LLM models and configurations."""
 
-from typing import Dict, Any
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+import orjson
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 import structlog
@@ -17,13 +24,77 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logger.warning("Gemini not available. Install langchain-google-genai to use Gemini models.")
 
+# Connection pool shared by every model of a provider, sized so concurrent
+# requests reach the server together and can be batched there
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+# Canned classification results served by the mock model
+MOCK_RESPONSES = [
+    {
+        "email_category": "marketing",
+        "business_entity": {"name": "Unknown Company", "website": None, "industry": None, "location": None, "dpo_email": None},
+        "data": {"email": [], "phone_number": [], "credit_card_number": []},
+        "confidence_score": 0.5
+    },
+    {
+        "email_category": "transactional",
+        "business_entity": {"name": "Service Provider", "website": None, "industry": None, "location": None, "dpo_email": None},
+        "data": {"email": [], "phone_number": [], "credit_card_number": []},
+        "confidence_score": 0.6
+    },
+    {
+        "email_category": "personal",
+        "business_entity": {"name": "Personal Contact", "website": None, "industry": None, "location": None, "dpo_email": None},
+        "data": {"email": [], "phone_number": [], "credit_card_number": []},
+        "confidence_score": 0.7
+    }
+]
+MOCK_RESPONSE_CONTENTS = [orjson.dumps(response).decode() for response in MOCK_RESPONSES]
+
+
+class MockChatModel(BaseChatModel):
+    """
+    Chat model that cycles through canned classification results.
+
+    Each message carries its result both as serialized JSON content and,
+    already parsed, in additional_kwargs['parsed'], so output parsers that
+    check for it skip JSON decoding.
+    """
+
+    index: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        position = self.index % len(MOCK_RESPONSES)
+        self.index += 1
+        message = AIMessage(
+            content=MOCK_RESPONSE_CONTENTS[position],
+            additional_kwargs={"parsed": MOCK_RESPONSES[position]}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
 
 class LLMModelManager:
     """Manager for different LLM models and configurations."""
 
     def __init__(self):
         """Initialize the LLM model manager."""
-        self.models = {}
+        # Constructors for each available model; instances are only built on
+        # first use, since most alternative models are never requested
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._openai_clients: Optional[Dict[str, Any]] = None
         self._initialize_models()
 
     def _initialize_models(self):
@@ -34,11 +105,11 @@ class LLMModelManager:
         # Try primary provider first
         try:
             if provider == "openai":
-                self._initialize_openai_models()
+                self._activate(self._initialize_openai_models)
             elif provider == "gemini":
-                self._initialize_gemini_models()
+                self._activate(self._initialize_gemini_models)
             elif provider == "ollama":
-                self._initialize_ollama_models()
+                self._activate(self._initialize_ollama_models)
             else:
                 logger.warning(f"Unknown LLM provider: {provider}, trying fallbacks")
                 raise ValueError(f"Unknown provider: {provider}")
@@ -60,15 +131,15 @@ class LLMModelManager:
                     logger.info("Trying fallback provider", fallback=fallback_provider)
 
                     if fallback_provider == "openai" and settings.openai_api_key:
-                        self._initialize_openai_models()
+                        self._activate(self._initialize_openai_models)
                         logger.info("Fallback to OpenAI successful")
                         return
                     elif fallback_provider == "gemini" and settings.gemini_api_key:
-                        self._initialize_gemini_models()
+                        self._activate(self._initialize_gemini_models)
                         logger.info("Fallback to Gemini successful")
                         return
                     elif fallback_provider == "ollama":
-                        self._initialize_ollama_models()
+                        self._activate(self._initialize_ollama_models)
                         logger.info("Fallback to Ollama successful")
                         return
 
@@ -82,32 +153,65 @@ class LLMModelManager:
             logger.error("All LLM providers failed, creating mock model")
             self._create_mock_model()
 
+    def _activate(self, initializer: Callable[[], None]):
+        """
+        Register a provider's models and build its primary model.
+
+        The primary model is constructed eagerly so that a provider whose
+        client cannot be created fails here and the fallback chain moves on.
+
+        Args:
+            initializer: Method registering the provider's model factories
+        """
+        self._factories.clear()
+        self._models.clear()
+        try:
+            initializer()
+            self._models['primary'] = self._factories['primary']()
+        except Exception:
+            self._factories.clear()
+            self._models.clear()
+            raise
+
     def _initialize_openai_models(self):
         """Initialize OpenAI models."""
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is required for OpenAI provider")
 
+        # All OpenAI models share one pair of pooled HTTP clients
+        if self._openai_clients is None:
+            self._openai_clients = {
+                'http_client': httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+                'http_async_client': httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            }
+
         # Primary model
-        self.models['primary'] = ChatOpenAI(
+        self._factories['primary'] = partial(
+            ChatOpenAI,
             openai_api_key=settings.openai_api_key,
             model_name=settings.openai_model,
             temperature=settings.llm_temperature,
-            max_tokens=settings.llm_max_tokens
+            max_tokens=settings.llm_max_tokens,
+            **self._openai_clients
         )
 
         # Alternative models
-        self.models['gpt-3.5-turbo'] = ChatOpenAI(
+        self._factories['gpt-3.5-turbo'] = partial(
+            ChatOpenAI,
             openai_api_key=settings.openai_api_key,
             model_name="gpt-3.5-turbo",
             temperature=settings.llm_temperature,
-            max_tokens=settings.llm_max_tokens
+            max_tokens=settings.llm_max_tokens,
+            **self._openai_clients
         )
 
-        self.models['gpt-4'] = ChatOpenAI(
+        self._factories['gpt-4'] = partial(
+            ChatOpenAI,
             openai_api_key=settings.openai_api_key,
             model_name="gpt-4",
             temperature=settings.llm_temperature,
-            max_tokens=settings.llm_max_tokens
+            max_tokens=settings.llm_max_tokens,
+            **self._openai_clients
         )
 
     def _initialize_gemini_models(self):
@@ -119,7 +223,8 @@ class LLMModelManager:
             raise ValueError("Gemini API key is required for Gemini provider")
 
         # Primary model
-        self.models['primary'] = ChatGoogleGenerativeAI(
+        self._factories['primary'] = partial(
+            ChatGoogleGenerativeAI,
             google_api_key=settings.gemini_api_key,
             model=settings.gemini_model,
             temperature=settings.llm_temperature,
@@ -127,7 +232,8 @@ class LLMModelManager:
         )
 
         # Alternative models
-        self.models['gemini-pro'] = ChatGoogleGenerativeAI(
+        self._factories['gemini-pro'] = partial(
+            ChatGoogleGenerativeAI,
             google_api_key=settings.gemini_api_key,
             model="gemini-pro",
             temperature=settings.llm_temperature,
@@ -136,16 +242,39 @@ class LLMModelManager:
 
     def _initialize_ollama_models(self):
         """Initialize Ollama models."""
+        # Primary model
+        self._factories['primary'] = self._create_ollama_primary_model
+
+        # Alternative models
+        self._factories['llama2'] = partial(
+            ChatOllama,
+            base_url=settings.ollama_base_url,
+            model="llama2",
+            temperature=settings.llm_temperature,
+            client_kwargs={'limits': HTTP_LIMITS}
+        )
+
+        self._factories['mistral'] = partial(
+            ChatOllama,
+            base_url=settings.ollama_base_url,
+            model="mistral",
+            temperature=settings.llm_temperature,
+            client_kwargs={'limits': HTTP_LIMITS}
+        )
+
+    def _create_ollama_primary_model(self):
+        """Create the primary Ollama model."""
         try:
-            # Primary model
-            self.models['primary'] = ChatOllama(
+            model = ChatOllama(
                 base_url=settings.ollama_base_url,
                 model=settings.ollama_model,
-                temperature=settings.llm_temperature
+                temperature=settings.llm_temperature,
+                client_kwargs={'limits': HTTP_LIMITS}
             )
             logger.info("Ollama primary model initialized",
                        base_url=settings.ollama_base_url,
                        model=settings.ollama_model)
+            return model
         except Exception as exc:
             logger.error("Failed to initialize Ollama primary model",
                         base_url=settings.ollama_base_url,
@@ -153,31 +282,10 @@ class LLMModelManager:
                         error=str(exc))
             raise
 
-        # Alternative models
-        self.models['llama2'] = ChatOllama(
-            base_url=settings.ollama_base_url,
-            model="llama2",
-            temperature=settings.llm_temperature
-        )
-
-        self.models['mistral'] = ChatOllama(
-            base_url=settings.ollama_base_url,
-            model="mistral",
-            temperature=settings.llm_temperature
-        )
-
     def _create_mock_model(self):
         """Create a mock model for testing when all providers fail."""
-        from langchain.llms.fake import FakeListLLM
-
-        # Create a fake LLM that returns predictable responses
-        mock_responses = [
-            '{"email_category": "marketing", "business_entity": {"name": "Unknown Company", "website": null, "industry": null, "location": null, "dpo_email": null}, "data": {"email": [], "phone_number": [], "credit_card_number": []}, "confidence_score": 0.5}',
-            '{"email_category": "transactional", "business_entity": {"name": "Service Provider", "website": null, "industry": null, "location": null, "dpo_email": null}, "data": {"email": [], "phone_number": [], "credit_card_number": []}, "confidence_score": 0.6}',
-            '{"email_category": "personal", "business_entity": {"name": "Personal Contact", "website": null, "industry": null, "location": null, "dpo_email": null}, "data": {"email": [], "phone_number": [], "credit_card_number": []}, "confidence_score": 0.7}'
-        ]
-
-        self.models['primary'] = FakeListLLM(responses=mock_responses)
+        self._factories = {'primary': MockChatModel}
+        self._models = {'primary': self._factories['primary']()}
         logger.warning("Using mock LLM model - responses will be simulated")
     
     def get_model(self, model_name: str = 'primary'):
@@ -190,19 +298,28 @@ class LLMModelManager:
         Returns:
             LLM model instance
         """
-        if model_name not in self.models:
+        if model_name not in self._factories:
             logger.warning(f"Model {model_name} not found, using primary")
             model_name = 'primary'
 
-        if model_name not in self.models:
-            available_models = list(self.models.keys())
+        if model_name not in self._factories:
+            available_models = list(self._factories.keys())
             raise ValueError(f"No models available. Requested: '{model_name}', Available: {available_models}")
 
-        return self.models[model_name]
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(model_name)
+                if model is None:
+                    model = self._factories[model_name]()
+                    self._models[model_name] = model
+                    logger.info("LLM model created", model=model_name)
+
+        return model
     
     def get_available_models(self) -> list:
         """Get list of available model names."""
-        return list(self.models.keys())
+        return list(self._factories.keys())
     
     def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """
@@ -214,10 +331,10 @@ class LLMModelManager:
         Returns:
             Dictionary with model information
         """
-        if model_name not in self.models:
+        if model_name not in self._factories:
             return {"error": "Model not found"}
         
-        model = self.models[model_name]
+        model = self.get_model(model_name)
         
         return {
             "model_name": getattr(model, 'model_name', model_name),
@@ -227,5 +344,21 @@ class LLMModelManager:
         }
 
 
-# Global model manager instance
-model_manager = LLMModelManager()
+# Global model manager instance, created on first use
+_model_manager = None
+_model_manager_lock = threading.Lock()
+
+
+def get_model_manager() -> LLMModelManager:
+    """
+    Get the shared LLM model manager, creating it on first use.
+
+    Returns:
+        LLMModelManager instance
+    """
+    global _model_manager
+    if _model_manager is None:
+        with _model_manager_lock:
+            if _model_manager is None:
+                _model_manager = LLMModelManager()
+    return _model_manager
@@ -0,0 +1,29 @@
+"""Structured logging configuration for the email processing application."""
+
+import logging
+
+import orjson
+import structlog
+
+from app.config import settings
+
+
+def configure_logging() -> None:
+    """Configure structlog to emit JSON lines rendered with orjson."""
+    log_level = logging.getLevelName(settings.log_level.upper())
+    if not isinstance(log_level, int):
+        log_level = logging.INFO
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        ],
+        # Calls below the configured level are no-ops, so their kwargs are never rendered
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
+        logger_factory=structlog.BytesLoggerFactory(),
+        cache_logger_on_first_use=True
+    )
@@ -1,10 +1,37 @@
 """Pydantic models for the email processing application."""
 
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, EmailStr, HttpUrl
+from functools import lru_cache
+from typing import Annotated, Dict, List, Optional, Any
+from pydantic import AfterValidator, BaseModel, Field, HttpUrl, WithJsonSchema
+from pydantic.networks import validate_email
 from enum import Enum
 
 
+@lru_cache(maxsize=100_000)
+def validate_email_address(value: str) -> str:
+    """
+    Validate and normalize an email address, memoized per input.
+
+    Repeat senders and DPO addresses are validated once instead of going
+    through email-validator on every model instance.
+
+    Args:
+        value: Email address to validate
+
+    Returns:
+        Normalized email address
+    """
+    return validate_email(value)[1]
+
+
+# Drop-in replacement for EmailStr with cached validation
+EmailAddress = Annotated[
+    str,
+    AfterValidator(validate_email_address),
+    WithJsonSchema({"type": "string", "format": "email"})
+]
+
+
 class EmailCategory(str, Enum):
     """Email category enumeration."""
     MARKETING = "marketing"
@@ -16,7 +43,7 @@ class EmailCategory(str, Enum):
 
 class EmailInput(BaseModel):
     """Input email structure."""
-    from_email: EmailStr = Field(..., alias="from")
+    from_email: EmailAddress = Field(..., alias="from")
     subject: str
     html_content: Optional[str] = None
     text_content: Optional[str] = None
@@ -26,7 +53,7 @@ class BusinessEntity(BaseModel):
     """Business entity information."""
     name: str
     website: Optional[HttpUrl] = None
-    dpo_email: Optional[EmailStr] = None
+    dpo_email: Optional[EmailAddress] = None
     industry: Optional[str] = None
     location: Optional[str] = None
 
@@ -64,9 +91,16 @@ class VectorMatch(BaseModel):
     metadata: Dict[str, Any]
 
 
+class DraftClassification(BaseModel):
+    """Category guessed from sender history without the LLM."""
+    email_category: EmailCategory
+    business_entity: BusinessEntity
+    confidence_score: float = Field(..., ge=0.0, le=1.0)
+
+
 class PrivacyPolicyResult(BaseModel):
     """Result from privacy policy scraping."""
-    dpo_email: Optional[EmailStr] = None
+    dpo_email: Optional[EmailAddress] = None
     privacy_policy_url: Optional[HttpUrl] = None
     success: bool = False
     error_message: Optional[str] = None
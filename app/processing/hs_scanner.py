@@ -0,0 +1,184 @@
+"""Single-pass pattern scanning for regex prefiltering."""
+
+import sys
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet, Optional, Sequence, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+# Try to import Hyperscan (optional dependency)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    logger.info("Hyperscan not available. Install hyperscan to prefilter regex patterns.")
+
+# The first character after the scheme must start a host, not a path,
+# query or fragment, so every match has a network location
+URL_PATTERN = r'https?://[^\s<>"\'/?#][^\s<>"\']*[^\s<>"\'.,)]'
+COMPANY_PATTERN = r'\b[A-Z][a-zA-Z\s&.,]+(?:Inc|LLC|Corp|Company|Ltd|Limited)\b'
+ADDRESS_PATTERN = r'\d+\s+[A-Za-z\s,]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)'
+PHONE_PATTERN = r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
+
+# Expression ids in the metadata pattern database
+URL_ID = 0
+COMPANY_ID = 1
+ADDRESS_ID = 2
+PHONE_ID = 3
+
+# Characters Python's `\s` matches in str patterns beyond Hyperscan's ASCII `\s`
+UNICODE_WHITESPACE = r'\x{1c}-\x{1f}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}'
+
+
+@lru_cache(maxsize=1)
+def _unicode_digits() -> str:
+    r"""
+    Build the Hyperscan class ranges for every character Python's `\d` matches in str patterns.
+
+    These are the Unicode decimal digits (category Nd), such as Arabic-Indic
+    digits, while Hyperscan's `\d` is ASCII only.
+
+    Returns:
+        Class body of `\x{...}` ranges
+    """
+    ranges = []
+    for code in range(sys.maxunicode + 1):
+        if unicodedata.category(chr(code)) != 'Nd':
+            continue
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ''.join(rf'\x{{{start:x}}}-\x{{{end:x}}}' for start, end in ranges)
+
+
+def _to_hyperscan(pattern: str) -> str:
+    """
+    Rewrite a Python pattern so whitespace and digit classes match the same characters in Hyperscan.
+
+    Hyperscan's UCP mode would do this but does not support word boundaries.
+
+    Args:
+        pattern: Python regular expression
+
+    Returns:
+        Equivalent Hyperscan expression
+    """
+    parts = []
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\':
+            escape = pattern[index:index + 2]
+            if escape == '\\s':
+                escape = rf'\s{UNICODE_WHITESPACE}' if in_class else rf'[\s{UNICODE_WHITESPACE}]'
+            elif escape == '\\d':
+                escape = _unicode_digits() if in_class else f'[{_unicode_digits()}]'
+            parts.append(escape)
+            index += 2
+            continue
+        if char == '[' and not in_class:
+            in_class = True
+        elif char == ']' and in_class:
+            in_class = False
+        parts.append(char)
+        index += 1
+    return ''.join(parts)
+
+
+class PatternScanner:
+    """
+    Reports which of a set of patterns occur in a text with one Hyperscan pass.
+
+    The scan only tells callers which patterns are present, so they can skip
+    `re` calls that would find nothing; the matches themselves still come
+    from `re`, keeping results identical with or without Hyperscan.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, bool]]):
+        """
+        Compile the pattern database if Hyperscan is installed.
+
+        Args:
+            patterns: (Python pattern, case insensitive) pairs; a pattern's
+                expression id is its index
+        """
+        self._database = None
+        self._local = threading.local()
+
+        if not HYPERSCAN_AVAILABLE or not patterns:
+            return
+
+        base_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+        caseless_flags = base_flags | hyperscan.HS_FLAG_CASELESS
+        expressions = [_to_hyperscan(pattern) for pattern, _ in patterns]
+        flags = [caseless_flags if caseless else base_flags for _, caseless in patterns]
+
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[expression.encode('utf-8') for expression in expressions],
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags
+            )
+            self._database = database
+        except Exception as exc:
+            logger.warning("Failed to compile Hyperscan database", error=str(exc))
+
+    @property
+    def available(self) -> bool:
+        """Whether scans run on Hyperscan."""
+        return self._database is not None
+
+    def scan(self, text: str) -> Optional[FrozenSet[int]]:
+        """
+        Find which patterns occur in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Ids of the expressions found, or None if Hyperscan is unavailable
+        """
+        if self._database is None:
+            return None
+
+        found = set()
+
+        def on_match(expression_id, start, end, flags, context):
+            found.add(expression_id)
+
+        try:
+            self._database.scan(
+                text.encode('utf-8'),
+                match_event_handler=on_match,
+                scratch=self._scratch()
+            )
+        except Exception as exc:
+            logger.debug("Hyperscan scan failed, falling back to re", error=str(exc))
+            return None
+
+        return frozenset(found)
+
+    def _scratch(self):
+        """Get this thread's scratch space; Hyperscan scratch is not thread safe."""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(self._database)
+            self._local.scratch = scratch
+        return scratch
+
+
+# Global scanner shared by all metadata extractors
+pattern_scanner = PatternScanner([
+    (URL_PATTERN, True),
+    (COMPANY_PATTERN, False),
+    (ADDRESS_PATTERN, True),
+    (PHONE_PATTERN, False)
+])
@@ -1,26 +1,91 @@
 """HTML processing and content extraction service."""
 
 import re
-from typing import Optional, List
-from bs4 import BeautifulSoup, Comment
+from typing import Any, Dict, Optional, List
+from selectolax.lexbor import LexborHTMLParser
 import structlog
 
 logger = structlog.get_logger()
 
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+URL_PATTERN = re.compile(r'https?://[^\s<>"\']+[^\s<>"\'.,)]')
+FOOTER_CLASS_PATTERN = re.compile(r'footer|bottom|signature', re.I)
+
 
 class HTMLProcessor:
     """Service for processing HTML content and extracting clean text."""
     
     def __init__(self):
         """Initialize the HTML processor."""
-        self.soup_parser = "lxml"
+        # (html_content, tree) of the most recent parse
+        self._last_parse = None
+    
+    def _parse(self, html_content: str) -> LexborHTMLParser:
+        """
+        Parse HTML once per payload with lexbor and drop scripts and styles.
+        
+        Comments are never part of lexbor's text output, so they need no
+        separate pass.
+        
+        The pipeline strips, scans for URLs and looks for a footer in the
+        same email, so the most recent tree is reused for repeated calls
+        with the same content.
+        
+        Args:
+            html_content: Raw HTML content
+            
+        Returns:
+            Parsed and cleaned HTML tree
+        """
+        last_parse = self._last_parse
+        if last_parse is not None and (
+            last_parse[0] is html_content or last_parse[0] == html_content
+        ):
+            return last_parse[1]
+        
+        tree = LexborHTMLParser(html_content)
+        
+        # Remove script and style elements
+        for node in tree.css("script, style"):
+            node.decompose()
+        
+        self._last_parse = (html_content, tree)
+        return tree
+    
+    def process(self, html_content: str, lines_count: int = 3) -> Dict[str, Any]:
+        """
+        Extract text, URLs and footer from HTML with a single parse.
+        
+        Args:
+            html_content: Raw HTML content
+            lines_count: Number of lines to consider as footer
+            
+        Returns:
+            Dictionary with text, urls and footer_text
+        """
+        if not html_content:
+            return {"text": "", "urls": [], "footer_text": None}
+        
+        try:
+            tree = self._parse(html_content)
+        except Exception as exc:
+            logger.error("Failed to parse HTML", error=str(exc))
+            tree = None
+        
+        return {
+            "text": self.strip_html(html_content, tree=tree),
+            "urls": self.extract_urls(html_content, tree=tree),
+            "footer_text": self.extract_footer_text(html_content, lines_count, tree=tree)
+        }
     
-    def strip_html(self, html_content: str) -> str:
+    def strip_html(self, html_content: str, tree: Optional[LexborHTMLParser] = None) -> str:
         """
         Strip HTML tags and return clean text.
         
         Args:
             html_content: Raw HTML content
+            tree: Tree already parsed from html_content, if any
             
         Returns:
             Clean text content
@@ -30,19 +95,11 @@ class HTMLProcessor:
         
         try:
             # Parse HTML
-            soup = BeautifulSoup(html_content, self.soup_parser)
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Remove comments
-            comments = soup.findAll(text=lambda text: isinstance(text, Comment))
-            for comment in comments:
-                comment.extract()
+            if tree is None:
+                tree = self._parse(html_content)
             
             # Get text and clean it
-            text = soup.get_text()
+            text = tree.root.text(separator=' ') if tree.root is not None else ""
             
             # Clean up whitespace
             text = self._clean_whitespace(text)
@@ -56,55 +113,56 @@ class HTMLProcessor:
             # Fallback: use regex to remove basic HTML tags
             return self._fallback_html_strip(html_content)
     
-    def extract_urls(self, html_content: str) -> List[str]:
+    def extract_urls(self, html_content: str, tree: Optional[LexborHTMLParser] = None) -> List[str]:
         """
         Extract all URLs from HTML content.
         
         Args:
             html_content: Raw HTML content
+            tree: Tree already parsed from html_content, if any
             
         Returns:
             List of URLs found in the content
         """
-        urls = []
-        
         if not html_content:
-            return urls
+            return []
         
         try:
-            soup = BeautifulSoup(html_content, self.soup_parser)
-            
-            # Extract URLs from href attributes
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith(('http://', 'https://')):
-                    urls.append(href)
-            
-            # Extract URLs from src attributes (images, etc.)
-            for element in soup.find_all(['img', 'iframe', 'embed'], src=True):
-                src = element['src']
-                if src.startswith(('http://', 'https://')):
-                    urls.append(src)
-            
-            # Remove duplicates while preserving order
-            urls = list(dict.fromkeys(urls))
+            if tree is None:
+                tree = self._parse(html_content)
+            
+            # Links and embedded resources in one document-order walk; the
+            # dict removes duplicates while preserving order. attrs reads the
+            # one attribute needed instead of copying every attribute of
+            # attribute-heavy tracking pixels into a dict
+            urls = {}
+            for element in tree.css('a[href], img[src], iframe[src], embed[src]'):
+                url = element.attrs.get('href' if element.tag == 'a' else 'src') or ''
+                if url.startswith(('http://', 'https://')):
+                    urls[url] = None
             
             logger.debug("URLs extracted", count=len(urls))
             
-            return urls
+            return list(urls)
             
         except Exception as exc:
             logger.error("Failed to extract URLs", error=str(exc))
             # Fallback: use regex to find URLs
             return self._fallback_url_extraction(html_content)
     
-    def extract_footer_text(self, html_content: str, lines_count: int = 3) -> Optional[str]:
+    def extract_footer_text(
+        self,
+        html_content: str,
+        lines_count: int = 3,
+        tree: Optional[LexborHTMLParser] = None
+    ) -> Optional[str]:
         """
         Extract footer text from HTML content.
         
         Args:
             html_content: Raw HTML content
             lines_count: Number of lines to consider as footer
+            tree: Tree already parsed from html_content, if any
             
         Returns:
             Footer text or None if not found
@@ -114,19 +172,22 @@ class HTMLProcessor:
         
         try:
             # First try to find actual footer elements
-            soup = BeautifulSoup(html_content, self.soup_parser)
+            if tree is None:
+                tree = self._parse(html_content)
             
             # Look for footer-related elements
-            footer_elements = soup.find_all(['footer', 'div'], 
-                                          class_=re.compile(r'footer|bottom|signature', re.I))
+            footer_elements = [
+                node for node in tree.css('footer[class], div[class]')
+                if FOOTER_CLASS_PATTERN.search(node.attributes.get('class') or '')
+            ]
             
             if footer_elements:
-                footer_text = footer_elements[-1].get_text().strip()
+                footer_text = footer_elements[-1].text(separator=' ').strip()
                 if footer_text:
                     return self._clean_whitespace(footer_text)
             
             # Fallback: get last N lines of text content
-            clean_text = self.strip_html(html_content)
+            clean_text = self.strip_html(html_content, tree=tree)
             lines = clean_text.split('\n')
             
             # Filter out empty lines
@@ -145,7 +206,7 @@ class HTMLProcessor:
     def _clean_whitespace(self, text: str) -> str:
         """Clean up whitespace in text."""
         # Replace multiple whitespace with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         # Remove leading/trailing whitespace
         text = text.strip()
         return text
@@ -153,13 +214,12 @@ class HTMLProcessor:
     def _fallback_html_strip(self, html_content: str) -> str:
         """Fallback method to strip HTML using regex."""
         # Remove HTML tags
-        clean = re.sub(r'<[^>]+>', '', html_content)
+        clean = TAG_PATTERN.sub('', html_content)
         # Clean whitespace
         clean = self._clean_whitespace(clean)
         return clean
     
     def _fallback_url_extraction(self, content: str) -> List[str]:
         """Fallback method to extract URLs using regex."""
-        url_pattern = r'https?://[^\s<>"\']+[^\s<>"\'.,)]'
-        urls = re.findall(url_pattern, content)
+        urls = URL_PATTERN.findall(content)
         return list(dict.fromkeys(urls))  # Remove duplicates
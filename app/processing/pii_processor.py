@@ -1,21 +1,44 @@
 """PII detection and anonymization service using SpaCy and Presidio."""
 
+import hashlib
 import os
 import re
+import threading
 import yaml
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 import spacy
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerRegistry
+from presidio_analyzer.predefined_recognizers import (
+    CreditCardRecognizer,
+    EmailRecognizer,
+    PhoneRecognizer,
+)
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
 import structlog
 
 from app.config import settings
 
 logger = structlog.get_logger()
 
+# Analyzer results kept per (text digest, entity set) so that several PII
+# operations on the same text share one spaCy/Presidio pass
+ANALYSIS_CACHE_SIZE = 256
+# Documents per spaCy nlp.pipe batch when analyzing several texts at once
+NLP_BATCH_SIZE = 64
+# spaCy components Presidio never reads; the tagger, attribute ruler and
+# lemmatizer stay enabled because context enhancement matches on lemmas
+UNUSED_SPACY_PIPES = ('parser',)
+# Sample text run through every recognizer when warming up a processor
+WARM_UP_TEXT = "Contact John Smith at john.smith@example.com or +1 212 555 0100, card 4111 1111 1111 1111."
+EXTRACTION_ENTITIES = {
+    'EMAIL_ADDRESS': 'email',
+    'PHONE_NUMBER': 'phone_number',
+    'CREDIT_CARD': 'credit_card_number',
+}
+
 
 class PIIProcessor:
     """Service for detecting and anonymizing PII in text content."""
@@ -25,6 +48,9 @@ class PIIProcessor:
         self._load_configuration()
         self._initialize_nlp_engine()
         self._initialize_presidio()
+        self._initialize_pattern_recognizers()
+        self._analysis_cache = OrderedDict()
+        self._analysis_lock = threading.Lock()
 
     def _load_configuration(self):
         """Load Presidio configuration."""
@@ -82,11 +108,14 @@ class PIIProcessor:
 
     def _initialize_nlp_engine(self):
         """Initialize NLP engine with proper configuration."""
+        models = self.config.get('models', [{'lang_code': 'en', 'model_name': 'en_core_web_sm'}])
+        model_name = models[0]['model_name']
+
         try:
             # Configure NLP engine provider with full configuration
             nlp_configuration = {
                 "nlp_engine_name": self.config.get('nlp_engine_name', 'spacy'),
-                "models": self.config.get('models', [{'lang_code': 'en', 'model_name': 'en_core_web_sm'}])
+                "models": models
             }
 
             # Add NER model configuration if available
@@ -96,9 +125,12 @@ class PIIProcessor:
             nlp_engine_provider = NlpEngineProvider(nlp_configuration=nlp_configuration)
             self.nlp_engine = nlp_engine_provider.create_engine()
 
-            # Also load SpaCy model directly for compatibility
-            model_name = self.config['models'][0]['model_name']
-            self.nlp = spacy.load(model_name)
+            # Reuse the pipeline Presidio loaded instead of loading the model
+            # a second time, and skip components it never uses
+            self.nlp = self.nlp_engine.nlp[models[0]['lang_code']]
+            for pipe_name in UNUSED_SPACY_PIPES:
+                if pipe_name in self.nlp.pipe_names:
+                    self.nlp.disable_pipe(pipe_name)
 
             logger.info("NLP engine initialized successfully",
                        model=model_name,
@@ -108,7 +140,7 @@ class PIIProcessor:
             logger.error("SpaCy model not found", model=model_name, error=str(exc))
             # Fallback to smaller model
             try:
-                self.nlp = spacy.load("en_core_web_sm")
+                self.nlp = spacy.load("en_core_web_sm", disable=list(UNUSED_SPACY_PIPES))
                 logger.info("Fallback to en_core_web_sm model")
             except OSError:
                 logger.error("No SpaCy model available. Please install: python -m spacy download en_core_web_sm")
@@ -140,6 +172,169 @@ class PIIProcessor:
                 logger.error("Failed to initialize Presidio even with fallback", error=str(fallback_exc))
                 raise
     
+    def _initialize_pattern_recognizers(self):
+        """Initialize the pattern-only recognizers used for user data extraction."""
+        # Email, phone and credit card detection is regex/checksum based and
+        # needs no NER, so extraction bypasses the spaCy pipeline entirely
+        self.pattern_recognizers = [
+            EmailRecognizer(),
+            PhoneRecognizer(),
+            CreditCardRecognizer(),
+        ]
+        self.pattern_score_threshold = self.config.get('thresholds', {}).get('default_score_threshold', 0.35)
+
+    def _analyze_patterns(self, text: str) -> List[Any]:
+        """
+        Detect email addresses, phone numbers and credit cards without spaCy.
+        
+        Args:
+            text: Text content to analyze
+            
+        Returns:
+            Recognizer results above the configured score threshold
+        """
+        results = []
+        for recognizer in self.pattern_recognizers:
+            results.extend(recognizer.analyze(
+                text=text,
+                entities=recognizer.supported_entities,
+                nlp_artifacts=None
+            ))
+        
+        results = EntityRecognizer.remove_duplicates(results)
+        return [result for result in results if result.score >= self.pattern_score_threshold]
+
+    def warm_up(self):
+        """
+        Run the analyzer and pattern recognizers once on sample text.
+        
+        Recognizers compile their patterns and spaCy allocates its buffers
+        on first use; doing that here, before worker processes fork, means
+        children inherit a ready processor instead of paying it on their
+        first email.
+        """
+        try:
+            self.analyzer.analyze(text=WARM_UP_TEXT, entities=settings.pii_entities, language='en')
+            self._analyze_patterns(WARM_UP_TEXT)
+            logger.info("PII processor warmed up")
+        except Exception as exc:
+            logger.warning("PII processor warm-up failed", error=str(exc))
+
+    @staticmethod
+    def _entity_set(entities: List[str]) -> FrozenSet[str]:
+        """Entity types as a set, reusing the precomputed set for the configured entities."""
+        if entities is settings.pii_entities:
+            return settings.pii_entities_set
+        return frozenset(entities)
+
+    def _analysis_key(self, text: str, entities: List[str]) -> tuple:
+        """Build the analysis cache key for a text and entity set."""
+        return (
+            hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(),
+            self._entity_set(entities)
+        )
+
+    def _cached_analysis(self, key: tuple) -> Optional[List[Any]]:
+        """Return cached analyzer results for a key, if present."""
+        with self._analysis_lock:
+            results = self._analysis_cache.get(key)
+            if results is not None:
+                self._analysis_cache.move_to_end(key)
+            return results
+
+    def _store_analysis(self, key: tuple, results: List[Any]):
+        """Cache analyzer results, evicting the least recently used entries."""
+        with self._analysis_lock:
+            self._analysis_cache[key] = results
+            while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
+    def _analyze(self, text: str, entities: List[str]) -> List[Any]:
+        """
+        Run the Presidio analyzer, reusing results for text seen recently.
+        
+        Args:
+            text: Text content to analyze
+            entities: List of entity types to detect
+            
+        Returns:
+            Analyzer results; callers must not mutate them
+        """
+        key = self._analysis_key(text, entities)
+        results = self._cached_analysis(key)
+        if results is None:
+            results = self.analyzer.analyze(
+                text=text,
+                entities=list(key[1]),
+                language='en'
+            )
+            self._store_analysis(key, results)
+        return results
+
+    def _analyze_batch(self, texts: List[str], entities: List[str]) -> List[List[Any]]:
+        """
+        Run the Presidio analyzer over several texts with one spaCy pipe.
+        
+        Texts not already cached are tokenized and tagged together through
+        the NLP engine's batch path, and the resulting artifacts are handed
+        to the analyzer so it does not re-run spaCy per text.
+        
+        Args:
+            texts: Text contents to analyze
+            entities: List of entity types to detect
+            
+        Returns:
+            Analyzer results for each text, in input order
+        """
+        keys = [self._analysis_key(text, entities) for text in texts]
+        results = {key: self._cached_analysis(key) for key in keys}
+        pending = {
+            key: text for key, text in zip(keys, texts)
+            if text and results[key] is None
+        }
+        
+        if pending:
+            batch = self.analyzer.nlp_engine.process_batch(
+                list(pending.values()),
+                language='en',
+                batch_size=NLP_BATCH_SIZE
+            )
+            for key, (text, nlp_artifacts) in zip(pending, batch):
+                results[key] = self.analyzer.analyze(
+                    text=text,
+                    entities=list(key[1]),
+                    language='en',
+                    nlp_artifacts=nlp_artifacts
+                )
+                self._store_analysis(key, results[key])
+        
+        return [results[key] or [] for key in keys]
+
+    def _format_entities(self, text: str, results: List[Any]) -> List[Dict[str, Any]]:
+        """Convert analyzer results to entity dictionaries."""
+        return [
+            {
+                'entity_type': result.entity_type,
+                'start': result.start,
+                'end': result.end,
+                'score': result.score,
+                'text': text[result.start:result.end]
+            }
+            for result in results
+        ]
+
+    def _collect_pii_data(self, text: str, results: List[Any]) -> Dict[str, List[str]]:
+        """Group extracted PII values by output field, without duplicates."""
+        # Dicts drop repeated values while keeping first-seen order
+        values = {key: {} for key in EXTRACTION_ENTITIES.values()}
+        
+        for result in sorted(results, key=lambda result: result.start):
+            key = EXTRACTION_ENTITIES.get(result.entity_type)
+            if key:
+                values[key][text[result.start:result.end]] = None
+        
+        return {key: list(found) for key, found in values.items()}
+
     def detect_pii(self, text: str, entities: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Detect PII entities in text.
@@ -158,22 +353,10 @@ class PIIProcessor:
         
         try:
             # Analyze text with Presidio
-            results = self.analyzer.analyze(
-                text=text,
-                entities=entities,
-                language='en'
-            )
+            results = self._analyze(text, entities)
             
             # Convert to dict format
-            pii_entities = []
-            for result in results:
-                pii_entities.append({
-                    'entity_type': result.entity_type,
-                    'start': result.start,
-                    'end': result.end,
-                    'score': result.score,
-                    'text': text[result.start:result.end]
-                })
+            pii_entities = self._format_entities(text, results)
             
             logger.debug("PII detection completed", entities_found=len(pii_entities))
             
@@ -201,48 +384,138 @@ class PIIProcessor:
         
         try:
             # Analyze text first
-            analyzer_results = self.analyzer.analyze(
-                text=text,
-                entities=entities,
-                language='en'
-            )
+            analyzer_results = self._analyze(text, entities)
             
             if not analyzer_results:
                 return text
             
-            # Configure anonymization operators
-            operators = {}
-            for entity_type in entities:
-                operators[entity_type] = OperatorConfig(
-                    "mask",
-                    {
-                        "masking_char": settings.pii_mask_char,
-                        "chars_to_mask": -1,
-                        "from_end": False
-                    }
-                )
-            
-            # Anonymize text
-            anonymized_result = self.anonymizer.anonymize(
-                text=text,
-                analyzer_results=analyzer_results,
-                operators=operators
-            )
+            anonymized_text = self._mask_spans(text, analyzer_results)
             
             logger.debug(
                 "Text anonymized",
                 original_length=len(text),
-                anonymized_length=len(anonymized_result.text),
+                anonymized_length=len(anonymized_text),
                 entities_masked=len(analyzer_results)
             )
             
-            return anonymized_result.text
+            return anonymized_text
             
         except Exception as exc:
             logger.error("Text anonymization failed", error=str(exc))
             # Fallback: return original text
             return text
     
+    def _mask_spans(self, text: str, results: List[Any]) -> str:
+        """
+        Replace every character of the detected entities with the mask character.
+        
+        Overlapping results are masked once, and the text is rebuilt with a
+        single join instead of one new string per entity.
+        
+        Args:
+            text: Text content the results were detected in
+            results: Analyzer results with character offsets
+            
+        Returns:
+            Masked text
+        """
+        parts = []
+        position = 0
+        
+        for result in sorted(results, key=lambda result: result.start):
+            start = max(result.start, position)
+            if result.end <= start:
+                continue
+            parts.append(text[position:start])
+            parts.append(settings.pii_mask_char * (result.end - start))
+            position = result.end
+        
+        parts.append(text[position:])
+        return ''.join(parts)
+    
+    def analyze_text(self, text: str,
+                     entities: Optional[List[str]] = None) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Anonymize text and extract PII data from it with one analyzer pass.
+        
+        Args:
+            text: Text content to analyze
+            entities: List of entity types to anonymize (None for all)
+            
+        Returns:
+            Tuple of anonymized text and extracted PII data by type
+        """
+        if not text:
+            return text, self._collect_pii_data(text, [])
+        
+        entities = entities or settings.pii_entities
+        
+        try:
+            results = self._analyze(text, self._analysis_entities(entities))
+            
+            return self._split_analysis(text, results, entities)
+            
+        except Exception as exc:
+            logger.error("PII analysis failed", error=str(exc))
+            # Fallback: original text and pattern-only extraction
+            return text, self.extract_pii_data(text)
+    
+    def analyze_text_batch(self, texts: List[str],
+                           entities: Optional[List[str]] = None) -> List[Tuple[str, Dict[str, List[str]]]]:
+        """
+        Anonymize and extract PII data from several texts with one batched spaCy pass.
+        
+        Args:
+            texts: Text contents to analyze
+            entities: List of entity types to anonymize (None for all)
+            
+        Returns:
+            Tuple of anonymized text and extracted PII data for each text, in input order
+        """
+        entities = entities or settings.pii_entities
+        
+        try:
+            results = self._analyze_batch(texts, self._analysis_entities(entities))
+            
+            logger.debug("Batch PII analysis completed", texts=len(texts))
+            
+            return [
+                self._split_analysis(text, text_results, entities)
+                for text, text_results in zip(texts, results)
+            ]
+            
+        except Exception as exc:
+            logger.error("Batch PII analysis failed", error=str(exc))
+            return [self.analyze_text(text, entities) for text in texts]
+    
+    def _analysis_entities(self, entities: List[str]) -> List[str]:
+        """Entity types to analyze for both anonymization and extraction."""
+        return list(dict.fromkeys([*entities, *EXTRACTION_ENTITIES]))
+    
+    def _split_analysis(self, text: str, results: List[Any],
+                        entities: List[str]) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Mask and collect the results of one analyzer pass.
+        
+        Args:
+            text: Text content the results were detected in
+            results: Analyzer results for anonymized and extracted entity types
+            entities: Entity types to anonymize
+            
+        Returns:
+            Tuple of anonymized text and extracted PII data by type
+        """
+        masked_types = self._entity_set(entities)
+        masked = [result for result in results if result.entity_type in masked_types]
+        extracted = [
+            result for result in results
+            if result.entity_type in EXTRACTION_ENTITIES
+            and result.score >= self.pattern_score_threshold
+        ]
+        
+        anonymized_text = self._mask_spans(text, masked) if masked else text
+        return anonymized_text, self._collect_pii_data(text, extracted)
+    
     def extract_pii_data(self, text: str) -> Dict[str, List[str]]:
         """
         Extract specific PII data types from text.
@@ -253,37 +526,13 @@ class PIIProcessor:
         Returns:
             Dictionary with extracted PII data by type
         """
-        extracted_data = {
-            'email': [],
-            'phone_number': [],
-            'credit_card_number': []
-        }
-        
         if not text:
-            return extracted_data
+            return self._collect_pii_data(text, [])
         
         try:
-            # Use Presidio to detect entities
-            results = self.analyzer.analyze(
-                text=text,
-                entities=['EMAIL_ADDRESS', 'PHONE_NUMBER', 'CREDIT_CARD'],
-                language='en'
-            )
+            results = self._analyze_patterns(text)
             
-            # Extract actual values
-            for result in results:
-                entity_text = text[result.start:result.end]
-                
-                if result.entity_type == 'EMAIL_ADDRESS':
-                    extracted_data['email'].append(entity_text)
-                elif result.entity_type == 'PHONE_NUMBER':
-                    extracted_data['phone_number'].append(entity_text)
-                elif result.entity_type == 'CREDIT_CARD':
-                    extracted_data['credit_card_number'].append(entity_text)
-            
-            # Remove duplicates
-            for key in extracted_data:
-                extracted_data[key] = list(set(extracted_data[key]))
+            extracted_data = self._collect_pii_data(text, results)
             
             logger.debug("PII data extracted", data=extracted_data)
             
@@ -291,7 +540,47 @@ class PIIProcessor:
             
         except Exception as exc:
             logger.error("PII data extraction failed", error=str(exc))
-            return extracted_data
+            return self._collect_pii_data(text, [])
+    
+    def detect_pii_batch(self, texts: List[str],
+                         entities: Optional[List[str]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Detect PII entities in several texts with one batched spaCy pass.
+        
+        Args:
+            texts: Text contents to analyze
+            entities: List of entity types to detect (None for all)
+            
+        Returns:
+            List of detected PII entities for each text, in input order
+        """
+        entities = entities or settings.pii_entities
+        
+        try:
+            results = self._analyze_batch(texts, entities)
+            
+            logger.debug("Batch PII detection completed", texts=len(texts))
+            
+            return [
+                self._format_entities(text, text_results)
+                for text, text_results in zip(texts, results)
+            ]
+            
+        except Exception as exc:
+            logger.error("Batch PII detection failed", error=str(exc))
+            return [self.detect_pii(text, entities) for text in texts]
+    
+    def extract_pii_data_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """
+        Extract specific PII data types from several texts.
+        
+        Args:
+            texts: Text contents to analyze
+            
+        Returns:
+            Dictionary with extracted PII data by type for each text, in input order
+        """
+        return [self.extract_pii_data(text) for text in texts]
     
     def get_entity_statistics(self, text: str) -> Dict[str, int]:
         """
@@ -307,11 +596,7 @@ class PIIProcessor:
             return {}
         
         try:
-            results = self.analyzer.analyze(
-                text=text,
-                entities=settings.pii_entities,
-                language='en'
-            )
+            results = self._analyze(text, settings.pii_entities)
             
             stats = {}
             for result in results:
@@ -323,3 +608,27 @@ class PIIProcessor:
         except Exception as exc:
             logger.error("Failed to get entity statistics", error=str(exc))
             return {}
+
+
+# Global PII processor instance, created on first use
+_pii_processor = None
+_pii_processor_lock = threading.Lock()
+
+
+def get_pii_processor() -> PIIProcessor:
+    """
+    Get the shared PII processor, creating it on first use.
+
+    Loading the spaCy model and Presidio engines is the most expensive part
+    of service startup, so every email processor in a process shares one
+    instance.
+
+    Returns:
+        PIIProcessor instance
+    """
+    global _pii_processor
+    if _pii_processor is None:
+        with _pii_processor_lock:
+            if _pii_processor is None:
+                _pii_processor = PIIProcessor()
+    return _pii_processor
@@ -21,3 +21,14 @@ HUMAN_PROMPT = """Extract the Data Protection Officer (DPO) email address from t
 {privacy_policy_text}
 
 Return only the email address or "None" if not found."""
+
+BATCH_HUMAN_PROMPT = """Extract the Data Protection Officer (DPO) email address from each of these {policy_count} privacy policy texts:
+
+{privacy_policy_texts}
+
+Return only a JSON array with exactly {policy_count} entries, one per policy in the same order. Each entry is the email address as a string, or "None" if not found."""
+
+# Separator placed around each policy in BATCH_HUMAN_PROMPT
+BATCH_POLICY_TEMPLATE = """=== Policy {index} ===
+{privacy_policy_text}
+=== End of policy {index} ==="""
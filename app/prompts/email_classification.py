@@ -24,7 +24,9 @@ For user data extraction:
 - Only extract data that appears to belong to the email recipient/user
 - Don't extract business contact information as user data
 
-Always respond with valid JSON matching the required format."""
+Always respond with valid JSON matching the required format.
+
+{format_instructions}"""
 
 HUMAN_PROMPT = """Please classify the following email and extract business entity information:
 
@@ -35,6 +37,4 @@ Sender Domain: {sender_domain}
 Footer Text: {footer_text}
 URLs Found: {urls}
 
-{format_instructions}
-
-Provide your analysis in the exact JSON format specified above."""
+Provide your analysis in the exact JSON format specified in your instructions."""
@@ -0,0 +1,116 @@
+"""Shared headless browser for scraping."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+import structlog
+
+logger = structlog.get_logger()
+
+# Chromium flags for running headless inside containers
+BROWSER_LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+# Seconds to wait for the browser to close when a worker shuts down
+SHUTDOWN_TIMEOUT = 10.0
+
+
+class BrowserPool:
+    """
+    One Chromium instance shared by every scrape, with a context per page.
+
+    Launching Chromium takes seconds and hundreds of MB, while a new
+    browser context is cheap and just as isolated (cookies, cache and
+    storage are per context). Playwright objects belong to the event loop
+    that created them, so the browser is relaunched if it is used from a
+    different loop; the loop that launched it should call close() before
+    it ends.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool; the browser is launched on first use."""
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_browser(self) -> Browser:
+        """
+        Get the shared browser, launching it if needed.
+
+        Returns:
+            Connected Chromium browser owned by the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._browser is not None:
+                logger.debug("Event loop changed, relaunching shared browser")
+            # Objects from another loop cannot be used or closed from this one
+            self._playwright = None
+            self._browser = None
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                await self._launch()
+            return self._browser
+
+    async def _launch(self):
+        """Start Playwright and launch Chromium."""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        logger.info("Shared browser launched")
+
+    @asynccontextmanager
+    async def new_page(self) -> AsyncIterator[Page]:
+        """
+        Open a page in a fresh browser context, closing the context afterwards.
+
+        Yields:
+            Page in its own browser context
+        """
+        browser = await self.get_browser()
+        context = await browser.new_context()
+        try:
+            yield await context.new_page()
+        finally:
+            await context.close()
+
+    async def close(self):
+        """Close the browser and stop Playwright if the running loop owns them."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+
+        browser, playwright = self._browser, self._playwright
+        self._browser = None
+        self._playwright = None
+
+        try:
+            if browser is not None:
+                await browser.close()
+            if playwright is not None:
+                await playwright.stop()
+        except Exception as exc:
+            logger.warning("Failed to close shared browser", error=str(exc))
+
+    def shutdown(self):
+        """Close the browser from synchronous code, such as a worker shutdown hook."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or self._browser is None:
+            return
+
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(self.close(), loop).result(SHUTDOWN_TIMEOUT)
+            else:
+                loop.run_until_complete(self.close())
+        except Exception as exc:
+            logger.warning("Failed to shut down shared browser", error=str(exc))
+
+
+# Global browser pool instance
+browser_pool = BrowserPool()
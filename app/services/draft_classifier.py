@@ -0,0 +1,173 @@
+"""Cheap draft classification of emails from sender history."""
+
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set
+import structlog
+
+from app.llm.keywords import CATEGORY_KEYWORDS
+from app.models import BusinessEntity, DraftClassification, EmailCategory, ProcessedEmail
+
+logger = structlog.get_logger()
+
+# Keyword hits a category needs before it counts
+MIN_KEYWORD_HITS = 2
+
+# Confidence added when the keywords agree with the sender history
+KEYWORD_AGREEMENT_BONUS = 0.05
+
+
+class DraftClassifier:
+    """
+    Guesses an email's category from earlier LLM results for its sender domain.
+
+    Each domain keeps a count of the categories assigned to its emails and
+    the business entity found most recently. The first lookup for a domain
+    in a process seeds the counts from the emails already stored in the
+    vector store, so worker processes share history and a recycled worker
+    does not start from nothing. The draft
+    confidence is the share of the most common category, smoothed so a
+    domain needs several consistent results before the draft can replace
+    the LLM. A keyword rulebook over the subject and text nudges the
+    confidence up when it agrees and halves it when it points elsewhere.
+    """
+
+    def __init__(self):
+        """Initialize an empty sender history."""
+        self._categories: Dict[str, Counter] = {}
+        self._entities: Dict[str, BusinessEntity] = {}
+        self._seeded: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def record(self, processed_email: ProcessedEmail) -> None:
+        """
+        Add an LLM classification to the sender history.
+
+        Args:
+            processed_email: Classified email with metadata
+        """
+        if processed_email.metadata is None:
+            return
+
+        domain = processed_email.metadata.sender_domain
+        with self._lock:
+            self._categories.setdefault(domain, Counter())[processed_email.email_category] += 1
+            self._entities[domain] = processed_email.business_entity.model_copy()
+
+    def classify(
+        self,
+        sender_domain: str,
+        text: str,
+        load_history: Optional[Callable[[str], List[Dict[str, Any]]]] = None
+    ) -> Optional[DraftClassification]:
+        """
+        Draft a classification for an email.
+
+        Args:
+            sender_domain: Domain of the sender address
+            text: Subject and body text
+            load_history: Returns the stored document metadata of a domain's
+                emails; called once per domain to seed its history
+
+        Returns:
+            Draft classification, or None if the domain has no history
+        """
+        if load_history is not None and sender_domain not in self._seeded:
+            self._seed(sender_domain, load_history(sender_domain))
+
+        with self._lock:
+            counts = self._categories.get(sender_domain)
+            if not counts:
+                return None
+            category, count = counts.most_common(1)[0]
+            total = sum(counts.values())
+            business_entity = self._entities[sender_domain].model_copy()
+
+        # One unseen result of another category is assumed, so confidence
+        # only approaches the category share as history accumulates
+        confidence = count / (total + 1)
+
+        keyword_category = self._keyword_category(text)
+        if keyword_category == category:
+            confidence = min(1.0, confidence + KEYWORD_AGREEMENT_BONUS)
+        elif keyword_category is not None:
+            confidence /= 2
+
+        return DraftClassification(
+            email_category=category,
+            business_entity=business_entity,
+            confidence_score=confidence
+        )
+
+    def _seed(self, sender_domain: str, history: List[Dict[str, Any]]) -> None:
+        """
+        Seed a domain's counts from stored document metadata.
+
+        Stored emails include the results recorded in this process, so the
+        stored counts replace the in-process ones unless fewer emails are
+        stored than were recorded (for example, writes not yet flushed).
+
+        Args:
+            sender_domain: Sender domain
+            history: Document metadata of the domain's stored emails
+        """
+        counts = Counter()
+        entity = None
+        for metadata in history:
+            try:
+                category = EmailCategory(metadata.get('email_category'))
+            except ValueError:
+                continue
+            counts[category] += 1
+            if entity is None:
+                entity = self._entity_from_metadata(metadata)
+
+        with self._lock:
+            self._seeded.add(sender_domain)
+            current = self._categories.get(sender_domain)
+            if not counts or (current and sum(current.values()) > sum(counts.values())):
+                return
+            self._categories[sender_domain] = counts
+            if entity is not None or sender_domain not in self._entities:
+                self._entities[sender_domain] = entity or BusinessEntity(name="Unknown")
+
+        logger.debug("Draft history seeded", domain=sender_domain, emails=sum(counts.values()))
+
+    @staticmethod
+    def _entity_from_metadata(metadata: Dict[str, Any]) -> Optional[BusinessEntity]:
+        """Build the business entity stored with an email, or None if it is invalid."""
+        try:
+            return BusinessEntity(
+                name=metadata.get('business_name') or 'Unknown',
+                website=metadata.get('business_website'),
+                dpo_email=metadata.get('dpo_email'),
+                industry=metadata.get('business_industry'),
+                location=metadata.get('business_location')
+            )
+        except Exception:
+            return None
+
+    def _keyword_category(self, text: str) -> Optional[EmailCategory]:
+        """Find the category whose keywords clearly dominate the text."""
+        text_lower = text.lower()
+        hits = {
+            category: sum(1 for keyword in keywords if keyword in text_lower)
+            for category, keywords in CATEGORY_KEYWORDS
+        }
+        ranked = sorted(hits.items(), key=lambda item: item[1], reverse=True)
+
+        best_category, best_hits = ranked[0]
+        if best_hits < MIN_KEYWORD_HITS or best_hits == ranked[1][1]:
+            return None
+        return best_category
+
+    def clear(self) -> None:
+        """Forget all sender history."""
+        with self._lock:
+            self._categories.clear()
+            self._entities.clear()
+            self._seeded.clear()
+
+
+# Global draft classifier shared by all email processors
+draft_classifier = DraftClassifier()
@@ -1,15 +1,23 @@
 """Main email processing service that orchestrates all components."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import numpy as np
 import structlog
 
-from app.models import EmailInput, ProcessedEmail, EmailMetadata, ExtractedData
+from app.models import EmailInput, ProcessedEmail, EmailMetadata, ExtractedData, BusinessEntity, PrivacyPolicyResult
 from app.config import settings
 from app.processing.html_processor import HTMLProcessor
-from app.processing.pii_processor import PIIProcessor
+from app.processing.pii_processor import get_pii_processor
 from app.services.metadata_extractor import MetadataExtractor
 from app.database.vector_store import VectorStoreService
-from app.services.similarity_matcher import SimilarityMatcher
+from app.services.similarity_matcher import SimilarityMatcher, extract_root_domain
+from app.services.semantic_cache import SemanticResponseCache
+from app.services.draft_classifier import draft_classifier
+from app.services.event_loop import run_coroutine
 from app.llm.chains import EmailClassificationChain
 from app.services.privacy_policy_scraper import PrivacyPolicyScraperTool
 
@@ -27,10 +35,14 @@ class EmailProcessor:
         """Initialize all processing services."""
         try:
             self.html_processor = HTMLProcessor()
-            self.pii_processor = PIIProcessor()
-            self.metadata_extractor = MetadataExtractor()
+            self.pii_processor = get_pii_processor()
+            # Share the HTML processor so each email body is parsed only once
+            self.metadata_extractor = MetadataExtractor(self.html_processor)
             self.vector_store = VectorStoreService()
-            self.similarity_matcher = SimilarityMatcher()
+            # Share the vector store so search and storage reuse cached embeddings
+            self.similarity_matcher = SimilarityMatcher(self.vector_store)
+            self.response_cache = SemanticResponseCache(self.vector_store)
+            self.draft_classifier = draft_classifier
             self.llm_classifier = EmailClassificationChain()
             self.privacy_scraper = PrivacyPolicyScraperTool()
             
@@ -44,62 +56,261 @@ class EmailProcessor:
         """
         Process email through the complete pipeline.
         
+        The pipeline runs on the persistent background event loop rather
+        than a new loop per email, since the embeddings' async client keeps
+        pooled connections bound to the loop that opened them.
+        
+        Args:
+            email_input: Input email data
+            
+        Returns:
+            ProcessedEmail with classification and extraction results
+        """
+        return run_coroutine(self.aprocess_email(email_input))
+    
+    async def aprocess_email(self, email_input: EmailInput) -> ProcessedEmail:
+        """
+        Process email through the complete pipeline on the current event loop.
+        
+        PII analysis and metadata extraction run concurrently in worker
+        threads, and the vector search and DPO scraping await their network
+        calls instead of blocking.
+        
         Args:
             email_input: Input email data
             
         Returns:
             ProcessedEmail with classification and extraction results
         """
+        prefetch = None
         try:
             logger.info("Starting email processing pipeline", 
                        sender=email_input.from_email,
                        subject=email_input.subject[:50])
             
+            prefetch_domain = self.metadata_extractor.extract_sender_domain(email_input.from_email)
+            
             # Step 1: HTML Stripping
             clean_text = self._strip_html_content(email_input)
             
-            # Step 2: PII Anonymization
-            anonymized_text = self._anonymize_pii(clean_text)
-            
-            # Step 3: Metadata Extraction
-            metadata = self._extract_metadata(email_input, clean_text)
+            # Steps 2-3: PII Anonymization and Extraction, and Metadata Extraction
+            (anonymized_text, extracted_data), metadata = await asyncio.gather(
+                asyncio.to_thread(self._analyze_pii, clean_text),
+                asyncio.to_thread(self._extract_metadata, email_input, clean_text)
+            )
             
-            # Step 4: Vector Similarity Search
-            vector_match = self._find_vector_match(anonymized_text, metadata)
+            # Step 4: Vector Similarity Search, reusing the embedding for caching and storage
+            embedding = await self._aembed_email(anonymized_text, metadata)
+            vector_match = await self._afind_vector_match(anonymized_text, metadata, embedding)
             
             # Step 5: Process based on confidence
             if vector_match and self.similarity_matcher.is_confident_match(vector_match):
                 # High confidence match - use vector result
-                processed_email = self._process_confident_match(
-                    email_input, anonymized_text, metadata, vector_match
+                processed_email = await asyncio.to_thread(
+                    self._process_confident_match,
+                    email_input, anonymized_text, metadata, vector_match, extracted_data
                 )
             else:
-                # Low confidence - use LLM classification
-                processed_email = self._process_llm_classification(
-                    anonymized_text, metadata
+                # Low confidence - use the sender history draft, else LLM classification
+                processed_email = await asyncio.to_thread(
+                    self._process_draft_classification,
+                    email_input, anonymized_text, metadata, vector_match, extracted_data
                 )
+                if processed_email is None:
+                    processed_email = await asyncio.to_thread(
+                        self._lookup_cached_classification, anonymized_text, metadata, embedding
+                    )
+                    cached = processed_email is not None
+                    if not cached:
+                        # Only an LLM call is slow enough for a speculative scrape
+                        # of the sender's website to pay off
+                        prefetch = self._start_dpo_prefetch(prefetch_domain)
+                        processed_email = await asyncio.to_thread(
+                            self._classify_with_llm, anonymized_text, metadata, embedding
+                        )
+                    processed_email = self._attach_user_data(
+                        processed_email, anonymized_text, extracted_data, cached
+                    )
             
             # Step 6: Enhance business entity if needed
-            processed_email = self._enhance_business_entity(processed_email)
+            processed_email = await self._aenhance_business_entity(
+                processed_email, prefetch, prefetch_domain
+            )
             
-            # Step 7: Store in vector database if confident
-            if processed_email.confidence_score > settings.confidence_threshold:
-                self._store_in_vector_db(anonymized_text, processed_email)
+            return await asyncio.to_thread(
+                self._complete_email, processed_email, anonymized_text, embedding
+            )
             
-            # Add processing timestamp
-            processed_email.processed_at = datetime.now(timezone.utc).isoformat()
+        except Exception as exc:
+            logger.error("Email processing failed", error=str(exc), exc_info=True)
+            raise
+        
+        finally:
+            # Drop a speculative scrape whose result was not needed
+            if prefetch is not None and not prefetch.done():
+                prefetch.cancel()
+    
+    def process_emails(
+        self,
+        email_inputs: List[EmailInput],
+        concurrency: Optional[int] = None
+    ) -> List[ProcessedEmail]:
+        """
+        Process several emails, batching PII analysis and LLM classification.
+        
+        Emails without a confident vector match are classified together in
+        one batched LLM call instead of one request each. The per-email
+        stages around it run on a thread pool so vector search, scraping
+        and storage requests overlap, and confident results are written to
+        the vector store in bulk upserts at the end of the batch.
+        
+        Args:
+            email_inputs: Input email data
+            concurrency: Worker threads for the per-email stages; defaults
+                to the BATCH_CONCURRENCY setting
             
-            logger.info("Email processing completed successfully",
-                       category=processed_email.email_category.value,
-                       confidence=processed_email.confidence_score,
-                       business=processed_email.business_entity.name)
+        Returns:
+            ProcessedEmail results in input order
+        """
+        try:
+            logger.info("Starting batch email processing pipeline", emails=len(email_inputs))
             
-            return processed_email
+            clean_texts = [self._strip_html_content(email_input) for email_input in email_inputs]
+            
+            # One spaCy pass over every body anonymizes and extracts PII for all of them
+            pii_analyses = self._analyze_pii_batch(clean_texts)
+            
+            max_workers = max(1, min(concurrency or settings.batch_concurrency, len(email_inputs) or 1))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="email-batch") as executor:
+                prepared = list(executor.map(self._prepare_email, email_inputs, clean_texts, pii_analyses))
+                
+                results: List[Optional[ProcessedEmail]] = [None] * len(prepared)
+                confident = []
+                uncertain = []
+                for index, stages in enumerate(prepared):
+                    vector_match = stages['vector_match']
+                    if vector_match and self.similarity_matcher.is_confident_match(vector_match):
+                        confident.append(index)
+                        continue
+                    
+                    results[index] = self._process_draft_classification(
+                        email_inputs[index], stages['anonymized_text'], stages['metadata'],
+                        vector_match, stages['extracted_data']
+                    )
+                    if results[index] is None:
+                        uncertain.append(index)
+                
+                matched = executor.map(
+                    lambda index: self._process_confident_match(
+                        email_inputs[index],
+                        prepared[index]['anonymized_text'],
+                        prepared[index]['metadata'],
+                        prepared[index]['vector_match'],
+                        prepared[index]['extracted_data']
+                    ),
+                    confident
+                )
+                for index, processed_email in zip(confident, matched):
+                    results[index] = processed_email
+                
+                if uncertain:
+                    classified = self._process_llm_classifications(
+                        [
+                            (prepared[index]['anonymized_text'], prepared[index]['metadata'])
+                            for index in uncertain
+                        ],
+                        [prepared[index]['embedding'] for index in uncertain],
+                        [prepared[index]['extracted_data'] for index in uncertain]
+                    )
+                    for index, processed_email in zip(uncertain, classified):
+                        results[index] = processed_email
+                
+                finalized = list(executor.map(
+                    lambda processed_email, stages: self._finalize_email(
+                        processed_email, stages['anonymized_text'], stages['embedding'], buffered=True
+                    ),
+                    results,
+                    prepared
+                ))
+            
+            self._flush_vector_db()
+            return finalized
             
         except Exception as exc:
-            logger.error("Email processing failed", error=str(exc), exc_info=True)
+            logger.error("Batch email processing failed", error=str(exc), exc_info=True)
             raise
     
+    def _prepare_email(
+        self,
+        email_input: EmailInput,
+        clean_text: str,
+        pii_analysis: Tuple[str, ExtractedData]
+    ) -> Dict[str, Any]:
+        """
+        Run the metadata and vector search stages.
+        
+        Args:
+            email_input: Input email data
+            clean_text: Email text with HTML stripped
+            pii_analysis: Anonymized text and user data from _analyze_pii_batch
+            
+        Returns:
+            Dictionary with anonymized_text, extracted_data, metadata,
+            embedding and vector_match
+        """
+        # Step 2: PII Anonymization and Extraction, done for the whole batch
+        anonymized_text, extracted_data = pii_analysis
+        
+        # Step 3: Metadata Extraction
+        metadata = self._extract_metadata(email_input, clean_text)
+        
+        # Step 4: Vector Similarity Search, reusing the embedding for caching and storage
+        embedding = self._embed_email(anonymized_text, metadata)
+        vector_match = self._find_vector_match(anonymized_text, metadata, embedding)
+        
+        return {
+            'anonymized_text': anonymized_text,
+            'extracted_data': extracted_data,
+            'metadata': metadata,
+            'embedding': embedding,
+            'vector_match': vector_match
+        }
+    
+    def _finalize_email(
+        self,
+        processed_email: ProcessedEmail,
+        anonymized_text: str,
+        embedding: Optional[np.ndarray] = None,
+        buffered: bool = False
+    ) -> ProcessedEmail:
+        """Enhance, store and timestamp a classified email."""
+        # Step 6: Enhance business entity if needed
+        processed_email = self._enhance_business_entity(processed_email)
+        
+        return self._complete_email(processed_email, anonymized_text, embedding, buffered)
+    
+    def _complete_email(
+        self,
+        processed_email: ProcessedEmail,
+        anonymized_text: str,
+        embedding: Optional[np.ndarray] = None,
+        buffered: bool = False
+    ) -> ProcessedEmail:
+        """Store and timestamp an enhanced email."""
+        # Step 7: Store in vector database if confident
+        if processed_email.confidence_score > settings.confidence_threshold:
+            self._store_in_vector_db(anonymized_text, processed_email, embedding, buffered)
+        
+        # Add processing timestamp
+        processed_email.processed_at = datetime.now(timezone.utc).isoformat()
+        
+        logger.info("Email processing completed successfully",
+                   category=processed_email.email_category.value,
+                   confidence=processed_email.confidence_score,
+                   business=processed_email.business_entity.name)
+        
+        return processed_email
+    
     def _strip_html_content(self, email_input: EmailInput) -> str:
         """Strip HTML and get clean text content."""
         try:
@@ -119,16 +330,28 @@ class EmailProcessor:
             logger.error("HTML stripping failed", error=str(exc))
             return email_input.text_content or ""
     
-    def _anonymize_pii(self, text: str) -> str:
-        """Anonymize PII in text content."""
+    def _analyze_pii(self, text: str) -> Tuple[str, ExtractedData]:
+        """Anonymize PII in text content and extract user data in one pass."""
+        try:
+            anonymized_text, pii_data = self.pii_processor.analyze_text(text)
+            logger.debug("PII analysis completed")
+            return anonymized_text, self._build_extracted_data(pii_data)
+            
+        except Exception as exc:
+            logger.error("PII analysis failed", error=str(exc))
+            return text, ExtractedData()  # Return original text if anonymization fails
+    
+    def _analyze_pii_batch(self, texts: List[str]) -> List[Tuple[str, ExtractedData]]:
+        """Anonymize PII in and extract user data from several texts in one pass."""
         try:
-            anonymized_text = self.pii_processor.anonymize_text(text)
-            logger.debug("PII anonymization completed")
-            return anonymized_text
+            return [
+                (anonymized_text, self._build_extracted_data(pii_data))
+                for anonymized_text, pii_data in self.pii_processor.analyze_text_batch(texts)
+            ]
             
         except Exception as exc:
-            logger.error("PII anonymization failed", error=str(exc))
-            return text  # Return original text if anonymization fails
+            logger.error("Batch PII analysis failed", error=str(exc))
+            return [self._analyze_pii(text) for text in texts]
     
     def _extract_metadata(self, email_input: EmailInput, clean_text: str) -> EmailMetadata:
         """Extract metadata from email."""
@@ -147,10 +370,28 @@ class EmailProcessor:
                 urls=[]
             )
     
-    def _find_vector_match(self, text: str, metadata: EmailMetadata):
+    def _embed_email(self, text: str, metadata: EmailMetadata) -> Optional[np.ndarray]:
+        """Embed an email once for search, caching and storage."""
+        try:
+            return self.vector_store.embed_email(text, metadata)
+            
+        except Exception as exc:
+            logger.error("Email embedding failed", error=str(exc))
+            return None
+    
+    async def _aembed_email(self, text: str, metadata: EmailMetadata) -> Optional[np.ndarray]:
+        """Embed an email once without blocking the event loop."""
+        try:
+            return await self.vector_store.aembed_email(text, metadata)
+            
+        except Exception as exc:
+            logger.error("Email embedding failed", error=str(exc))
+            return None
+    
+    def _find_vector_match(self, text: str, metadata: EmailMetadata, embedding: Optional[np.ndarray] = None):
         """Find best vector similarity match."""
         try:
-            vector_match = self.similarity_matcher.find_best_match(text, metadata)
+            vector_match = self.similarity_matcher.find_best_match(text, metadata, embedding=embedding)
             
             if vector_match:
                 logger.debug("Vector match found", 
@@ -165,7 +406,39 @@ class EmailProcessor:
             logger.error("Vector matching failed", error=str(exc))
             return None
     
-    def _process_confident_match(self, email_input, text, metadata, vector_match) -> ProcessedEmail:
+    async def _afind_vector_match(
+        self,
+        text: str,
+        metadata: EmailMetadata,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """Find best vector similarity match without blocking the event loop."""
+        try:
+            vector_match = await self.similarity_matcher.afind_best_match(
+                text, metadata, embedding=embedding
+            )
+            
+            if vector_match:
+                logger.debug("Vector match found", 
+                           confidence=vector_match.confidence_score,
+                           similarity=vector_match.similarity_score)
+            else:
+                logger.debug("No confident vector match found")
+            
+            return vector_match
+            
+        except Exception as exc:
+            logger.error("Vector matching failed", error=str(exc))
+            return None
+    
+    def _process_confident_match(
+        self,
+        email_input,
+        text,
+        metadata,
+        vector_match,
+        extracted_data: Optional[ExtractedData] = None
+    ) -> ProcessedEmail:
         """Process email using confident vector match."""
         try:
             # Extract business entity from match
@@ -174,8 +447,9 @@ class EmailProcessor:
             # Extract email category from match
             email_category = self.similarity_matcher.get_email_category_from_match(vector_match)
             
-            # Extract user data from original text
-            extracted_data = self._extract_user_data(text)
+            # User data found by the PII analysis, or extracted from the text now
+            if extracted_data is None:
+                extracted_data = self._extract_user_data(text)
             
             processed_email = ProcessedEmail(
                 email_category=email_category,
@@ -194,36 +468,176 @@ class EmailProcessor:
         except Exception as exc:
             logger.error("Confident match processing failed", error=str(exc))
             # Fallback to LLM classification
-            return self._process_llm_classification(text, metadata)
+            return self._process_llm_classification(text, metadata, extracted_data=extracted_data)
     
-    def _process_llm_classification(self, text: str, metadata: EmailMetadata) -> ProcessedEmail:
-        """Process email using LLM classification."""
+    def _process_draft_classification(
+        self,
+        email_input: EmailInput,
+        text: str,
+        metadata: EmailMetadata,
+        vector_match,
+        extracted_data: Optional[ExtractedData] = None
+    ) -> Optional[ProcessedEmail]:
+        """
+        Process email from the sender history draft instead of the LLM.
+        
+        The draft is used only when its confidence exceeds the draft
+        threshold and a low-confidence vector match, if any, has the same
+        category.
+        
+        Args:
+            email_input: Input email data
+            text: Anonymized email text
+            metadata: Email metadata
+            vector_match: Best vector match below the confidence threshold, or None
+            extracted_data: User data from the PII analysis; extracted from text if omitted
+            
+        Returns:
+            ProcessedEmail from the draft, or None to fall back to the LLM
+        """
+        if not settings.draft_classifier_enabled:
+            return None
+        
         try:
-            processed_email = self.llm_classifier.classify_email(text, metadata)
+            draft = self.draft_classifier.classify(
+                metadata.sender_domain,
+                f"{email_input.subject}\n{text}",
+                load_history=self.vector_store.get_domain_history
+            )
+            if draft is None or draft.confidence_score <= settings.draft_threshold:
+                return None
+            
+            if vector_match and vector_match.metadata.get('email_category') != draft.email_category.value:
+                logger.debug("Draft classification disagrees with vector match",
+                            draft=draft.email_category.value,
+                            vector=vector_match.metadata.get('email_category'))
+                return None
             
-            # Extract user data
-            processed_email.data = self._extract_user_data(text)
+            processed_email = ProcessedEmail(
+                email_category=draft.email_category,
+                business_entity=draft.business_entity,
+                data=extracted_data if extracted_data is not None else self._extract_user_data(text),
+                confidence_score=draft.confidence_score,
+                metadata=metadata
+            )
             
-            logger.info("Processed using LLM classification",
+            logger.info("Processed using draft classification",
                        category=processed_email.email_category.value,
                        confidence=processed_email.confidence_score)
             
             return processed_email
             
+        except Exception as exc:
+            logger.error("Draft classification failed", error=str(exc))
+            return None
+    
+    def _process_llm_classification(
+        self,
+        text: str,
+        metadata: EmailMetadata,
+        embedding: Optional[np.ndarray] = None,
+        extracted_data: Optional[ExtractedData] = None
+    ) -> ProcessedEmail:
+        """Process email using LLM classification."""
+        try:
+            processed_email = self._lookup_cached_classification(text, metadata, embedding)
+            cached = processed_email is not None
+            if not cached:
+                processed_email = self._classify_with_llm(text, metadata, embedding)
+            
+            return self._attach_user_data(processed_email, text, extracted_data, cached)
+            
         except Exception as exc:
             logger.error("LLM classification failed", error=str(exc))
             raise
     
+    def _classify_with_llm(
+        self,
+        text: str,
+        metadata: EmailMetadata,
+        embedding: Optional[np.ndarray] = None
+    ) -> ProcessedEmail:
+        """Classify an email with the LLM and remember a confident result."""
+        processed_email = self.llm_classifier.classify_email(text, metadata)
+        self._remember_classification(text, processed_email, embedding)
+        return processed_email
+    
+    def _attach_user_data(
+        self,
+        processed_email: ProcessedEmail,
+        text: str,
+        extracted_data: Optional[ExtractedData] = None,
+        cached: bool = False
+    ) -> ProcessedEmail:
+        """Set the user data on an LLM classification, or on one from the semantic cache if cached."""
+        # Extract user data unless the PII analysis already did
+        if extracted_data is None:
+            extracted_data = self._extract_user_data(text)
+        processed_email.data = extracted_data
+        
+        logger.info("Processed using semantic cache" if cached else "Processed using LLM classification",
+                   category=processed_email.email_category.value,
+                   confidence=processed_email.confidence_score)
+        
+        return processed_email
+    
+    def _process_llm_classifications(self, items, embeddings=None, extracted=None) -> List[ProcessedEmail]:
+        """Process several emails using one batched LLM classification."""
+        embeddings = embeddings or [None] * len(items)
+        extracted = extracted or [None] * len(items)
+        processed_emails = [
+            self._lookup_cached_classification(text, metadata, embedding)
+            for (text, metadata), embedding in zip(items, embeddings)
+        ]
+        misses = [index for index, cached in enumerate(processed_emails) if cached is None]
+        
+        if misses:
+            classified = self.llm_classifier.classify_emails([items[index] for index in misses])
+            for index, processed_email in zip(misses, classified):
+                self._remember_classification(items[index][0], processed_email, embeddings[index])
+                processed_emails[index] = processed_email
+        
+        for (text, _), processed_email, extracted_data in zip(items, processed_emails, extracted):
+            processed_email.data = extracted_data if extracted_data is not None else self._extract_user_data(text)
+        
+        logger.info("Processed using batched LLM classification",
+                   emails=len(items),
+                   cache_hits=len(items) - len(misses))
+        
+        return processed_emails
+    
+    def _lookup_cached_classification(
+        self,
+        text: str,
+        metadata: EmailMetadata,
+        embedding: Optional[np.ndarray] = None
+    ) -> Optional[ProcessedEmail]:
+        """Get a cached LLM classification for a near-identical email, if enabled."""
+        if not settings.semantic_cache_enabled:
+            return None
+        return self.response_cache.lookup(text, metadata, embedding)
+    
+    def _remember_classification(
+        self,
+        text: str,
+        processed_email: ProcessedEmail,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """Keep a confident LLM classification for near-identical emails and draft classification."""
+        if processed_email.confidence_score <= settings.confidence_threshold:
+            return
+        
+        if settings.semantic_cache_enabled:
+            self.response_cache.store(text, processed_email, embedding)
+        if settings.draft_classifier_enabled:
+            self.draft_classifier.record(processed_email)
+    
     def _extract_user_data(self, text: str) -> ExtractedData:
         """Extract user data from text."""
         try:
             pii_data = self.pii_processor.extract_pii_data(text)
             
-            extracted_data = ExtractedData(
-                email=pii_data.get('email', []),
-                phone_number=pii_data.get('phone_number', []),
-                credit_card_number=pii_data.get('credit_card_number', [])
-            )
+            extracted_data = self._build_extracted_data(pii_data)
             
             logger.debug("User data extracted", 
                         emails=len(extracted_data.email or []),
@@ -236,6 +650,15 @@ class EmailProcessor:
             logger.error("User data extraction failed", error=str(exc))
             return ExtractedData()
     
+    @staticmethod
+    def _build_extracted_data(pii_data: Dict[str, List[str]]) -> ExtractedData:
+        """Convert PII data grouped by type into ExtractedData."""
+        return ExtractedData(
+            email=pii_data.get('email', []),
+            phone_number=pii_data.get('phone_number', []),
+            credit_card_number=pii_data.get('credit_card_number', [])
+        )
+    
     def _enhance_business_entity(self, processed_email: ProcessedEmail) -> ProcessedEmail:
         """Enhance business entity with DPO email if missing."""
         try:
@@ -247,16 +670,67 @@ class EmailProcessor:
                 
                 try:
                     # Run privacy policy scraper
-                    scraper_result = self.privacy_scraper._run(str(business_entity.website))
+                    scraper_result = self.privacy_scraper.run_structured(str(business_entity.website))
+                    self._apply_scraper_result(business_entity, scraper_result)
                     
-                    # Parse result (it's returned as JSON string)
-                    import json
-                    result_data = json.loads(scraper_result)
-                    
-                    if result_data.get('success') and result_data.get('dpo_email'):
-                        business_entity.dpo_email = result_data['dpo_email']
-                        logger.info("DPO email found via scraping", 
-                                   dpo_email=business_entity.dpo_email)
+                except Exception as scrape_exc:
+                    logger.warning("DPO email scraping failed", error=str(scrape_exc))
+            
+            return processed_email
+            
+        except Exception as exc:
+            logger.error("Business entity enhancement failed", error=str(exc))
+            return processed_email
+    
+    def _start_dpo_prefetch(self, sender_domain: str) -> Optional[asyncio.Task]:
+        """
+        Speculatively scrape the sender's privacy policy.
+        
+        The registered domain is scraped rather than the sender's host,
+        since bulk mail is usually sent from a mail., em. or news. subdomain.
+        
+        Args:
+            sender_domain: Domain of the sender address
+            
+        Returns:
+            Task running the scraper, or None if prefetching is disabled
+        """
+        if not settings.speculative_dpo_scrape or not sender_domain or sender_domain == "unknown":
+            return None
+        return asyncio.create_task(
+            self.privacy_scraper.arun_structured(f"https://{extract_root_domain(sender_domain.lower())}")
+        )
+    
+    async def _aenhance_business_entity(
+        self,
+        processed_email: ProcessedEmail,
+        prefetch: Optional[asyncio.Task] = None,
+        prefetch_domain: str = ""
+    ) -> ProcessedEmail:
+        """
+        Enhance business entity with DPO email if missing, without blocking the event loop.
+        
+        Args:
+            processed_email: Classified email
+            prefetch: Speculative scrape started by _start_dpo_prefetch
+            prefetch_domain: Domain the speculative scrape was started for
+            
+        Returns:
+            ProcessedEmail with the DPO email filled in when found
+        """
+        try:
+            business_entity = processed_email.business_entity
+            
+            if not business_entity.dpo_email and business_entity.website:
+                logger.info("Attempting to scrape DPO email", website=business_entity.website)
+                
+                try:
+                    website = str(business_entity.website)
+                    if prefetch is not None and self._is_same_site(website, prefetch_domain):
+                        scraper_result = await prefetch
+                    else:
+                        scraper_result = await self.privacy_scraper.arun_structured(website)
+                    self._apply_scraper_result(business_entity, scraper_result)
                     
                 except Exception as scrape_exc:
                     logger.warning("DPO email scraping failed", error=str(scrape_exc))
@@ -267,15 +741,45 @@ class EmailProcessor:
             logger.error("Business entity enhancement failed", error=str(exc))
             return processed_email
     
-    def _store_in_vector_db(self, text: str, processed_email: ProcessedEmail):
-        """Store processed email in vector database."""
+    @staticmethod
+    def _is_same_site(website: str, domain: str) -> bool:
+        """Check whether a website URL belongs to the same registered domain as the given domain."""
+        host = urlparse(website).hostname
+        return bool(host) and extract_root_domain(host) == extract_root_domain(domain.lower())
+    
+    def _apply_scraper_result(self, business_entity: BusinessEntity, scraper_result: PrivacyPolicyResult):
+        """Set the DPO email from a privacy policy scraper result."""
+        if scraper_result.success and scraper_result.dpo_email:
+            business_entity.dpo_email = scraper_result.dpo_email
+            logger.info("DPO email found via scraping", 
+                       dpo_email=business_entity.dpo_email)
+    
+    def _store_in_vector_db(
+        self,
+        text: str,
+        processed_email: ProcessedEmail,
+        embedding: Optional[np.ndarray] = None,
+        buffered: bool = False
+    ):
+        """
+        Store processed email in vector database.
+        
+        Buffered writes, and all writes when VECTOR_WRITE_FLUSH_INTERVAL is
+        set, are queued and upserted together instead of one call per email.
+        """
         try:
-            doc_id = self.vector_store.add_email_embedding(
+            if buffered or settings.vector_write_flush_interval > 0:
+                store = self.vector_store.queue_email_embedding
+            else:
+                store = self.vector_store.add_email_embedding
+            
+            doc_id = store(
                 email_content=text,
                 metadata=processed_email.metadata,
                 email_category=processed_email.email_category,
                 business_entity=processed_email.business_entity,
-                confidence_score=processed_email.confidence_score
+                confidence_score=processed_email.confidence_score,
+                embedding=embedding
             )
             
             logger.info("Email stored in vector database", doc_id=doc_id)
@@ -283,3 +787,10 @@ class EmailProcessor:
         except Exception as exc:
             logger.error("Failed to store in vector database", error=str(exc))
             # Don't raise - this is not critical for the main processing
+    
+    def _flush_vector_db(self):
+        """Write vector store entries queued by buffered storage."""
+        try:
+            self.vector_store.flush()
+        except Exception as exc:
+            logger.error("Failed to flush vector database writes", error=str(exc))
@@ -0,0 +1,85 @@
+"""Long-lived background event loop for scraping."""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional, TypeVar
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the background event loop, starting its thread on first use.
+
+    The shared browser and HTTP client belong to this loop, so they stay
+    open across scrapes instead of being rebuilt by asyncio.run each time.
+    A forked worker process starts its own loop, since threads do not
+    survive a fork.
+
+    Returns:
+        Running event loop owned by a daemon thread
+    """
+    global _loop, _loop_pid
+
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="scraper-event-loop",
+                daemon=True
+            ).start()
+            logger.debug("Background event loop started")
+        return _loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> "Future[T]":
+    """
+    Schedule a coroutine on the background event loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Future for the coroutine's result; cancelling it cancels the coroutine
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the background event loop and wait for its result.
+
+    Must not be called from the background loop's own thread.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait, or None to wait indefinitely
+
+    Returns:
+        The coroutine's result
+    """
+    return submit(coro).result(timeout)
+
+
+async def run_in_background(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Await a coroutine running on the background event loop from another loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return await asyncio.wrap_future(submit(coro))
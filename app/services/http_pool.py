@@ -0,0 +1,87 @@
+"""Shared async HTTP client for scraping."""
+
+import asyncio
+from typing import Optional
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+# Browser-like user agent; some sites refuse requests from HTTP libraries
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# Seconds allowed for each request
+REQUEST_TIMEOUT = 10.0
+# Open connections kept across all hosts
+MAX_CONNECTIONS = 20
+# Seconds to wait for the client to close when a worker shuts down
+SHUTDOWN_TIMEOUT = 10.0
+
+
+class HTTPClientPool:
+    """
+    One httpx.AsyncClient shared by every scrape.
+
+    Reusing the client keeps connections, TLS sessions and HTTP/2 streams
+    open between requests to the same site. Like the browser pool, the
+    client belongs to the event loop that created it and is replaced when
+    used from a different loop; that loop should call close() before it ends.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool; the client is created on first use."""
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared client, creating it if needed.
+
+        Returns:
+            HTTP client owned by the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections from another loop cannot be used or closed from this one
+            self._client = None
+            self._loop = loop
+
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                headers={'User-Agent': USER_AGENT},
+                timeout=httpx.Timeout(REQUEST_TIMEOUT),
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS)
+            )
+        return self._client
+
+    async def close(self):
+        """Close the client if the running loop owns it."""
+        if self._loop is not asyncio.get_running_loop() or self._client is None:
+            return
+
+        client = self._client
+        self._client = None
+
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("Failed to close shared HTTP client", error=str(exc))
+
+    def shutdown(self):
+        """Close the client from synchronous code, such as a worker shutdown hook."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or self._client is None:
+            return
+
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(self.close(), loop).result(SHUTDOWN_TIMEOUT)
+            else:
+                loop.run_until_complete(self.close())
+        except Exception as exc:
+            logger.warning("Failed to shut down shared HTTP client", error=str(exc))
+
+
+# Global HTTP client pool instance
+http_pool = HTTPClientPool()
@@ -1,23 +1,60 @@
 """Metadata extraction service for email processing."""
 
 import re
-from typing import List, Optional
+from itertools import chain
+from typing import Iterator, List, Optional
 from urllib.parse import urlparse
 import structlog
 
 from app.models import EmailInput, EmailMetadata
 from app.processing.html_processor import HTMLProcessor
+from app.processing.hs_scanner import (
+    pattern_scanner,
+    URL_PATTERN,
+    COMPANY_PATTERN,
+    ADDRESS_PATTERN,
+    PHONE_PATTERN,
+    URL_ID,
+    COMPANY_ID,
+    ADDRESS_ID,
+    PHONE_ID
+)
 from app.config import settings
 
 logger = structlog.get_logger()
 
+URL_REGEX = re.compile(URL_PATTERN, re.IGNORECASE)
+COMPANY_REGEX = re.compile(COMPANY_PATTERN)
+ADDRESS_REGEX = re.compile(ADDRESS_PATTERN, re.IGNORECASE)
+PHONE_REGEX = re.compile(PHONE_PATTERN)
+
+# Phrases that mark text as footer content
+FOOTER_INDICATORS = (
+    'unsubscribe',
+    'privacy policy',
+    'terms of service',
+    'contact us',
+    'copyright',
+    '©',
+    'all rights reserved',
+    'company',
+    'address',
+    'phone',
+    'email'
+)
+
 
 class MetadataExtractor:
     """Service for extracting metadata from email content."""
     
-    def __init__(self):
-        """Initialize the metadata extractor."""
-        self.html_processor = HTMLProcessor()
+    def __init__(self, html_processor: Optional[HTMLProcessor] = None):
+        """
+        Initialize the metadata extractor.
+        
+        Args:
+            html_processor: HTML processor to use; a new one is created if omitted
+        """
+        self.html_processor = html_processor or HTMLProcessor()
     
     def extract_metadata(self, email: EmailInput, clean_text: str) -> EmailMetadata:
         """
@@ -34,17 +71,10 @@ class MetadataExtractor:
             # Extract sender domain
             sender_domain = self.extract_sender_domain(email.from_email)
             
-            # Extract URLs from HTML content
-            urls = []
-            if email.html_content:
-                urls.extend(self.html_processor.extract_urls(email.html_content))
-            
-            # Also extract URLs from text content
-            text_urls = self.extract_urls_from_text(clean_text)
-            urls.extend(text_urls)
-            
-            # Remove duplicates while preserving order
-            urls = list(dict.fromkeys(urls))
+            # Extract URLs from HTML content, then from text content,
+            # removing duplicates while preserving order
+            html_urls = self.html_processor.extract_urls(email.html_content) if email.html_content else ()
+            urls = list(dict.fromkeys(chain(html_urls, self._iter_text_urls(clean_text))))
             
             # Extract footer text
             footer_text = None
@@ -112,24 +142,31 @@ class MetadataExtractor:
         Returns:
             List of URLs found in text
         """
+        return list(self._iter_text_urls(text))
+    
+    def _iter_text_urls(self, text: str) -> Iterator[str]:
+        """Yield valid URLs from plain text, skipping the regex when possible."""
         if not text:
-            return []
-        
-        # URL regex pattern
-        url_pattern = r'https?://[^\s<>"\']+[^\s<>"\'.,)]'
-        urls = re.findall(url_pattern, text, re.IGNORECASE)
+            return
         
-        # Validate and clean URLs
-        valid_urls = []
-        for url in urls:
-            try:
-                parsed = urlparse(url)
-                if parsed.scheme and parsed.netloc:
-                    valid_urls.append(url)
-            except Exception:
-                continue
+        # Skip the regex when a Hyperscan pass finds no URL
+        found = pattern_scanner.scan(text)
+        if found is not None and URL_ID not in found:
+            return
         
-        return valid_urls
+        yield from self._iter_urls(text)
+    
+    def _iter_urls(self, text: str) -> Iterator[str]:
+        """Run the URL regex over text and yield valid URLs."""
+        # The pattern already requires a scheme and a host, so only
+        # unbalanced IPv6 brackets can still make a match unparseable
+        for url in URL_REGEX.findall(text):
+            if '[' in url or ']' in url:
+                try:
+                    urlparse(url)
+                except ValueError:
+                    continue
+            yield url
     
     def extract_footer_from_text(self, text: str, lines_count: int = 3) -> Optional[str]:
         """
@@ -175,38 +212,33 @@ class MetadataExtractor:
         Returns:
             True if text appears to be footer content
         """
-        footer_indicators = [
-            'unsubscribe',
-            'privacy policy',
-            'terms of service',
-            'contact us',
-            'copyright',
-            '©',
-            'all rights reserved',
-            'company',
-            'address',
-            'phone',
-            'email'
-        ]
+        # Email addresses or URLs (common in footers) settle it without
+        # counting indicators
+        if '@' in text:
+            return True
         
         text_lower = text.lower()
+        if 'http' in text_lower:
+            return True
         
-        # Check for footer indicators
-        indicator_count = sum(1 for indicator in footer_indicators if indicator in text_lower)
-        
-        # Check for email addresses or URLs (common in footers)
-        has_email = '@' in text
-        has_url = 'http' in text_lower
+        # Otherwise it is a footer once it has multiple indicators
+        indicator_count = 0
+        for indicator in FOOTER_INDICATORS:
+            if indicator in text_lower:
+                indicator_count += 1
+                if indicator_count >= 2:
+                    return True
         
-        # Consider it a footer if it has multiple indicators or contains contact info
-        return indicator_count >= 2 or has_email or has_url
+        return False
     
-    def extract_company_info(self, text: str) -> dict:
+    def extract_company_info(self, text: str, urls: Optional[List[str]] = None) -> dict:
         """
         Extract potential company information from text.
         
         Args:
             text: Text content to analyze
+            urls: URLs already extracted from text, such as EmailMetadata.urls;
+                the text is scanned for URLs only if omitted
             
         Returns:
             Dictionary with potential company information
@@ -219,23 +251,29 @@ class MetadataExtractor:
         }
         
         try:
+            # One Hyperscan pass finds which patterns occur; None runs them all
+            found = pattern_scanner.scan(text)
+            
             # Extract potential company names (capitalized words/phrases)
-            company_pattern = r'\b[A-Z][a-zA-Z\s&.,]+(?:Inc|LLC|Corp|Company|Ltd|Limited)\b'
-            companies = re.findall(company_pattern, text)
-            company_info['potential_company_names'] = list(set(companies))
+            if found is None or COMPANY_ID in found:
+                companies = COMPANY_REGEX.findall(text)
+                company_info['potential_company_names'] = list(set(companies))
             
             # Extract addresses (basic pattern)
-            address_pattern = r'\d+\s+[A-Za-z\s,]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)'
-            addresses = re.findall(address_pattern, text, re.IGNORECASE)
-            company_info['addresses'] = list(set(addresses))
+            if found is None or ADDRESS_ID in found:
+                addresses = ADDRESS_REGEX.findall(text)
+                company_info['addresses'] = list(set(addresses))
             
             # Extract phone numbers (basic pattern)
-            phone_pattern = r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
-            phones = re.findall(phone_pattern, text)
-            company_info['phone_numbers'] = list(set(phones))
+            if found is None or PHONE_ID in found:
+                phones = PHONE_REGEX.findall(text)
+                company_info['phone_numbers'] = list(set(phones))
             
             # Extract websites
-            company_info['websites'] = self.extract_urls_from_text(text)
+            if urls is not None:
+                company_info['websites'] = list(urls)
+            elif found is None or URL_ID in found:
+                company_info['websites'] = list(self._iter_urls(text))
             
             return company_info
             
@@ -2,20 +2,109 @@
 
 import re
 import asyncio
-from typing import List, Optional
-from urllib.parse import urljoin
-import requests
-from playwright.async_api import async_playwright
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 from langchain.tools import BaseTool
+from selectolax.lexbor import LexborHTMLParser
 
 from pydantic import BaseModel, Field
 import structlog
 
 from app.models import PrivacyPolicyResult
 from app.llm.chains import DPOExtractionChain
+from app.services.browser_pool import browser_pool
+from app.services.http_pool import http_pool
+from app.services.event_loop import run_coroutine, run_in_background
+from app.processing.hs_scanner import PatternScanner
 
 logger = structlog.get_logger()
 
+# Requests and page loads in flight at once for one scrape
+SCRAPE_CONCURRENCY = 10
+# Probe statuses meaning the candidate page does not exist
+MISSING_PAGE_STATUSES = frozenset({404, 410})
+
+# DPO-related patterns, in order of preference
+DPO_PATTERNS = (
+    r'(?:data\s+protection\s+officer|dpo)[\s\S]{0,100}?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[\s\S]{0,50}?(?:data\s+protection|dpo)',
+    r'privacy[\s\S]{0,100}?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[\s\S]{0,50}?privacy'
+)
+DPO_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in DPO_PATTERNS]
+# Finds which DPO patterns occur in one pass, so re only runs the ones that match
+dpo_scanner = PatternScanner([(pattern, True) for pattern in DPO_PATTERNS])
+
+# Link text or href fragments marking a privacy policy link
+PRIVACY_LINK_PATTERN = re.compile(r'privacy|data protection', re.IGNORECASE)
+# Visible characters below which a static page is assumed to be rendered by JavaScript
+MIN_STATIC_PAGE_TEXT = 200
+# Hrefs of privacy policy links, collected in the page with one CDP round trip
+PRIVACY_LINKS_SCRIPT = """
+(anchors) => anchors
+    .filter(a => /privacy/i.test(a.getAttribute('href')) || /privacy|data protection/i.test(a.textContent))
+    .map(a => a.getAttribute('href'))
+"""
+
+# Domains whose candidate privacy policy URLs are remembered
+PRIVACY_URL_CACHE_SIZE = 4096
+# Privacy policy pages whose text is remembered
+PAGE_CONTENT_CACHE_SIZE = 256
+# Seconds scraped URLs and page text stay valid
+SCRAPE_CACHE_TTL = 86400.0
+
+
+class ScrapeCache:
+    """In-process LRU cache with expiry for scraping results shared by all scrapes."""
+
+    def __init__(self, maxsize: int, ttl: float = SCRAPE_CACHE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get an unexpired entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Emails from one sender domain share these across scrapes
+privacy_url_cache = ScrapeCache(PRIVACY_URL_CACHE_SIZE)
+page_content_cache = ScrapeCache(PAGE_CONTENT_CACHE_SIZE)
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 class PrivacyPolicyScraperInput(BaseModel):
     """Input schema for privacy policy scraper tool."""
@@ -46,18 +135,69 @@ class PrivacyPolicyScraperTool(BaseTool):
         Returns:
             JSON string with scraping results
         """
+        return self.run_structured(website_url).model_dump_json()
+    
+    async def _arun(self, website_url: str) -> str:
+        """
+        Run the privacy policy scraper without blocking the current event loop.
+        
+        Args:
+            website_url: Website URL to scrape
+            
+        Returns:
+            JSON string with scraping results
+        """
+        return (await self.arun_structured(website_url)).model_dump_json()
+    
+    def run_structured(self, website_url: str) -> PrivacyPolicyResult:
+        """
+        Run the privacy policy scraper synchronously for in-process callers.
+        
+        LangChain tools return strings; callers in this process use the
+        result model directly instead of serializing and parsing it.
+        
+        Args:
+            website_url: Website URL to scrape
+            
+        Returns:
+            PrivacyPolicyResult with scraping results
+        """
         try:
-            # Run async scraper
-            result = asyncio.run(self._scrape_privacy_policy(website_url))
-            return result.model_dump_json()
+            # Run async scraper on the long-lived loop that owns the browser
+            return run_coroutine(self._scrape_privacy_policy(website_url))
             
         except Exception as exc:
             logger.error("Privacy policy scraping failed", url=website_url, error=str(exc))
             return PrivacyPolicyResult(
                 success=False,
                 error_message=str(exc)
-            ).model_dump_json()
+            )
     
+    async def arun_structured(self, website_url: str) -> PrivacyPolicyResult:
+        """
+        Await the privacy policy scraper from any event loop for in-process callers.
+        
+        The scrape itself runs on the background loop that owns the shared
+        browser and HTTP client; cancelling the await cancels the scrape.
+        
+        Args:
+            website_url: Website URL to scrape
+            
+        Returns:
+            PrivacyPolicyResult with scraping results
+        """
+        try:
+            return await run_in_background(self._scrape_privacy_policy(website_url))
+            
+        except asyncio.CancelledError:
+            raise
+            
+        except Exception as exc:
+            logger.error("Privacy policy scraping failed", url=website_url, error=str(exc))
+            return PrivacyPolicyResult(
+                success=False,
+                error_message=str(exc)
+            )
 
     async def _scrape_privacy_policy(self, website_url: str) -> PrivacyPolicyResult:
         """
@@ -79,11 +219,23 @@ class PrivacyPolicyScraperTool(BaseTool):
                     error_message="No privacy policy URLs found"
                 )
             
-            # Try to scrape each privacy policy URL
-            for privacy_url in privacy_urls:
+            # Probe every candidate at once and fetch the pages that exist
+            # concurrently, so the wait is the slowest page rather than the sum
+            semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+            privacy_urls = await self._probe_privacy_urls(privacy_urls, semaphore)
+            contents = await asyncio.gather(
+                *(self._scrape_page_limited(url, semaphore) for url in privacy_urls),
+                return_exceptions=True
+            )
+            
+            # Extract from the pages in candidate order
+            for privacy_url, content in zip(privacy_urls, contents):
+                if isinstance(content, Exception):
+                    logger.warning("Failed to scrape privacy URL", 
+                                 url=privacy_url, error=str(content))
+                    continue
+                
                 try:
-                    content = await self._scrape_page_content(privacy_url)
-                    
                     if content:
                         # Extract DPO email using LLM
                         dpo_email = await self._extract_dpo_email(content)
@@ -112,6 +264,40 @@ class PrivacyPolicyScraperTool(BaseTool):
                 error_message=str(exc)
             )
     
+    async def _probe_privacy_urls(self, privacy_urls: List[str],
+                                  semaphore: asyncio.Semaphore) -> List[str]:
+        """
+        Keep the candidate URLs whose page exists, probing them concurrently.
+        
+        Args:
+            privacy_urls: Candidate privacy policy URLs
+            semaphore: Limit on requests in flight
+            
+        Returns:
+            Candidates that did not return a missing-page status, in input order
+        """
+        client = await http_pool.get_client()
+        
+        async def probe(url: str) -> int:
+            async with semaphore:
+                response = await client.head(url)
+                return response.status_code
+        
+        statuses = await asyncio.gather(*(probe(url) for url in privacy_urls), return_exceptions=True)
+        
+        found = [
+            url for url, status in zip(privacy_urls, statuses)
+            if not isinstance(status, Exception) and status not in MISSING_PAGE_STATUSES
+        ]
+        logger.debug("Privacy policy candidates probed", candidates=len(privacy_urls), found=len(found))
+        
+        return found
+    
+    async def _scrape_page_limited(self, url: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Scrape a page while holding the scrape's concurrency limit."""
+        async with semaphore:
+            return await self._scrape_page_content(url)
+    
     async def _find_privacy_policy_urls(self, website_url: str) -> List[str]:
         """
         Find potential privacy policy URLs for a website.
@@ -139,6 +325,13 @@ class PrivacyPolicyScraperTool(BaseTool):
         if not website_url.startswith(('http://', 'https://')):
             website_url = 'https://' + website_url
         
+        # Emails from the same sender domain reuse the last discovery
+        domain = urlparse(website_url).netloc.lower()
+        cached = privacy_url_cache.get(domain)
+        if cached is not None:
+            logger.debug("Privacy policy URLs cached", domain=domain)
+            return list(cached)
+        
         # Generate potential URLs
         privacy_urls = []
         for path in privacy_paths:
@@ -153,7 +346,9 @@ class PrivacyPolicyScraperTool(BaseTool):
             logger.warning("Failed to discover privacy links", error=str(exc))
         
         # Remove duplicates while preserving order
-        return list(dict.fromkeys(privacy_urls))
+        privacy_urls = list(dict.fromkeys(privacy_urls))
+        privacy_url_cache.set(domain, tuple(privacy_urls))
+        return privacy_urls
     
     async def _discover_privacy_links(self, website_url: str) -> List[str]:
         """
@@ -165,46 +360,85 @@ class PrivacyPolicyScraperTool(BaseTool):
         Returns:
             List of discovered privacy policy URLs
         """
+        # Most sites link their policy from static HTML, which needs no browser
+        try:
+            client = await http_pool.get_client()
+            response = await client.get(website_url)
+            
+            if response.status_code == 200:
+                discovered_urls, text_length = await asyncio.to_thread(
+                    self._extract_privacy_links, response.text, str(response.url)
+                )
+                if discovered_urls or text_length >= MIN_STATIC_PAGE_TEXT:
+                    return discovered_urls
+            
+        except Exception as exc:
+            logger.warning("HTTP link discovery failed, trying Playwright",
+                         url=website_url, error=str(exc))
+        
+        # Fall back to Playwright for pages rendered by JavaScript
         discovered_urls = []
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
+            async with browser_pool.new_page() as page:
                 # Navigate to the website
                 await page.goto(website_url, timeout=10000)
                 
                 # Look for privacy policy links
-                privacy_selectors = [
-                    'a[href*="privacy"]',
-                    'a[href*="Privacy"]',
-                    'a:has-text("Privacy Policy")',
-                    'a:has-text("Privacy")',
-                    'a:has-text("Data Protection")'
-                ]
-                
-                for selector in privacy_selectors:
-                    try:
-                        elements = await page.query_selector_all(selector)
-                        for element in elements:
-                            href = await element.get_attribute('href')
-                            if href:
-                                full_url = urljoin(website_url, href)
-                                discovered_urls.append(full_url)
-                    except Exception:
-                        continue
-                
-                await browser.close()
+                hrefs = await page.eval_on_selector_all('a[href]', PRIVACY_LINKS_SCRIPT)
+                discovered_urls = [urljoin(website_url, href) for href in hrefs if href]
                 
         except Exception as exc:
             logger.warning("Failed to discover privacy links with Playwright", error=str(exc))
         
         return discovered_urls
     
+    @staticmethod
+    def _extract_privacy_links(html: str, base_url: str) -> Tuple[List[str], int]:
+        """
+        Find privacy policy links in static HTML.
+        
+        Args:
+            html: Page HTML
+            base_url: URL the page was served from, for relative links
+            
+        Returns:
+            Tuple of privacy policy URLs and the length of the page's visible text
+        """
+        tree = LexborHTMLParser(html)
+        
+        discovered_urls = []
+        for anchor in tree.css('a[href]'):
+            href = anchor.attrs.get('href') or ''
+            if 'privacy' in href.lower() or PRIVACY_LINK_PATTERN.search(anchor.text()):
+                discovered_urls.append(urljoin(base_url, href))
+        
+        for node in tree.css("script, style"):
+            node.decompose()
+        text = tree.body.text(separator=' ') if tree.body is not None else ""
+        
+        return discovered_urls, len(''.join(text.split()))
+    
     async def _scrape_page_content(self, url: str) -> Optional[str]:
         """
-        Scrape content from a privacy policy page.
+        Scrape content from a privacy policy page, reusing recently scraped text.
+        
+        Args:
+            url: Privacy policy URL
+            
+        Returns:
+            Page content or None if failed
+        """
+        content = page_content_cache.get(url)
+        if content is None:
+            content = await self._fetch_page_content(url)
+            if content:
+                page_content_cache.set(url, content)
+        return content
+    
+    async def _fetch_page_content(self, url: str) -> Optional[str]:
+        """
+        Fetch a privacy policy page, rendering it with Playwright if needed.
         
         Args:
             url: Privacy policy URL
@@ -213,74 +447,58 @@ class PrivacyPolicyScraperTool(BaseTool):
             Page content or None if failed
         """
         try:
-            # First try with requests (faster)
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
+            # First try a plain HTTP request (faster); awaiting it keeps the
+            # event loop free for the other pages being fetched
+            client = await http_pool.get_client()
+            response = await client.get(url)
             
             if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                text = soup.get_text()
-                # Clean up whitespace
-                text = re.sub(r'\s+', ' ', text).strip()
+                # Parsing is CPU-bound, so keep it off the event loop
+                text = await asyncio.to_thread(self._extract_page_text, response.text)
                 
                 if len(text) > 100:  # Ensure we got meaningful content
                     return text
             
         except Exception as exc:
-            logger.warning("Requests scraping failed, trying Playwright", 
+            logger.warning("HTTP scraping failed, trying Playwright", 
                          url=url, error=str(exc))
         
         # Fallback to Playwright for dynamic content
         try:
-            async with async_playwright() as p:
-                try:
-                    browser = await p.chromium.launch(
-                        headless=True,
-                        args=['--no-sandbox', '--disable-dev-shm-usage']
-                    )
-                    page = await browser.new_page()
-
-                    await page.goto(url, timeout=15000)
-
-                    # Wait for content to load
-                    await page.wait_for_timeout(2000)
-
-                    # Get text content
-                    content = await page.inner_text('body')
-
-                    await browser.close()
-
-                    return content
-
-                except Exception as browser_exc:
-                    logger.warning("Playwright browser launch failed, trying fallback",
-                                 error=str(browser_exc))
-                    # Try with different browser options
-                    try:
-                        browser = await p.chromium.launch(
-                            headless=True,
-                            args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
-                        )
-                        page = await browser.new_page()
-                        await page.goto(url, timeout=10000)
-                        content = await page.inner_text('body')
-                        await browser.close()
-                        return content
-                    except Exception:
-                        logger.error("All Playwright options failed", url=url)
-                        return None
+            async with browser_pool.new_page() as page:
+                await page.goto(url, timeout=15000)
+
+                # Wait for content to load
+                await page.wait_for_timeout(2000)
+
+                # Get text content
+                return await page.inner_text('body')
 
         except Exception as exc:
             logger.error("Playwright scraping failed", url=url, error=str(exc))
             return None
     
+    @staticmethod
+    def _extract_page_text(html: str) -> str:
+        """
+        Get the visible text of an HTML page with whitespace collapsed.
+        
+        Args:
+            html: Page HTML
+            
+        Returns:
+            Page text on a single line
+        """
+        tree = LexborHTMLParser(html)
+        
+        # Remove script and style elements
+        for node in tree.css("script, style"):
+            node.decompose()
+        
+        text = tree.root.text(separator=' ') if tree.root is not None else ""
+        # Clean up whitespace
+        return ' '.join(text.split())
+    
     async def _extract_dpo_email(self, content: str) -> Optional[str]:
         """
         Extract DPO email from privacy policy content using LLM.
@@ -319,19 +537,17 @@ class PrivacyPolicyScraperTool(BaseTool):
         Returns:
             DPO email address or None
         """
-        # DPO-related patterns
-        dpo_patterns = [
-            r'(?:data\s+protection\s+officer|dpo)[\s\S]{0,100}?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[\s\S]{0,50}?(?:data\s+protection|dpo)',
-            r'privacy[\s\S]{0,100}?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[\s\S]{0,50}?privacy'
-        ]
+        # One Hyperscan pass rules out patterns with no match; None runs them all
+        found = dpo_scanner.scan(content)
         
-        for pattern in dpo_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                if self._is_valid_email(match):
-                    return match
+        # Stop at the first valid address instead of collecting every match
+        for pattern_id, regex in enumerate(DPO_REGEXES):
+            if found is not None and pattern_id not in found:
+                continue
+            for match in regex.finditer(content):
+                email = match.group(1)
+                if self._is_valid_email(email):
+                    return email
         
         return None
     
@@ -348,5 +564,4 @@ class PrivacyPolicyScraperTool(BaseTool):
         if not email or email.lower() == "none":
             return False
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(email_pattern, email.strip()))
+        return bool(EMAIL_REGEX.match(email.strip()))
@@ -0,0 +1,135 @@
+"""Semantic cache of LLM classification results."""
+
+import hashlib
+from typing import Optional
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.models import EmailMetadata, ExtractedData, ProcessedEmail
+from app.database.vector_store import VectorStoreService
+
+logger = structlog.get_logger()
+
+CACHE_COLLECTION_NAME = "llm_response_cache"
+CACHE_COLLECTION_METADATA = {
+    "description": "LLM classification results keyed by anonymized email text",
+    "hnsw:space": "cosine"
+}
+
+
+class SemanticResponseCache:
+    """
+    Reuses LLM classifications for near-identical emails from the same sender.
+
+    Results are stored in their own Chroma collection under the same
+    embedding the vector store searches with, so an email is embedded
+    once for both. A lookup only returns a result from the same sender
+    domain whose cosine similarity reaches the threshold, which is
+    stricter than the vector match confidence. Only category, business
+    entity and confidence are cached; user data is always extracted from
+    the new email.
+    """
+
+    def __init__(self, vector_store: VectorStoreService, threshold: Optional[float] = None):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            vector_store: Vector store providing the Chroma client and embeddings
+            threshold: Minimum cosine similarity for a hit; defaults to the
+                SEMANTIC_CACHE_THRESHOLD setting
+        """
+        self.vector_store = vector_store
+        self.threshold = threshold if threshold is not None else settings.semantic_cache_threshold
+        self.collection = vector_store.chroma_client.get_or_create_collection(
+            name=CACHE_COLLECTION_NAME,
+            metadata=CACHE_COLLECTION_METADATA
+        )
+
+    def lookup(
+        self,
+        text: str,
+        metadata: EmailMetadata,
+        embedding: Optional[np.ndarray] = None
+    ) -> Optional[ProcessedEmail]:
+        """
+        Find a cached classification for an email.
+
+        Args:
+            text: Anonymized email text
+            metadata: Email metadata
+            embedding: Vector from the vector store's embed_email; computed if omitted
+
+        Returns:
+            Copy of the cached classification with this email's metadata, or None
+        """
+        try:
+            if embedding is None:
+                embedding = self.vector_store.embed_email(text, metadata)
+            results = self.collection.query(
+                query_embeddings=embedding.reshape(1, -1),
+                n_results=1,
+                where={"sender_domain": metadata.sender_domain},
+                include=["documents", "distances"]
+            )
+
+            if not results['ids'] or not results['ids'][0]:
+                return None
+
+            similarity = 1 - results['distances'][0][0]
+            if similarity < self.threshold:
+                return None
+
+            cached = ProcessedEmail.model_validate_json(results['documents'][0][0])
+            logger.debug("Semantic cache hit",
+                         domain=metadata.sender_domain,
+                         similarity=similarity)
+
+            return cached.model_copy(update={"metadata": metadata, "data": ExtractedData()})
+
+        except Exception as exc:
+            logger.error("Semantic cache lookup failed", error=str(exc))
+            return None
+
+    def store(
+        self,
+        text: str,
+        processed_email: ProcessedEmail,
+        embedding: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Cache a classification for an email.
+
+        Args:
+            text: Anonymized email text
+            processed_email: LLM classification result
+            embedding: Vector from the vector store's embed_email; computed if omitted
+        """
+        if processed_email.metadata is None:
+            return
+
+        try:
+            sender_domain = processed_email.metadata.sender_domain
+            if embedding is None:
+                embedding = self.vector_store.embed_email(text, processed_email.metadata)
+            # User data and metadata belong to this email only
+            payload = ProcessedEmail(
+                email_category=processed_email.email_category,
+                business_entity=processed_email.business_entity,
+                data=ExtractedData(),
+                confidence_score=processed_email.confidence_score
+            ).model_dump_json()
+            doc_id = hashlib.blake2b(
+                f"{sender_domain}\0{text}".encode("utf-8"), digest_size=16
+            ).hexdigest()
+
+            self.collection.upsert(
+                ids=[doc_id],
+                embeddings=embedding.reshape(1, -1),
+                documents=[payload],
+                metadatas=[{"sender_domain": sender_domain}]
+            )
+
+        except Exception as exc:
+            logger.error("Failed to store semantic cache entry", error=str(exc))
@@ -1,8 +1,11 @@
 """Confidence-based similarity matching service."""
 
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
+import numpy as np
 import structlog
 
 from app.config import settings
@@ -11,14 +14,91 @@ from app.database.vector_store import VectorStoreService
 
 logger = structlog.get_logger()
 
+# Try to import tldextract (optional dependency)
+try:
+    import tldextract
+    # Bundled public suffix list snapshot; never fetched over the network
+    _tld_extract = tldextract.TLDExtract(suffix_list_urls=())
+    TLDEXTRACT_AVAILABLE = True
+except ImportError:
+    TLDEXTRACT_AVAILABLE = False
+    logger.info("tldextract not available. Install tldextract for public-suffix-aware domain matching.")
+
+# Distinct domains whose root domain and pairwise similarity are remembered
+DOMAIN_CACHE_SIZE = 8192
+# Sending subdomains treated as the same sender as their parent domain
+MAIL_SUBDOMAIN_PREFIXES = ('mail', 'email', 'smtp', 'noreply', 'no-reply')
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def extract_root_domain(domain: str) -> str:
+    """
+    Extract the registered domain from a full domain.
+    
+    Uses the public suffix list when tldextract is installed, so
+    'shop.example.co.uk' gives 'example.co.uk'; otherwise the last two labels.
+    
+    Args:
+        domain: Full domain name
+        
+    Returns:
+        Root domain
+    """
+    if TLDEXTRACT_AVAILABLE:
+        try:
+            return _tld_extract(domain).registered_domain or domain
+        except Exception:
+            return domain
+    
+    # For domains like 'mail.google.com', return 'google.com'
+    parts = domain.split('.')
+    if len(parts) >= 2:
+        return '.'.join(parts[-2:])
+    
+    return domain
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def are_domains_similar(domain1: str, domain2: str) -> bool:
+    """
+    Check if two domains are similar (e.g., subdomains of the same parent).
+    
+    Args:
+        domain1: First domain
+        domain2: Second domain
+        
+    Returns:
+        True if domains are similar
+    """
+    # Check if root domains match
+    if extract_root_domain(domain1) == extract_root_domain(domain2):
+        return True
+    
+    # Check if one is a subdomain of the other
+    if domain1.endswith('.' + domain2) or domain2.endswith('.' + domain1):
+        return True
+    
+    # Check for common patterns (mail.domain.com vs domain.com)
+    for prefix in MAIL_SUBDOMAIN_PREFIXES:
+        if (domain1.startswith(f"{prefix}.") and domain1[len(prefix)+1:] == domain2) or \
+           (domain2.startswith(f"{prefix}.") and domain2[len(prefix)+1:] == domain1):
+            return True
+    
+    return False
+
 
 class SimilarityMatcher:
     """Service for confidence-based vector similarity matching."""
     
-    def __init__(self):
-        """Initialize the similarity matcher."""
+    def __init__(self, vector_store: Optional[VectorStoreService] = None):
+        """
+        Initialize the similarity matcher.
+        
+        Args:
+            vector_store: Vector store to search; a new one is created if omitted
+        """
         try:
-            self.vector_store = VectorStoreService()
+            self.vector_store = vector_store or VectorStoreService()
             logger.info("Similarity matcher initialized successfully")
         except Exception as exc:
             logger.error("Failed to initialize vector store for similarity matching", error=str(exc))
@@ -28,7 +108,8 @@ class SimilarityMatcher:
         self,
         email_content: str,
         metadata: EmailMetadata,
-        n_candidates: int = 10
+        n_candidates: int = 10,
+        embedding: Optional[np.ndarray] = None
     ) -> Optional[VectorMatch]:
         """
         Find the best matching email with confidence scoring.
@@ -37,6 +118,7 @@ class SimilarityMatcher:
             email_content: Query email content
             metadata: Query email metadata
             n_candidates: Number of candidates to consider
+            embedding: Query vector from the vector store's embed_email
             
         Returns:
             Best vector match or None if no confident match found
@@ -49,97 +131,110 @@ class SimilarityMatcher:
 
             # Search for similar emails
             candidates = self.vector_store.search_similar_emails(
-                email_content, metadata, n_candidates
+                email_content, metadata, n_candidates, query_embedding=embedding
             )
             
-            if not candidates:
-                logger.debug("No candidates found in vector search")
-                return None
-            
-            # Calculate confidence scores for each candidate
-            scored_matches = []
-            for candidate in candidates:
-                confidence_match = self._calculate_confidence_score(
-                    candidate, metadata
-                )
-                if confidence_match:
-                    scored_matches.append(confidence_match)
-            
-            if not scored_matches:
-                logger.debug("No confident matches found")
-                return None
-            
-            # Sort by confidence score and return the best match
-            best_match = max(scored_matches, key=lambda x: x.confidence_score)
-            
-            logger.info(
-                "Best match found",
-                confidence=best_match.confidence_score,
-                similarity=best_match.similarity_score,
-                domain_weight=best_match.domain_weight
-            )
-            
-            return best_match
+            return self._select_best_match(candidates, metadata)
             
         except Exception as exc:
             logger.error("Failed to find best match", error=str(exc))
             return None
     
-    def _calculate_confidence_score(
+    async def afind_best_match(
         self,
-        candidate: Dict[str, Any],
-        query_metadata: EmailMetadata
+        email_content: str,
+        metadata: EmailMetadata,
+        n_candidates: int = 10,
+        embedding: Optional[np.ndarray] = None
     ) -> Optional[VectorMatch]:
         """
-        Calculate confidence score for a candidate match.
+        Find the best matching email without blocking the event loop.
         
         Args:
-            candidate: Candidate match from vector search
-            query_metadata: Query email metadata
+            email_content: Query email content
+            metadata: Query email metadata
+            n_candidates: Number of candidates to consider
+            embedding: Query vector from the vector store's embed_email
             
         Returns:
-            VectorMatch with confidence score or None
+            Best vector match or None if no confident match found
         """
         try:
-            # Get similarity score (cosine similarity)
-            similarity_score = candidate.get('similarity', 0.0)
-            
-            # Get candidate metadata
-            candidate_metadata = candidate.get('metadata', {})
-            candidate_domain = candidate_metadata.get('sender_domain', '')
-            
-            # Calculate domain matching weight
-            domain_weight = self._calculate_domain_weight(
-                query_metadata.sender_domain,
-                candidate_domain
-            )
-            
-            # Calculate final confidence score
-            confidence_score = similarity_score * domain_weight
-            
-            # Create VectorMatch object
-            vector_match = VectorMatch(
-                similarity_score=similarity_score,
-                domain_weight=domain_weight,
-                confidence_score=confidence_score,
-                metadata=candidate_metadata
-            )
+            if not self.vector_store:
+                logger.warning("Vector store not available, skipping similarity search")
+                return None
             
-            logger.debug(
-                "Confidence calculated",
-                similarity=similarity_score,
-                domain_weight=domain_weight,
-                confidence=confidence_score,
-                query_domain=query_metadata.sender_domain,
-                candidate_domain=candidate_domain
+            candidates = await self.vector_store.asearch_similar_emails(
+                email_content, metadata, n_candidates, query_embedding=embedding
             )
             
-            return vector_match
+            return self._select_best_match(candidates, metadata)
             
         except Exception as exc:
-            logger.error("Failed to calculate confidence score", error=str(exc))
+            logger.error("Failed to find best match", error=str(exc))
             return None
     
+    def _select_best_match(
+        self,
+        candidates: List[Dict[str, Any]],
+        metadata: EmailMetadata
+    ) -> Optional[VectorMatch]:
+        """
+        Score vector search candidates and pick the most confident one.
+        
+        Args:
+            candidates: Matches from the vector store
+            metadata: Query email metadata
+            
+        Returns:
+            Best vector match or None if no confident match found
+        """
+        if not candidates:
+            logger.debug("No candidates found in vector search")
+            return None
+        
+        # Score every candidate at once; domain weights are computed once
+        # per distinct domain and only the winner becomes a VectorMatch
+        candidate_metadata = [candidate.get('metadata', {}) for candidate in candidates]
+        candidate_domains = [meta.get('sender_domain', '') for meta in candidate_metadata]
+        weights_by_domain = {
+            domain: self._calculate_domain_weight(metadata.sender_domain, domain)
+            for domain in set(candidate_domains)
+        }
+        
+        similarities = np.fromiter(
+            (candidate.get('similarity', 0.0) for candidate in candidates),
+            dtype=np.float64,
+            count=len(candidates)
+        )
+        domain_weights = np.fromiter(
+            (weights_by_domain[domain] for domain in candidate_domains),
+            dtype=np.float64,
+            count=len(candidates)
+        )
+        
+        # Final confidence score is similarity weighted by domain match
+        confidence_scores = similarities * domain_weights
+        best = int(confidence_scores.argmax())
+        
+        best_match = VectorMatch(
+            similarity_score=float(similarities[best]),
+            domain_weight=float(domain_weights[best]),
+            confidence_score=float(confidence_scores[best]),
+            metadata=candidate_metadata[best]
+        )
+        
+        logger.info(
+            "Best match found",
+            confidence=best_match.confidence_score,
+            similarity=best_match.similarity_score,
+            domain_weight=best_match.domain_weight,
+            query_domain=metadata.sender_domain,
+            candidate_domain=candidate_domains[best]
+        )
+        
+        return best_match
+    
     def _calculate_domain_weight(self, query_domain: str, candidate_domain: str) -> float:
         """
         Calculate domain matching weight based on domain similarity.
@@ -180,27 +275,8 @@ class SimilarityMatcher:
             True if domains are similar
         """
         try:
-            # Extract root domains
-            root1 = self._extract_root_domain(domain1)
-            root2 = self._extract_root_domain(domain2)
-            
-            # Check if root domains match
-            if root1 == root2:
-                return True
-            
-            # Check if one is a subdomain of the other
-            if domain1.endswith('.' + domain2) or domain2.endswith('.' + domain1):
-                return True
-            
-            # Check for common patterns (mail.domain.com vs domain.com)
-            common_prefixes = ['mail', 'email', 'smtp', 'noreply', 'no-reply']
-            
-            for prefix in common_prefixes:
-                if (domain1.startswith(f"{prefix}.") and domain1[len(prefix)+1:] == domain2) or \
-                   (domain2.startswith(f"{prefix}.") and domain2[len(prefix)+1:] == domain1):
-                    return True
-            
-            return False
+            # Cached per domain pair; candidates repeat across emails
+            return are_domains_similar(domain1, domain2)
             
         except Exception:
             return False
@@ -216,14 +292,7 @@ class SimilarityMatcher:
             Root domain
         """
         try:
-            # Split domain parts
-            parts = domain.split('.')
-            
-            # For domains like 'mail.google.com', return 'google.com'
-            if len(parts) >= 2:
-                return '.'.join(parts[-2:])
-            
-            return domain
+            return extract_root_domain(domain)
             
         except Exception:
             return domain
@@ -305,22 +374,20 @@ class SimilarityMatcher:
                 "domain_distribution": {}
             }
         
-        confident_matches = [m for m in matches if self.is_confident_match(m)]
+        # Read each score once into arrays and reduce them in NumPy
+        confidences = np.fromiter((m.confidence_score for m in matches), dtype=np.float64, count=len(matches))
+        similarities = np.fromiter((m.similarity_score for m in matches), dtype=np.float64, count=len(matches))
         
-        # Calculate averages
-        avg_confidence = sum(m.confidence_score for m in matches) / len(matches)
-        avg_similarity = sum(m.similarity_score for m in matches) / len(matches)
+        # Same test as is_confident_match
+        confident_matches = int(np.count_nonzero(confidences > settings.confidence_threshold))
         
-        # Domain distribution
-        domain_dist = {}
-        for match in matches:
-            domain = match.metadata.get('sender_domain', 'unknown')
-            domain_dist[domain] = domain_dist.get(domain, 0) + 1
+        # Domain distribution, counted in C and kept in first-seen order
+        domain_dist = dict(Counter(m.metadata.get('sender_domain', 'unknown') for m in matches))
         
         return {
             "total_matches": len(matches),
-            "confident_matches": len(confident_matches),
-            "avg_confidence": round(avg_confidence, 3),
-            "avg_similarity": round(avg_similarity, 3),
+            "confident_matches": confident_matches,
+            "avg_confidence": round(float(confidences.mean()), 3),
+            "avg_similarity": round(float(similarities.mean()), 3),
             "domain_distribution": domain_dist
         }
@@ -2,17 +2,44 @@
 
 import json
 import os
+import threading
+import orjson
 import structlog
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from celery import Task
 from app.celery_app import celery_app
 from app.models import EmailInput, ProcessedEmail
 from app.services.email_processor import EmailProcessor
-from app.database.dynamodb import DynamoDBService
+from app.database.dynamodb import dynamodb_service
 
 logger = structlog.get_logger()
 
+# Fields every email file must provide
+REQUIRED_EMAIL_FIELDS = frozenset({'from', 'subject', 'html_content'})
+
+_email_processor: Optional[EmailProcessor] = None
+_email_processor_lock = threading.Lock()
+
+
+def get_email_processor() -> EmailProcessor:
+    """
+    Get this worker process's email processor, creating it on first use.
+
+    Building the processor loads the vector store, LLM client and caches,
+    so each pool process builds it once (normally from the
+    worker_process_init hook) and reuses it for every task it runs.
+
+    Returns:
+        EmailProcessor instance
+    """
+    global _email_processor
+    if _email_processor is None:
+        with _email_processor_lock:
+            if _email_processor is None:
+                _email_processor = EmailProcessor()
+    return _email_processor
+
 
 def load_email_from_file(email_filename: str) -> Dict[str, Any]:
     """
@@ -37,18 +64,16 @@ def load_email_from_file(email_filename: str) -> Dict[str, Any]:
     if not file_path.exists():
         raise FileNotFoundError(f"Email file not found: {file_path}")
 
-    # Load and parse JSON
+    # Load and parse JSON; orjson decodes the UTF-8 bytes directly
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            email_data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise json.JSONDecodeError(f"Invalid JSON in {email_filename}: {e}")
+        email_data = orjson.loads(file_path.read_bytes())
+    except orjson.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"Invalid JSON in {email_filename}: {e.msg}", e.doc, e.pos) from e
 
     # Validate required fields
-    required_fields = ['from', 'subject', 'html_content']
-    missing_fields = [field for field in required_fields if field not in email_data]
+    missing_fields = REQUIRED_EMAIL_FIELDS - email_data.keys()
     if missing_fields:
-        raise ValueError(f"Missing required fields in {email_filename}: {missing_fields}")
+        raise ValueError(f"Missing required fields in {email_filename}: {sorted(missing_fields)}")
 
     logger.info("Email loaded from file", filename=email_filename, fields=list(email_data.keys()))
     return email_data
@@ -66,7 +91,7 @@ class CallbackTask(Task):
         logger.error("Task failed", task_id=task_id, error=str(exc))
 
 
-@celery_app.task(bind=True, base=CallbackTask, name="app.tasks.process_email_task")
+@celery_app.task(bind=True, base=CallbackTask, acks_late=True, name="app.tasks.process_email_task")
 def process_email_task(self, email_filename: str) -> Dict[str, Any]:
     """
     Process a single email through the complete pipeline.
@@ -88,15 +113,11 @@ def process_email_task(self, email_filename: str) -> Dict[str, Any]:
         # Validate input
         email_input = EmailInput(**email_data)
 
-        # Initialize services
-        processor = EmailProcessor()
-        db_service = DynamoDBService()
-
         # Process the email
-        result = processor.process_email(email_input)
+        result = get_email_processor().process_email(email_input)
 
         # Store result in DynamoDB
-        doc_id = db_service.store_result(result)
+        doc_id = dynamodb_service.store_result(result)
 
         logger.info(
             "Email processing completed",
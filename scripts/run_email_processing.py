@@ -175,7 +175,7 @@ class EmailProcessingRunner:
         """Display database statistics."""
         try:
             # DynamoDB stats
-            dynamo_stats = self.db_service.get_statistics()
+            dynamo_stats = self.db_service.get_statistics(include_domains=True)
             print("🗄️  DynamoDB Statistics:")
             print(f"  Total Results: {dynamo_stats.get('total_results', 0)}")
             print(f"  Sample Size: {dynamo_stats.get('sample_size', 0)}")
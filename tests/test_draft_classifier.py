@@ -0,0 +1,70 @@
+"""Tests for the draft classifier."""
+
+from app.models import BusinessEntity, EmailCategory, EmailMetadata, ExtractedData, ProcessedEmail
+from app.services.draft_classifier import DraftClassifier
+
+
+def _processed_email(category: EmailCategory, domain: str = "shop.example.com") -> ProcessedEmail:
+    return ProcessedEmail(
+        email_category=category,
+        business_entity=BusinessEntity(name="Example Shop"),
+        data=ExtractedData(),
+        confidence_score=0.95,
+        metadata=EmailMetadata(sender_domain=domain)
+    )
+
+
+class TestDraftClassifier:
+    """Test cases for DraftClassifier."""
+    
+    def test_confidence_grows_with_consistent_history(self):
+        """Test the draft becomes confident only after several matching results."""
+        classifier = DraftClassifier()
+        assert classifier.classify("shop.example.com", "Big sale") is None
+        
+        classifier.record(_processed_email(EmailCategory.MARKETING))
+        assert classifier.classify("shop.example.com", "Hello").confidence_score == 0.5
+        
+        for _ in range(9):
+            classifier.record(_processed_email(EmailCategory.MARKETING))
+        draft = classifier.classify("shop.example.com", "Hello")
+        
+        assert draft.email_category == EmailCategory.MARKETING
+        assert draft.business_entity.name == "Example Shop"
+        assert draft.confidence_score > 0.9
+        assert classifier.classify("other.example.com", "Hello") is None
+    
+    def test_keywords_adjust_confidence(self):
+        """Test agreeing keywords raise confidence and conflicting ones halve it."""
+        classifier = DraftClassifier()
+        for _ in range(9):
+            classifier.record(_processed_email(EmailCategory.MARKETING))
+        
+        plain = classifier.classify("shop.example.com", "Hello").confidence_score
+        agreeing = classifier.classify("shop.example.com", "Sale: 20% off, unsubscribe below")
+        conflicting = classifier.classify("shop.example.com", "Your order receipt and invoice")
+        
+        assert agreeing.confidence_score > plain
+        assert conflicting.confidence_score == plain / 2
+    
+    def test_history_seeded_from_stored_emails(self):
+        """Test a domain's first lookup seeds its counts from stored emails, once."""
+        classifier = DraftClassifier()
+        stored = [
+            {"sender_domain": "shop.example.com", "email_category": "marketing",
+             "business_name": "Example Shop", "business_website": "https://shop.example.com"}
+        ] * 12
+        calls = []
+        
+        def load_history(domain):
+            calls.append(domain)
+            return stored
+        
+        draft = classifier.classify("shop.example.com", "Hello", load_history=load_history)
+        classifier.classify("shop.example.com", "Hello", load_history=load_history)
+        
+        assert draft.email_category == EmailCategory.MARKETING
+        assert draft.business_entity.name == "Example Shop"
+        assert draft.confidence_score == 12 / 13
+        assert calls == ["shop.example.com"]
+        assert classifier.classify("new.example.com", "Hello", load_history=lambda domain: []) is None
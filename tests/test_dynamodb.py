@@ -0,0 +1,307 @@
+"""Tests for the DynamoDB service."""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock
+from app.database.dynamodb import DynamoDBService
+from app.models import ProcessedEmail, EmailCategory, BusinessEntity, ExtractedData
+
+
+class TestDynamoDBService:
+    """Test cases for DynamoDBService."""
+        
+    @pytest.fixture
+    def service(self, mock_dynamodb):
+        """Create DynamoDB service with a mocked table."""
+        return DynamoDBService()
+        
+    @pytest.fixture
+    def processed_email(self, sample_metadata):
+        """Sample processed email result."""
+        return ProcessedEmail(
+            email_category=EmailCategory.MARKETING,
+            business_entity=BusinessEntity(name="Test Company", website="https://example.com"),
+            data=ExtractedData(email=["user@example.com"]),
+            confidence_score=0.9,
+            metadata=sample_metadata
+        )
+    
+    def test_build_item(self, service, processed_email):
+        """Test item construction for storage."""
+        from boto3.dynamodb.types import TypeDeserializer
+        
+        deserializer = TypeDeserializer()
+        raw_item = service._build_item(processed_email)
+        item = {key: deserializer.deserialize(value) for key, value in raw_item.items()}
+        
+        assert item['email_category'] == "marketing"
+        assert item['sender_domain'] == "example.com"
+        assert item['confidence_score'] == Decimal("0.9")
+        assert item['business_entity']['website'] == "https://example.com/"
+        assert item['data'] == {'email': ['user@example.com'], 'phone_number': [], 'credit_card_number': []}
+        assert item['metadata']['urls'] == ["https://example.com/unsubscribe"]
+        assert item['processed_at'] == item['created_at']
+    
+    def test_store_result(self, service, processed_email):
+        """Test storing a single result."""
+        doc_id = service.store_result(processed_email)
+        
+        service.dynamodb_client.put_item.assert_called_once()
+        assert service.dynamodb_client.put_item.call_args.kwargs['Item']['id'] == {'S': doc_id}
+    
+    def test_store_results_bulk(self, service, processed_email):
+        """Test storing results in BatchWriteItem chunks of 25."""
+        service.dynamodb_client.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        doc_ids = service.store_results_bulk([processed_email] * 30)
+        
+        assert len(set(doc_ids)) == 30
+        calls = service.dynamodb_client.batch_write_item.call_args_list
+        assert len(calls) == 2
+        items = [
+            request['PutRequest']['Item']
+            for call in calls
+            for request in next(iter(call.kwargs['RequestItems'].values()))
+        ]
+        assert [item['id']['S'] for item in items] == doc_ids
+        assert items[0]['processed_at'] == items[-1]['processed_at']
+    
+    def test_clients_use_pooled_config(self, service, mock_dynamodb):
+        """Test resource and client share the pooled botocore config."""
+        from app.database.dynamodb import BOTO_CONFIG
+        import boto3
+        
+        session = boto3.Session.return_value
+        assert session.resource.call_args.kwargs['config'] is BOTO_CONFIG
+        assert session.client.call_args.kwargs['config'] is BOTO_CONFIG
+        assert BOTO_CONFIG.max_pool_connections == 50
+    
+    def test_init_skips_describe_table(self, service, mock_dynamodb):
+        """Test initialization does not issue a DescribeTable call."""
+        mock_dynamodb.load.assert_not_called()
+    
+    def test_store_result_creates_missing_table(self, service, mock_dynamodb, processed_email):
+        """Test a missing table is created and the write retried."""
+        from botocore.exceptions import ClientError
+        
+        missing = ClientError({'Error': {'Code': 'ResourceNotFoundException'}}, 'PutItem')
+        service.dynamodb_client.put_item.side_effect = [missing, {}]
+        service._create_table = Mock()
+        
+        service.store_result(processed_email)
+        
+        service._create_table.assert_called_once()
+        assert service.dynamodb_client.put_item.call_count == 2
+    
+    def test_store_result_updates_statistics(self, service, mock_dynamodb, processed_email):
+        """Test writes increment the aggregate statistics item."""
+        service.store_result(processed_email)
+        
+        kwargs = mock_dynamodb.update_item.call_args.kwargs
+        assert kwargs['Key'] == {'id': '__stats__'}
+        assert kwargs['ExpressionAttributeValues'][':total'] == 1
+        assert kwargs['ConditionExpression'] == 'attribute_exists(id)'
+        assert 'category_count_marketing' in kwargs['ExpressionAttributeNames'].values()
+    
+    def test_backfill_statistics_seeds_aggregate(self, service, mock_dynamodb):
+        """Test the aggregate is seeded from existing items with a conditional put."""
+        service.dynamodb_client.get_paginator.return_value.paginate.return_value = [
+            {'Items': [
+                {'email_category': {'S': 'marketing'}, 'confidence_score': {'N': '0.9'}},
+                {'c': {'S': 'survey'}, 'cs': {'N': '0.5'}}
+            ]},
+            {'Items': [{'email_category': {'S': 'marketing'}, 'confidence_score': {'N': '0.7'}}]}
+        ]
+        
+        assert service.backfill_statistics() is True
+        
+        kwargs = mock_dynamodb.put_item.call_args.kwargs
+        assert kwargs['ConditionExpression'] == 'attribute_not_exists(id)'
+        assert kwargs['Item'] == {
+            'id': '__stats__',
+            'total_results': 3,
+            'confidence_sum': Decimal('2.1'),
+            'category_count_marketing': 2,
+            'category_count_survey': 1
+        }
+    
+    def test_get_statistics_starts_backfill_when_unseeded(self, service, mock_dynamodb):
+        """Test an unseeded table reports its item count and starts the backfill."""
+        mock_dynamodb.get_item.return_value = {}
+        mock_dynamodb.scan.return_value = {'Items': []}
+        service.dynamodb_client.describe_table.return_value = {'Table': {'ItemCount': 1200}}
+        service._start_statistics_backfill = Mock()
+        
+        stats = service.get_statistics()
+        
+        assert stats['total_results'] == 1200
+        service._start_statistics_backfill.assert_called_once()
+    
+    def test_get_statistics_from_aggregate(self, service, mock_dynamodb):
+        """Test statistics are read from the aggregate item without a count scan."""
+        mock_dynamodb.get_item.return_value = {'Item': {
+            'id': '__stats__',
+            'total_results': Decimal(4),
+            'confidence_sum': Decimal('3.0'),
+            'category_count_marketing': Decimal(3),
+            'category_count_survey': Decimal(1)
+        }}
+        mock_dynamodb.scan.return_value = {'Items': [{'sender_domain': 'example.com'}]}
+        
+        stats = service.get_statistics()
+        
+        assert stats['total_results'] == 4
+        assert stats['category_distribution'] == {'marketing': 3, 'survey': 1}
+        assert stats['average_confidence'] == 0.75
+        assert 'top_domains' not in stats
+        mock_dynamodb.scan.assert_not_called()
+        
+        stats = service.get_statistics(include_domains=True)
+        
+        assert stats['top_domains'] == {'example.com': 1}
+        assert stats['total_results'] == 4
+        assert 'Select' not in mock_dynamodb.scan.call_args.kwargs
+    
+    def test_get_results_batches_keys(self, service):
+        """Test multi-ID lookups are chunked into BatchGetItem requests."""
+        doc_ids = [f"id-{i}" for i in range(150)]
+        
+        def batch_get_item(RequestItems):
+            table_name, request = next(iter(RequestItems.items()))
+            keys = request['Keys']
+            return {'Responses': {table_name: [{'id': key['id'], 'email_category': {'S': 'survey'}} for key in keys]}}
+        
+        service.dynamodb_client.batch_get_item.side_effect = batch_get_item
+        
+        results = service.get_results(list(reversed(doc_ids)))
+        
+        assert service.dynamodb_client.batch_get_item.call_count == 2
+        assert [r['id'] for r in results] == list(reversed(doc_ids))
+        assert results[0]['email_category'] == 'survey'
+    
+    def test_query_by_domain_iter_follows_pages(self, service, mock_dynamodb):
+        """Test domain iteration follows LastEvaluatedKey across pages."""
+        mock_dynamodb.query.side_effect = [
+            {'Items': [{'id': 'a'}, {'id': 'b'}], 'LastEvaluatedKey': {'id': 'b'}},
+            {'Items': [{'id': 'c'}]}
+        ]
+        
+        results = list(service.query_by_domain_iter("example.com", page_size=2))
+        
+        assert [r['id'] for r in results] == ['a', 'b', 'c']
+        second_call = mock_dynamodb.query.call_args_list[1].kwargs
+        assert second_call['ExclusiveStartKey'] == {'id': 'b'}
+        assert second_call['Limit'] == 2
+    
+    def test_store_result_buffered(self, service, processed_email):
+        """Test buffered writes resolve once the buffer is flushed."""
+        service.dynamodb_client.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        futures = [service.store_result_buffered(processed_email) for _ in range(3)]
+        service.flush()
+        
+        doc_ids = [future.result(timeout=1) for future in futures]
+        assert len(set(doc_ids)) == 3
+        written = [
+            request['PutRequest']['Item']['id']['S']
+            for call in service.dynamodb_client.batch_write_item.call_args_list
+            for request in next(iter(call.kwargs['RequestItems'].values()))
+        ]
+        assert written == doc_ids
+    
+    def test_query_by_domain_date_range_uses_key_condition(self, service, mock_dynamodb):
+        """Test date bounds are folded into the index key condition."""
+        mock_dynamodb.query.return_value = {'Items': []}
+        
+        service.query_by_domain("example.com", start_date="2024-01-01", end_date="2024-02-01")
+        
+        kwargs = mock_dynamodb.query.call_args.kwargs
+        assert kwargs['KeyConditionExpression'] == (
+            'sender_domain = :domain AND processed_at BETWEEN :start_date AND :end_date'
+        )
+        assert 'FilterExpression' not in kwargs
+    
+    def test_scan_sample_parallel_segments(self, service, mock_dynamodb, monkeypatch):
+        """Test the sample scan is split into segments when enabled."""
+        from app.database import dynamodb
+        
+        monkeypatch.setattr(dynamodb, 'settings', dynamodb.settings.model_copy(
+            update={'dynamodb_parallel_scan': True, 'dynamodb_scan_segments': 4}
+        ))
+        mock_dynamodb.scan.return_value = {'Items': [{'sender_domain': 'example.com'}]}
+        
+        items = service._scan_sample(100)
+        
+        assert len(items) == 4
+        segments = sorted(call.kwargs['Segment'] for call in mock_dynamodb.scan.call_args_list)
+        assert segments == [0, 1, 2, 3]
+        assert all(call.kwargs['Limit'] == 25 for call in mock_dynamodb.scan.call_args_list)
+    
+    def test_batch_write_retries_unprocessed_items(self, service, processed_email, monkeypatch):
+        """Test only unprocessed items are resubmitted after a backoff."""
+        from app.database import dynamodb
+        
+        sleeps = []
+        monkeypatch.setattr(dynamodb.time, 'sleep', sleeps.append)
+        items = [service._build_item(processed_email) for _ in range(3)]
+        unprocessed = {'test-table': [{'PutRequest': {'Item': items[2]}}]}
+        service.dynamodb_client.batch_write_item.side_effect = [
+            {'UnprocessedItems': unprocessed},
+            {'UnprocessedItems': {}}
+        ]
+        
+        service._batch_write_items(items)
+        
+        calls = service.dynamodb_client.batch_write_item.call_args_list
+        assert len(calls) == 2
+        assert calls[1].kwargs['RequestItems'] == unprocessed
+        assert len(sleeps) == 1 and 0 <= sleeps[0] <= 2.0
+    
+    def test_batch_write_gives_up_after_max_attempts(self, service, processed_email, monkeypatch):
+        """Test persistent throttling surfaces as an error."""
+        from app.database import dynamodb
+        
+        monkeypatch.setattr(dynamodb.time, 'sleep', lambda _: None)
+        item = service._build_item(processed_email)
+        service.dynamodb_client.batch_write_item.return_value = {
+            'UnprocessedItems': {'test-table': [{'PutRequest': {'Item': item}}]}
+        }
+        
+        with pytest.raises(RuntimeError):
+            service._batch_write_items([item])
+        
+        assert service.dynamodb_client.batch_write_item.call_count == dynamodb.BATCH_MAX_ATTEMPTS
+    
+    def test_compact_items_round_trip(self, service, mock_dynamodb, processed_email, monkeypatch):
+        """Test compact attribute names are written and expanded on read."""
+        from app.database import dynamodb
+        
+        monkeypatch.setattr(dynamodb, 'settings', dynamodb.settings.model_copy(
+            update={'dynamodb_compact_items': True}
+        ))
+        service = DynamoDBService()
+        
+        item = service._build_item(processed_email)
+        
+        assert {'c', 'cs', 'be', 'da', 'm', 'ca'} <= set(item)
+        assert {'id', 'sender_domain', 'processed_at'} <= set(item)
+        assert 'email_category' not in item
+        
+        mock_dynamodb.get_item.return_value = {'Item': {'id': 'x', 'c': 'survey', 'cs': Decimal('0.5')}}
+        result = service.get_result('x')
+        
+        assert result == {'id': 'x', 'email_category': 'survey', 'confidence_score': Decimal('0.5')}
+    
+    def test_lazy_service_initializes_on_first_use(self, mock_dynamodb):
+        """Test the global service proxy defers client creation until used."""
+        import boto3
+        from app.database.dynamodb import dynamodb_service, get_dynamodb_service
+        
+        get_dynamodb_service.cache_clear()
+        boto3.Session.assert_not_called()
+        
+        dynamodb_service.table
+        dynamodb_service.table
+        
+        boto3.Session.assert_called_once()
+        get_dynamodb_service.cache_clear()
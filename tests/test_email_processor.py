@@ -1,9 +1,11 @@
 """Tests for the main email processor."""
 
+import asyncio
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from app.services.email_processor import EmailProcessor
-from app.models import EmailInput, EmailCategory, ProcessedEmail
+from app.models import EmailInput, EmailCategory, ProcessedEmail, PrivacyPolicyResult
 
 
 class TestEmailProcessor:
@@ -15,26 +17,41 @@ class TestEmailProcessor:
         with patch.multiple(
             'app.services.email_processor',
             HTMLProcessor=Mock,
-            PIIProcessor=Mock,
+            get_pii_processor=Mock,
             MetadataExtractor=Mock,
             VectorStoreService=Mock,
             SimilarityMatcher=Mock,
+            SemanticResponseCache=Mock,
             EmailClassificationChain=Mock,
             PrivacyPolicyScraperTool=Mock
         ):
-            return EmailProcessor()
+            processor = EmailProcessor()
+        # No cached classifications unless a test sets one
+        processor.response_cache.lookup.return_value = None
+        # Speculative DPO scrapes find nothing unless a test sets a result
+        processor.metadata_extractor.extract_sender_domain.return_value = "example.com"
+        processor.privacy_scraper.arun_structured = AsyncMock(return_value=PrivacyPolicyResult())
+        processor.vector_store.aembed_email = AsyncMock(return_value=None)
+        # No sender history unless a test records some
+        processor.draft_classifier = Mock()
+        processor.draft_classifier.classify.return_value = None
+        return processor
     
     def test_process_email_with_confident_match(self, processor, sample_email_input, sample_metadata):
         """Test email processing with confident vector match."""
         # Setup mocks
         processor.html_processor.strip_html.return_value = "Clean text content"
-        processor.pii_processor.anonymize_text.return_value = "Anonymized text"
+        processor.pii_processor.analyze_text.return_value = ("Anonymized text", {
+            'email': ['user@example.com'],
+            'phone_number': [],
+            'credit_card_number': []
+        })
         processor.metadata_extractor.extract_metadata.return_value = sample_metadata
         
         # Mock confident vector match
         mock_vector_match = Mock()
         mock_vector_match.confidence_score = 0.9
-        processor.similarity_matcher.find_best_match.return_value = mock_vector_match
+        processor.similarity_matcher.afind_best_match = AsyncMock(return_value=mock_vector_match)
         processor.similarity_matcher.is_confident_match.return_value = True
         
         # Mock business entity extraction
@@ -43,13 +60,6 @@ class TestEmailProcessor:
         processor.similarity_matcher.extract_business_entity_from_match.return_value = mock_business_entity
         processor.similarity_matcher.get_email_category_from_match.return_value = EmailCategory.MARKETING
         
-        # Mock PII data extraction
-        processor.pii_processor.extract_pii_data.return_value = {
-            'email': ['user@example.com'],
-            'phone_number': [],
-            'credit_card_number': []
-        }
-        
         # Process email
         result = processor.process_email(sample_email_input)
         
@@ -60,16 +70,23 @@ class TestEmailProcessor:
         assert result.confidence_score == 0.9
         assert result.data.email == ['user@example.com']
         assert result.processed_at is not None
+        processor.pii_processor.extract_pii_data.assert_not_called()
+        # Confident matches never reach the LLM, so no speculative scrape is started
+        processor.privacy_scraper.arun_structured.assert_not_called()
     
     def test_process_email_with_llm_fallback(self, processor, sample_email_input, sample_metadata):
         """Test email processing with LLM fallback."""
         # Setup mocks
         processor.html_processor.strip_html.return_value = "Clean text content"
-        processor.pii_processor.anonymize_text.return_value = "Anonymized text"
+        processor.pii_processor.analyze_text.return_value = ("Anonymized text", {
+            'email': [],
+            'phone_number': ['123-456-7890'],
+            'credit_card_number': []
+        })
         processor.metadata_extractor.extract_metadata.return_value = sample_metadata
         
         # Mock no confident vector match
-        processor.similarity_matcher.find_best_match.return_value = None
+        processor.similarity_matcher.afind_best_match = AsyncMock(return_value=None)
         
         # Mock LLM classification
         from app.models import BusinessEntity, ExtractedData
@@ -82,13 +99,6 @@ class TestEmailProcessor:
         )
         processor.llm_classifier.classify_email.return_value = mock_processed_email
         
-        # Mock PII data extraction
-        processor.pii_processor.extract_pii_data.return_value = {
-            'email': [],
-            'phone_number': ['123-456-7890'],
-            'credit_card_number': []
-        }
-        
         # Process email
         result = processor.process_email(sample_email_input)
         
@@ -98,6 +108,113 @@ class TestEmailProcessor:
         assert result.business_entity.name == "LLM Company"
         assert result.confidence_score == 0.7
         assert result.data.phone_number == ['123-456-7890']
+        processor.privacy_scraper.arun_structured.assert_called_once_with("https://example.com")
+    
+    def test_process_email_reuses_event_loop(self, processor, sample_email_input, sample_metadata):
+        """Test consecutive emails share one event loop so pooled async clients stay usable."""
+        from app.models import BusinessEntity, ExtractedData
+        
+        processor.html_processor.strip_html.return_value = "Clean text content"
+        processor.pii_processor.analyze_text.return_value = ("Anonymized text", {
+            'email': [],
+            'phone_number': [],
+            'credit_card_number': []
+        })
+        processor.metadata_extractor.extract_metadata.return_value = sample_metadata
+        processor.similarity_matcher.afind_best_match = AsyncMock(return_value=None)
+        processor.llm_classifier.classify_email.return_value = ProcessedEmail(
+            email_category=EmailCategory.MARKETING,
+            business_entity=BusinessEntity(name="LLM Company"),
+            data=ExtractedData(),
+            confidence_score=0.7,
+            metadata=sample_metadata
+        )
+        
+        client_loops = []
+        
+        async def aembed_email(text, metadata):
+            # Like an httpx connection pool, the client belongs to the loop it first ran on
+            loop = asyncio.get_running_loop()
+            if client_loops and (client_loops[0] is not loop or client_loops[0].is_closed()):
+                raise RuntimeError("Event loop is closed")
+            client_loops.append(loop)
+            return None
+        
+        processor.vector_store.aembed_email = aembed_email
+        
+        processor.process_email(sample_email_input)
+        processor.process_email(sample_email_input)
+        
+        assert len(client_loops) == 2
+        assert not client_loops[0].is_closed()
+    
+    def test_process_email_uses_stored_sender_history(self, processor, sample_email_input, sample_metadata):
+        """Test a sender with consistent stored history is classified without the LLM."""
+        from app.services.draft_classifier import DraftClassifier
+        
+        processor.html_processor.strip_html.return_value = "Clean text content"
+        processor.pii_processor.analyze_text.return_value = ("Anonymized text", {
+            'email': [],
+            'phone_number': [],
+            'credit_card_number': []
+        })
+        processor.metadata_extractor.extract_metadata.return_value = sample_metadata
+        processor.similarity_matcher.afind_best_match = AsyncMock(return_value=None)
+        processor.draft_classifier = DraftClassifier()
+        processor.vector_store.get_domain_history.return_value = [
+            {"sender_domain": sample_metadata.sender_domain, "email_category": "marketing",
+             "business_name": "Stored Company"}
+        ] * 12
+        
+        result = processor.process_email(sample_email_input)
+        
+        assert result.email_category == EmailCategory.MARKETING
+        assert result.business_entity.name == "Stored Company"
+        processor.llm_classifier.classify_email.assert_not_called()
+        processor.vector_store.get_domain_history.assert_called_once_with(sample_metadata.sender_domain)
+    
+    def test_process_emails_batches_llm_classification(self, processor, sample_email_input, sample_metadata):
+        """Test only emails without a confident match go to one batched LLM call."""
+        processor.html_processor.strip_html.return_value = "Clean text content"
+        processor.pii_processor.analyze_text_batch.return_value = [("Anonymized text", {
+            'email': [],
+            'phone_number': [],
+            'credit_card_number': []
+        })] * 3
+        processor.metadata_extractor.extract_metadata.return_value = sample_metadata
+        
+        # First email has a confident match, the other two do not
+        mock_vector_match = Mock()
+        mock_vector_match.confidence_score = 0.9
+        processor.similarity_matcher.find_best_match.side_effect = [mock_vector_match, None, None]
+        processor.similarity_matcher.is_confident_match.return_value = True
+        
+        from app.models import BusinessEntity, ExtractedData
+        processor.similarity_matcher.extract_business_entity_from_match.return_value = BusinessEntity(name="Vector Company")
+        processor.similarity_matcher.get_email_category_from_match.return_value = EmailCategory.MARKETING
+        processor.llm_classifier.classify_emails.return_value = [
+            ProcessedEmail(
+                email_category=category,
+                business_entity=BusinessEntity(name="LLM Company"),
+                data=ExtractedData(),
+                confidence_score=0.7,
+                metadata=sample_metadata
+            )
+            for category in (EmailCategory.SURVEY, EmailCategory.PERSONAL)
+        ]
+        
+        # One worker keeps the vector search side effects in email order
+        results = processor.process_emails([sample_email_input] * 3, concurrency=1)
+        
+        assert [result.email_category for result in results] == [
+            EmailCategory.MARKETING, EmailCategory.SURVEY, EmailCategory.PERSONAL
+        ]
+        processor.llm_classifier.classify_emails.assert_called_once_with(
+            [("Anonymized text", sample_metadata)] * 2
+        )
+        processor.llm_classifier.classify_email.assert_not_called()
+        processor.vector_store.add_email_embedding.assert_not_called()
+        processor.vector_store.flush.assert_called_once()
     
     def test_html_stripping(self, processor, sample_email_input):
         """Test HTML content stripping."""
@@ -122,21 +239,27 @@ class TestEmailProcessor:
         assert result == "Plain text content"
     
     def test_pii_anonymization(self, processor):
-        """Test PII anonymization."""
-        processor.pii_processor.anonymize_text.return_value = "Anonymized content"
+        """Test PII anonymization and extraction in one analysis."""
+        processor.pii_processor.analyze_text.return_value = ("Anonymized content", {
+            'email': ['user@test.com'],
+            'phone_number': [],
+            'credit_card_number': []
+        })
         
-        result = processor._anonymize_pii("Original content")
+        anonymized_text, extracted_data = processor._analyze_pii("Original content")
         
-        assert result == "Anonymized content"
-        processor.pii_processor.anonymize_text.assert_called_once_with("Original content")
+        assert anonymized_text == "Anonymized content"
+        assert extracted_data.email == ['user@test.com']
+        processor.pii_processor.analyze_text.assert_called_once_with("Original content")
     
     def test_pii_anonymization_fallback(self, processor):
         """Test PII anonymization fallback on error."""
-        processor.pii_processor.anonymize_text.side_effect = Exception("PII error")
+        processor.pii_processor.analyze_text.side_effect = Exception("PII error")
         
-        result = processor._anonymize_pii("Original content")
+        anonymized_text, extracted_data = processor._analyze_pii("Original content")
         
-        assert result == "Original content"  # Should return original on error
+        assert anonymized_text == "Original content"  # Should return original on error
+        assert extracted_data.email is None
     
     def test_metadata_extraction(self, processor, sample_email_input, sample_metadata):
         """Test metadata extraction."""
@@ -158,7 +281,9 @@ class TestEmailProcessor:
         result = processor._find_vector_match("text", sample_metadata)
         
         assert result == mock_match
-        processor.similarity_matcher.find_best_match.assert_called_once_with("text", sample_metadata)
+        processor.similarity_matcher.find_best_match.assert_called_once_with(
+            "text", sample_metadata, embedding=None
+        )
     
     def test_user_data_extraction(self, processor):
         """Test user data extraction."""
@@ -193,12 +318,56 @@ class TestEmailProcessor:
         )
         
         # Mock privacy scraper result
-        processor.privacy_scraper._run.return_value = '{"success": true, "dpo_email": "dpo@example.com"}'
+        processor.privacy_scraper.run_structured.return_value = PrivacyPolicyResult(
+            success=True, dpo_email="dpo@example.com"
+        )
         
         result = processor._enhance_business_entity(processed_email)
         
         assert result.business_entity.dpo_email == "dpo@example.com"
-        processor.privacy_scraper._run.assert_called_once_with("https://example.com")
+        processor.privacy_scraper.run_structured.assert_called_once_with("https://example.com")
+    
+    def test_async_business_entity_enhancement_awaits_scraper(self, processor):
+        """Test the async pipeline awaits the scraper instead of running a new event loop."""
+        from app.models import BusinessEntity
+        
+        processed_email = ProcessedEmail(
+            email_category=EmailCategory.MARKETING,
+            business_entity=BusinessEntity(name="Test Company", website="https://example.com"),
+            data=Mock(),
+            confidence_score=0.8
+        )
+        processor.privacy_scraper.arun_structured = AsyncMock(
+            return_value=PrivacyPolicyResult(success=True, dpo_email="dpo@example.com")
+        )
+        
+        result = asyncio.run(processor._aenhance_business_entity(processed_email))
+        
+        assert result.business_entity.dpo_email == "dpo@example.com"
+        processor.privacy_scraper.arun_structured.assert_awaited_once_with("https://example.com")
+        processor.privacy_scraper.run_structured.assert_not_called()
+    
+    def test_speculative_scrape_reused_for_same_site(self, processor):
+        """Test a prefetched scrape of the sender domain replaces a new scrape."""
+        from app.models import BusinessEntity
+        
+        processed_email = ProcessedEmail(
+            email_category=EmailCategory.MARKETING,
+            business_entity=BusinessEntity(name="Test Company", website="https://www.example.com"),
+            data=Mock(),
+            confidence_score=0.8
+        )
+        processor.privacy_scraper.arun_structured = AsyncMock()
+        
+        async def enhance():
+            prefetch = asyncio.get_running_loop().create_future()
+            prefetch.set_result(PrivacyPolicyResult(success=True, dpo_email="dpo@example.com"))
+            return await processor._aenhance_business_entity(processed_email, prefetch, "mail.example.com")
+        
+        result = asyncio.run(enhance())
+        
+        assert result.business_entity.dpo_email == "dpo@example.com"
+        processor.privacy_scraper.arun_structured.assert_not_awaited()
     
     def test_vector_db_storage(self, processor, sample_metadata):
         """Test storing processed email in vector database."""
@@ -221,5 +390,29 @@ class TestEmailProcessor:
             metadata=sample_metadata,
             email_category=EmailCategory.MARKETING,
             business_entity=processed_email.business_entity,
-            confidence_score=0.9
+            confidence_score=0.9,
+            embedding=None
+        )
+    
+    def test_llm_classification_uses_semantic_cache(self, processor, sample_metadata):
+        """Test a cached classification skips the LLM but not user data extraction."""
+        from app.models import BusinessEntity, ExtractedData
+        processor.response_cache.lookup.return_value = ProcessedEmail(
+            email_category=EmailCategory.SURVEY,
+            business_entity=BusinessEntity(name="Cached Company"),
+            data=ExtractedData(),
+            confidence_score=0.9,
+            metadata=sample_metadata
         )
+        processor.pii_processor.extract_pii_data.return_value = {
+            'email': ['user@example.com'],
+            'phone_number': [],
+            'credit_card_number': []
+        }
+        
+        result = processor._process_llm_classification("Anonymized text", sample_metadata)
+        
+        assert result.business_entity.name == "Cached Company"
+        assert result.data.email == ['user@example.com']
+        processor.llm_classifier.classify_email.assert_not_called()
+        processor.response_cache.store.assert_not_called()
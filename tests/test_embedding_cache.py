@@ -0,0 +1,88 @@
+"""Tests for the embedding cache."""
+
+import pytest
+from unittest.mock import Mock
+from app.database.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+    
+    @pytest.fixture
+    def embeddings(self):
+        """Embeddings stub returning one vector per text."""
+        embeddings = Mock()
+        embeddings.embed_query.side_effect = lambda text: [float(len(text)), 1.0]
+        embeddings.embed_documents.side_effect = lambda texts: [[float(len(t)), 1.0] for t in texts]
+        return embeddings
+    
+    def test_embed_query_cached(self, embeddings):
+        """Test repeated queries are served from the cache."""
+        cache = EmbeddingCache(embeddings)
+        
+        assert cache.embed_query("hello") == [5.0, 1.0]
+        assert cache.embed_query("hello") == [5.0, 1.0]
+        
+        embeddings.embed_query.assert_called_once_with("hello")
+        assert cache.get_stats() == {
+            "size": 1, "hits": 1, "near_hits": 0, "disk_hits": 0, "misses": 1, "hit_rate": 0.5
+        }
+    
+    def test_embed_documents_only_requests_misses(self, embeddings):
+        """Test only uncached texts are sent to the provider."""
+        cache = EmbeddingCache(embeddings)
+        cache.embed_query("ab")
+        
+        assert cache.embed_documents(["ab", "abc"]) == [[2.0, 1.0], [3.0, 1.0]]
+        embeddings.embed_documents.assert_called_once_with(["abc"])
+    
+    def test_lru_eviction_and_expiry(self, embeddings):
+        """Test least recently used and expired entries are dropped."""
+        cache = EmbeddingCache(embeddings, maxsize=2)
+        cache.embed_query("a")
+        cache.embed_query("b")
+        cache.embed_query("a")
+        cache.embed_query("c")
+        
+        assert cache.get_stats()["size"] == 2
+        cache.embed_query("b")
+        assert embeddings.embed_query.call_count == 4
+        
+        expiring = EmbeddingCache(embeddings, ttl=0)
+        expiring.embed_query("a")
+        expiring.embed_query("a")
+        assert expiring.get_stats()["hits"] == 0
+    
+    def test_near_duplicate_reuses_embedding(self, embeddings):
+        """Test templated texts differing in one word share an embedding."""
+        cache = EmbeddingCache(embeddings, near_duplicates=True, near_duplicate_min_length=50)
+        template = "Dear {} thank you for your order " + " ".join(f"item{i}" for i in range(60))
+        
+        first = cache.embed_query(template.format("Alice"))
+        second = cache.embed_query(template.format("Bob"))
+        cache.embed_query("a completely different message " * 5)
+        
+        assert second == first
+        assert embeddings.embed_query.call_count == 2
+        assert cache.get_stats()["near_hits"] == 1
+    
+    def test_embed_documents_array(self, embeddings):
+        """Test array embeddings come back as one float32 matrix."""
+        cache = EmbeddingCache(embeddings)
+        cache.embed_query("abc")
+        
+        matrix = cache.embed_documents_array(["abc", "hello"])
+        
+        assert matrix.dtype == "float32"
+        assert matrix.tolist() == [[3.0, 1.0], [5.0, 1.0]]
+    
+    def test_persistent_cache_survives_restart(self, embeddings, tmp_path):
+        """Test vectors written by one cache are served to a new one."""
+        path = str(tmp_path / "cache.db")
+        EmbeddingCache(embeddings, persist_path=path).embed_query("hello")
+        
+        restarted = EmbeddingCache(embeddings, persist_path=path)
+        
+        assert restarted.embed_query("hello") == [5.0, 1.0]
+        embeddings.embed_query.assert_called_once_with("hello")
+        assert restarted.get_stats()["disk_hits"] == 1
@@ -0,0 +1,62 @@
+"""Tests for the HTML processor."""
+
+import pytest
+from app.processing import html_processor
+from app.processing.html_processor import HTMLProcessor
+
+
+class TestHTMLProcessor:
+    """Test cases for HTMLProcessor."""
+    
+    @pytest.fixture
+    def processor(self):
+        """Create HTML processor."""
+        return HTMLProcessor()
+    
+    def test_strip_html_removes_scripts_and_comments(self, processor):
+        """Test scripts, styles and comments are dropped from the text."""
+        html = """
+        <html><head><style>p { color: red; }</style></head>
+        <body><script>var x = 1;</script><!-- hidden -->
+        <p>Hello   <b>world</b></p></body></html>
+        """
+        
+        assert processor.strip_html(html) == "Hello world"
+    
+    def test_process_parses_once(self, processor, monkeypatch):
+        """Test text, URLs and footer are extracted from a single parse."""
+        html = """
+        <html><body>
+            <h1>Welcome!</h1>
+            <p>Thank you for joining our service.</p>
+            <div class="footer">
+                <p>Company Inc.</p>
+                <p><a href="https://example.com/unsubscribe">Unsubscribe</a></p>
+            </div>
+        </body></html>
+        """
+        parses = []
+        original = html_processor.LexborHTMLParser
+        
+        def counting_parser(*args, **kwargs):
+            parses.append(1)
+            return original(*args, **kwargs)
+        
+        monkeypatch.setattr(html_processor, "LexborHTMLParser", counting_parser)
+        
+        result = processor.process(html)
+        processor.strip_html(html)
+        
+        assert len(parses) == 1
+        assert result["text"] == "Welcome! Thank you for joining our service. Company Inc. Unsubscribe"
+        assert result["urls"] == ["https://example.com/unsubscribe"]
+        assert result["footer_text"] == "Company Inc. Unsubscribe"
+    
+    def test_extract_urls_deduplicates(self, processor):
+        """Test URLs from links and images are returned once, in order."""
+        html = """
+        <a href="https://a.com">A</a><img src="https://b.com/x.png">
+        <a href="https://a.com">again</a><a href="mailto:x@y.com">mail</a>
+        """
+        
+        assert processor.extract_urls(html) == ["https://a.com", "https://b.com/x.png"]
@@ -0,0 +1,55 @@
+"""Tests for the LLM response cache."""
+
+from app.llm.cache import LLMCache
+
+
+class TestLLMCache:
+    """Test cases for LLMCache."""
+
+    def test_cached_response(self):
+        """Responses are returned for the same key parts only."""
+        cache = LLMCache()
+        key = cache.make_key("model", 0.0, "prompt", "policy text")
+
+        assert cache.get(key) is None
+        cache.set(key, "dpo@example.com")
+
+        assert cache.get(key) == "dpo@example.com"
+        assert cache.get(cache.make_key("model", 0.0, "prompt", "other text")) is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_lru_and_expiry(self):
+        """Least recently used and expired responses are dropped."""
+        cache = LLMCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+
+        expired = LLMCache(ttl=0.0)
+        expired.set("a", "1")
+        assert expired.get("a") is None
+
+    def test_redis_connects_lazily_and_retries(self, monkeypatch):
+        """Redis is not contacted at construction and is retried after the interval."""
+        from app.llm import cache as cache_module
+
+        attempts = []
+        now = [100.0]
+        monkeypatch.setattr(LLMCache, "_connect", lambda self, redis_url: attempts.append(redis_url))
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = LLMCache(redis_url="redis://cache.invalid:6379/0")
+        assert attempts == []
+
+        cache.set("a", "1")
+        assert cache.get("a") == "1"
+        assert len(attempts) == 1
+        assert cache.get_stats()["backend"] == "memory"
+
+        now[0] += cache_module.REDIS_RETRY_INTERVAL
+        cache.get("a")
+        assert len(attempts) == 2
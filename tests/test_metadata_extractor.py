@@ -0,0 +1,97 @@
+"""Tests for the metadata extractor."""
+
+import pytest
+from app.models import EmailInput
+from app.processing.hs_scanner import PatternScanner
+from app.services import metadata_extractor
+from app.services.metadata_extractor import MetadataExtractor
+
+
+class TestMetadataExtractor:
+    """Test cases for MetadataExtractor."""
+    
+    @pytest.fixture
+    def extractor(self):
+        """Create metadata extractor."""
+        return MetadataExtractor()
+    
+    def test_company_info_same_with_and_without_hyperscan(self, extractor, monkeypatch):
+        """Test the Hyperscan prefilter never changes the extracted values."""
+        texts = [
+            "Acme Widgets Inc, 123 Main Street. Call (555) 123-4567 or visit https://acme.example.com.",
+            "Plain text with nothing to extract.",
+            "HTTPS://EXAMPLE.COM/Path and 42 Elm Ave",
+            "Visit us at \u0661\u0662 Main Street"
+        ]
+        scanned = [extractor.extract_company_info(text) for text in texts]
+        
+        unavailable = PatternScanner([])
+        monkeypatch.setattr(metadata_extractor, "pattern_scanner", unavailable)
+        
+        for text, result in zip(texts, scanned):
+            expected = extractor.extract_company_info(text)
+            assert {key: sorted(value) for key, value in result.items()} == \
+                {key: sorted(value) for key, value in expected.items()}
+    
+    def test_scanner_matches_unicode_digits(self):
+        """Test Hyperscan matches the non-ASCII digits Python's \\d accepts."""
+        from app.processing.hs_scanner import ADDRESS_PATTERN
+        
+        scanner = PatternScanner([(ADDRESS_PATTERN, True)])
+        if not scanner.available:
+            pytest.skip("Hyperscan is not installed")
+        
+        assert scanner.scan("\u0661\u0662 Main Street") == {0}
+        assert scanner.scan("Main Street") == frozenset()
+    
+    def test_extract_urls_from_text(self, extractor):
+        """Test URLs are found and trailing punctuation is dropped."""
+        text = "See https://example.com/offer. Or http://shop.example.com/a?b=1, thanks"
+        
+        assert extractor.extract_urls_from_text(text) == [
+            "https://example.com/offer",
+            "http://shop.example.com/a?b=1"
+        ]
+        assert extractor.extract_urls_from_text("no links here") == []
+    
+    def test_extract_metadata_merges_urls_in_order(self, extractor):
+        """Test HTML and text URLs are merged in order without duplicates."""
+        email = EmailInput(**{
+            "from": "news@example.com",
+            "subject": "News",
+            "html_content": '<a href="https://example.com/a">A</a><img src="https://example.com/b.png">'
+        })
+        text = "Visit https://example.com/c or https://example.com/a today"
+        
+        metadata = extractor.extract_metadata(email, text)
+        
+        assert metadata.urls == [
+            "https://example.com/a",
+            "https://example.com/b.png",
+            "https://example.com/c"
+        ]
+    
+    def test_company_info_reuses_extracted_urls(self, extractor, monkeypatch):
+        """Test URLs passed in are used instead of scanning the text again."""
+        text = "Acme Widgets Inc at https://acme.example.com"
+        
+        def fail(text):
+            raise AssertionError("text scanned for URLs")
+        
+        monkeypatch.setattr(extractor, "_iter_urls", fail)
+        company_info = extractor.extract_company_info(text, urls=["https://acme.example.com"])
+        
+        assert company_info['websites'] == ["https://acme.example.com"]
+    
+    def test_is_likely_footer(self, extractor):
+        """Test footers need contact info or at least two indicators."""
+        assert extractor._is_likely_footer("Write to support@example.com")
+        assert extractor._is_likely_footer("Visit HTTPS://EXAMPLE.COM")
+        assert extractor._is_likely_footer("Unsubscribe | Privacy Policy")
+        assert not extractor._is_likely_footer("Unsubscribe at any time")
+    
+    def test_extract_urls_requires_host(self, extractor):
+        """Test matches without a host or with unbalanced IPv6 brackets are skipped."""
+        text = "Broken http:///path and https://[::1 but fine http://[::1]:8080/x"
+        
+        assert extractor.extract_urls_from_text(text) == ["http://[::1]:8080/x"]